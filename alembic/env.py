@@ -4,6 +4,7 @@ import sys
 from todolist.core.settings import db_settings
 from todolist.db.base import Base
 from todolist.db import models
+from todolist.db.search import SEARCH_SCHEMA_OBJECTS
 
 from logging.config import fileConfig
 
@@ -42,6 +43,11 @@ target_metadata = Base.metadata
 # ... etc.
 
 
+def include_object(object, name, type_, reflected, compare_to) -> bool:
+    # The full-text search column, index and FTS5 tables are not mapped
+    return not (reflected and compare_to is None and name in SEARCH_SCHEMA_OBJECTS)
+
+
 def run_migrations_offline() -> None:
     """Run migrations in 'offline' mode.
 
@@ -58,6 +64,7 @@ def run_migrations_offline() -> None:
     context.configure(
         url=url,
         target_metadata=target_metadata,
+        include_object=include_object,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
     )
@@ -81,7 +88,9 @@ def run_migrations_online() -> None:
 
     with connectable.connect() as connection:
         context.configure(
-            connection=connection, target_metadata=target_metadata
+            connection=connection,
+            target_metadata=target_metadata,
+            include_object=include_object,
         )
 
         with context.begin_transaction():
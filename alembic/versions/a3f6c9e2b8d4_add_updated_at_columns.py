@@ -0,0 +1,45 @@
+"""add updated_at columns
+
+Revision ID: a3f6c9e2b8d4
+Revises: e7a9b3c5d1f2
+Create Date: 2026-10-18 17:20:41.308115
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3f6c9e2b8d4'
+down_revision: Union[str, Sequence[str], None] = 'e7a9b3c5d1f2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # SQLite can only add a NOT NULL column with a constant default (and
+    # cannot drop it afterwards without rebuilding the table and losing the
+    # expression indexes), so existing rows get a placeholder that is
+    # replaced by created_at right away.
+    for table in ("projects", "tasks"):
+        op.add_column(
+            table,
+            sa.Column(
+                "updated_at",
+                sa.DateTime(),
+                nullable=False,
+                server_default=sa.text("'1970-01-01 00:00:00'"),
+            ),
+        )
+        op.execute(f"UPDATE {table} SET updated_at = created_at")
+        if op.get_bind().dialect.name != "sqlite":
+            op.alter_column(table, "updated_at", server_default=None)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in ("tasks", "projects"):
+        op.drop_column(table, "updated_at")
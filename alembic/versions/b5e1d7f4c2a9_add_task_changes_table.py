@@ -0,0 +1,52 @@
+"""add task_changes table
+
+Revision ID: b5e1d7f4c2a9
+Revises: a3f6c9e2b8d4
+Create Date: 2026-10-18 18:05:12.447019
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b5e1d7f4c2a9'
+down_revision: Union[str, Sequence[str], None] = 'a3f6c9e2b8d4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # The feed starts empty: clients take the current seq from the feed,
+    # load existing tasks from list_tasks and follow the feed from that seq
+    op.create_table(
+        'task_changes',
+        sa.Column(
+            'seq',
+            sa.BigInteger().with_variant(sa.Integer(), 'sqlite'),
+            autoincrement=True,
+            nullable=False,
+        ),
+        sa.Column('project_id', sa.Integer(), nullable=False),
+        sa.Column('task_id', sa.Integer(), nullable=False),
+        sa.Column('op', sa.String(length=16), nullable=False),
+        sa.Column('changed_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('seq'),
+        sqlite_autoincrement=True,
+    )
+    op.create_index(
+        'ix_task_changes_project_id_seq',
+        'task_changes',
+        ['project_id', 'seq'],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_task_changes_project_id_seq', table_name='task_changes')
+    op.drop_table('task_changes')
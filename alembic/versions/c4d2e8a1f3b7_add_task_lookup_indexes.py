@@ -0,0 +1,40 @@
+"""add task lookup indexes
+
+Revision ID: c4d2e8a1f3b7
+Revises: 1bc789981a09
+Create Date: 2026-10-18 10:12:41.208113
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4d2e8a1f3b7'
+down_revision: Union[str, Sequence[str], None] = '1bc789981a09'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_tasks_project_id_id",
+        "tasks",
+        ["project_id", "id"],
+    )
+    op.create_index(
+        "ix_tasks_open_deadline",
+        "tasks",
+        ["deadline"],
+        postgresql_where=sa.text("status <> 'done'"),
+        sqlite_where=sa.text("status <> 'done'"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_tasks_open_deadline", table_name="tasks")
+    op.drop_index("ix_tasks_project_id_id", table_name="tasks")
@@ -0,0 +1,55 @@
+"""add task filter indexes
+
+Revision ID: d2f8a4b6e1c3
+Revises: b5e1d7f4c2a9
+Create Date: 2026-10-18 19:02:37.915402
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd2f8a4b6e1c3'
+down_revision: Union[str, Sequence[str], None] = 'b5e1d7f4c2a9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_tasks_project_id_status_id",
+        "tasks",
+        ["project_id", "status", "id"],
+    )
+    op.create_index(
+        "ix_tasks_project_id_deadline_id",
+        "tasks",
+        ["project_id", "deadline", "id"],
+    )
+    op.create_index(
+        "ix_tasks_project_id_title_id",
+        "tasks",
+        ["project_id", "title", "id"],
+    )
+    if op.get_bind().dialect.name == "postgresql":
+        # Needs a role allowed to create extensions (or pg_trgm already installed)
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        op.create_index(
+            "ix_tasks_title_trgm",
+            "tasks",
+            ["title"],
+            postgresql_using="gin",
+            postgresql_ops={"title": "gin_trgm_ops"},
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name == "postgresql":
+        op.drop_index("ix_tasks_title_trgm", table_name="tasks")
+    op.drop_index("ix_tasks_project_id_title_id", table_name="tasks")
+    op.drop_index("ix_tasks_project_id_deadline_id", table_name="tasks")
+    op.drop_index("ix_tasks_project_id_status_id", table_name="tasks")
@@ -0,0 +1,43 @@
+"""add case-insensitive project name index
+
+Revision ID: e7a9b3c5d1f2
+Revises: c4d2e8a1f3b7
+Create Date: 2026-10-18 11:04:27.551930
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7a9b3c5d1f2'
+down_revision: Union[str, Sequence[str], None] = 'c4d2e8a1f3b7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Fails if the table already holds names differing only by case;
+    # rename those before upgrading.
+    op.create_index(
+        "uq_projects_lower_name",
+        "projects",
+        [sa.text("lower(name)")],
+        unique=True,
+    )
+    # The lower(name) index also rejects exact duplicates: drop the
+    # case-sensitive constraint so writes maintain one unique index, not two.
+    # SQLite cannot drop an unnamed table constraint without rebuilding the
+    # table, so there the old one stays.
+    if op.get_bind().dialect.name != "sqlite":
+        op.drop_constraint("projects_name_key", "projects", type_="unique")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != "sqlite":
+        op.create_unique_constraint("projects_name_key", "projects", ["name"])
+    op.drop_index("uq_projects_lower_name", table_name="projects")
@@ -0,0 +1,93 @@
+"""Shared helpers for the benchmark scripts (SQLite seeding and timing stats)."""
+import os
+import statistics
+import subprocess
+import sys
+from datetime import date, datetime, timedelta
+
+SQLITE_DEFAULT_PATH = os.path.join(os.path.dirname(__file__), ".bench.sqlite3")
+
+
+def sqlite_env(path: str = SQLITE_DEFAULT_PATH, **extra: str) -> dict:
+    """Environment that points both the sync and the async engine at one SQLite file."""
+    env = dict(os.environ)
+    env["DB_URL"] = f"sqlite:///{path}"
+    env["DB_ASYNC_URL"] = f"sqlite+aiosqlite:///{path}"
+    env.update(extra)
+    return env
+
+
+def run_child(script: str, args: list[str], env: dict) -> str:
+    """Run a benchmark phase in a fresh interpreter (settings are read at import)."""
+    result = subprocess.run(
+        [sys.executable, script, *args],
+        env=env,
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    return result.stdout
+
+
+def reset_schema() -> None:
+    """Drop and recreate all tables on the configured (sync) engine."""
+    from todolist.db import models  # noqa: F401
+    from todolist.db.base import Base
+    from todolist.db.session import engine
+
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+
+
+def seed(projects: int, tasks_per_project: int, name_prefix: str = "Project") -> list[int]:
+    """Insert projects and tasks with multi-row INSERTs; returns the project ids."""
+    from sqlalchemy import insert
+
+    from todolist.db.models import ProjectDB, TaskDB
+    from todolist.db.session import engine
+
+    now = datetime.now()
+    overdue = date.today() - timedelta(days=1)
+
+    with engine.begin() as conn:
+        project_ids = conn.execute(
+            insert(ProjectDB).returning(ProjectDB.id),
+            [
+                {
+                    "name": f"{name_prefix} {i}",
+                    "description": "Seeded benchmark project",
+                    "created_at": now,
+                }
+                for i in range(projects)
+            ],
+        ).scalars().all()
+
+        for pid in project_ids if tasks_per_project else ():
+            conn.execute(
+                insert(TaskDB),
+                [
+                    {
+                        "title": f"Task {i}",
+                        "description": "Seeded benchmark task",
+                        "status": ("todo", "doing", "done")[i % 3],
+                        "deadline": overdue if i % 2 else None,
+                        "created_at": now,
+                        "project_id": pid,
+                    }
+                    for i in range(tasks_per_project)
+                ],
+            )
+
+    return list(project_ids)
+
+
+def percentiles(samples: list[float]) -> dict:
+    """p50/p95/p99/max of latency samples given in seconds, reported in ms."""
+    ordered = sorted(samples)
+    cuts = statistics.quantiles(ordered, n=100, method="inclusive") if len(ordered) > 1 else ordered * 99
+    return {
+        "p50_ms": round(cuts[49] * 1000, 3),
+        "p95_ms": round(cuts[94] * 1000, 3),
+        "p99_ms": round(cuts[98] * 1000, 3),
+        "max_ms": round(ordered[-1] * 1000, 3),
+    }
@@ -0,0 +1,84 @@
+"""
+Requests/sec of the API on the threadpool (psycopg2-style) path vs the
+AsyncSession path, with SQLite/aiosqlite standing in for PostgreSQL.
+
+    poetry run python benchmarks/bench_async_vs_sync.py --clients 500 --requests 5000
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from _common import percentiles, reset_schema, run_child, seed, sqlite_env  # noqa: E402
+
+
+async def _load(project_ids: list[int], clients: int, total: int) -> dict:
+    import httpx
+
+    from todolist.core.settings import db_settings
+    from todolist.db.async_session import get_async_engine
+    from todolist.web_app import create_app
+
+    transport = httpx.ASGITransport(app=create_app())
+    latencies: list[float] = []
+    queue: asyncio.Queue[str] = asyncio.Queue()
+    for i in range(total):
+        pid = project_ids[i % len(project_ids)]
+        queue.put_nowait(f"/api/projects/{pid}/tasks" if i % 2 else f"/api/projects/{pid}")
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+
+        async def worker() -> None:
+            while not queue.empty():
+                url = queue.get_nowait()
+                started = time.perf_counter()
+                response = await client.get(url)
+                latencies.append(time.perf_counter() - started)
+                response.raise_for_status()
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(clients)))
+        elapsed = time.perf_counter() - started
+
+    if db_settings.async_enabled:
+        # aiosqlite keeps a worker thread per connection until disposed
+        await get_async_engine().dispose()
+
+    return {"requests": total, "seconds": round(elapsed, 3),
+            "rps": round(total / elapsed, 1), **percentiles(latencies)}
+
+
+def _child(args: argparse.Namespace) -> None:
+    reset_schema()
+    project_ids = seed(args.projects, args.tasks)
+    result = asyncio.run(_load(project_ids, args.clients, args.requests))
+    print(json.dumps(result))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--clients", type=int, default=500)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--projects", type=int, default=20)
+    parser.add_argument("--tasks", type=int, default=20, help="tasks per project")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        _child(args)
+        return
+
+    child_args = ["--child", "--clients", str(args.clients), "--requests",
+                  str(args.requests), "--projects", str(args.projects),
+                  "--tasks", str(args.tasks)]
+    for mode, flag in (("sync (threadpool)", "false"), ("async (aiosqlite)", "true")):
+        output = run_child(__file__, child_args, sqlite_env(DB_ASYNC=flag))
+        print(f"{mode:>20}: {output.strip()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Bulk task creation: one POST .../tasks:batch against one POST per task.
+
+    poetry run python benchmarks/bench_batch_create.py --tasks 10000 --single 1000
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from _common import reset_schema, run_child, seed, sqlite_env  # noqa: E402
+
+
+def _item(i: int) -> dict:
+    return {
+        "title": f"Batch task {i}",
+        "description": "Created by the batch benchmark",
+        "deadline": "2030-01-01" if i % 2 else None,
+    }
+
+
+async def _run(tasks: int, single: int) -> dict:
+    import httpx
+
+    from todolist.web_app import create_app
+
+    (project_id,) = seed(1, 0)
+    base = f"/api/projects/{project_id}/tasks"
+    transport = httpx.ASGITransport(app=create_app())
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        payload = {"items": [_item(i) for i in range(tasks)]}
+        started = time.perf_counter()
+        response = await client.post(f"{base}:batch", json=payload)
+        batch_s = time.perf_counter() - started
+        response.raise_for_status()
+
+        started = time.perf_counter()
+        for i in range(single):
+            (await client.post(base, json=_item(i))).raise_for_status()
+        single_s = time.perf_counter() - started
+
+    return {
+        "batch": {
+            "tasks": tasks,
+            "total_s": round(batch_s, 3),
+            "tasks_per_s": round(tasks / batch_s),
+        },
+        "single": {
+            "tasks": single,
+            "total_s": round(single_s, 3),
+            "tasks_per_s": round(single / single_s) if single else None,
+        },
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--tasks", type=int, default=10_000, help="items in the batch request")
+    parser.add_argument(
+        "--single",
+        type=int,
+        default=1_000,
+        help="tasks created one request at a time for comparison",
+    )
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        reset_schema()
+        print(json.dumps(asyncio.run(_run(args.tasks, args.single))))
+        return
+
+    child_args = ["--child", "--tasks", str(args.tasks), "--single", str(args.single)]
+    env = sqlite_env(TASK_BATCH_MAX_SIZE=str(max(args.tasks, 1)))
+    output = run_child(__file__, child_args, env)
+    print(f"create {args.tasks} tasks in one batch: {output.strip()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+"""
+Task change feed under concurrent writers: ordering, no-gap delivery and the
+cost of an incremental sync against re-reading the whole task list.
+
+Writers create, update and delete tasks of two projects through the API while
+a follower long-polls the feed of one of them. The run fails if the follower
+sees a seq twice, out of order, or misses one that is in task_changes, if the
+SSE stream delivers anything else, or if replaying the feed over the initial
+task list does not give the final one.
+
+    poetry run python benchmarks/bench_change_feed.py --tasks 100000 --writes 2000
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from _common import percentiles, reset_schema, run_child, seed, sqlite_env  # noqa: E402
+
+PAGE_LIMIT = 500
+
+
+async def _list_all(client, project_id: int) -> dict[str, dict]:
+    tasks: dict[str, dict] = {}
+    after = None
+    while True:
+        params = {"limit": PAGE_LIMIT, **({"after": after} if after else {})}
+        page = (await client.get(f"/api/projects/{project_id}/tasks", params=params)).json()
+        tasks.update((task["id"], task) for task in page["items"])
+        after = page["next_cursor"]
+        if after is None:
+            return tasks
+
+
+async def _write(client, project_ids: list[int], writes: int, writers: int) -> list[float]:
+    latencies: list[float] = []
+    remaining = iter(range(writes))
+    rng = random.Random(17)
+    created: dict[int, list[str]] = {pid: [] for pid in project_ids}
+
+    async def writer() -> None:
+        for i in remaining:
+            pid = project_ids[i % len(project_ids)]
+            base = f"/api/projects/{pid}/tasks"
+            ids = created[pid]
+            started = time.perf_counter()
+            roll = rng.random()
+            if ids and roll < 0.2:
+                response = await client.delete(f"{base}/{ids.pop(rng.randrange(len(ids)))}")
+            elif ids and roll < 0.5:
+                response = await client.put(
+                    f"{base}/{rng.choice(ids)}",
+                    json={"title": f"Edited {i}", "status": "doing"},
+                )
+            else:
+                response = await client.post(
+                    base, json={"title": f"Feed task {i}", "description": "Written by the feed benchmark"}
+                )
+                if response.status_code == 201:
+                    ids.append(response.json()["id"])
+            latencies.append(time.perf_counter() - started)
+            if response.status_code not in (200, 201, 204, 404):
+                raise RuntimeError(f"{response.status_code}: {response.text}")
+
+    await asyncio.gather(*(writer() for _ in range(writers)))
+    return latencies
+
+
+async def _follow(client, project_id: int, since: int, done: asyncio.Event) -> tuple[list[dict], list[float]]:
+    """Long-poll until the writers are done and a final read comes back empty."""
+    changes: list[dict] = []
+    latencies: list[float] = []
+    url = f"/api/projects/{project_id}/tasks/changes"
+    while True:
+        finished = done.is_set()
+        started = time.perf_counter()
+        response = await client.get(
+            url, params={"since": since, "limit": PAGE_LIMIT, "wait": 0 if finished else 1}
+        )
+        latencies.append(time.perf_counter() - started)
+        body = response.json()
+        changes.extend(body["changes"])
+        since = body["next_since"]
+        if finished and not body["changes"]:
+            return changes, latencies
+
+
+def _stored_seqs(project_id: int, since: int) -> list[int]:
+    from sqlalchemy import select
+
+    from todolist.db.models import TaskChangeDB
+    from todolist.db.session import get_session
+
+    stmt = (
+        select(TaskChangeDB.seq)
+        .where(TaskChangeDB.project_id == project_id, TaskChangeDB.seq > since)
+        .order_by(TaskChangeDB.seq)
+    )
+    with get_session() as session:
+        return list(session.execute(stmt).scalars())
+
+
+def _sse_seqs(body: str) -> list[int]:
+    return [int(line[4:]) for line in body.splitlines() if line.startswith("id: ")]
+
+
+async def _run(project_ids: list[int], writes: int, writers: int) -> dict:
+    import httpx
+
+    from todolist.core.settings import db_settings
+    from todolist.db.async_session import get_async_engine
+    from todolist.web_app import create_app
+
+    followed = project_ids[0]
+    transport = httpx.ASGITransport(app=create_app())
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as client:
+        head = (await client.get(f"/api/projects/{followed}/tasks/changes")).json()["next_since"]
+        initial = await _list_all(client, followed)
+
+        done = asyncio.Event()
+        follower = asyncio.create_task(_follow(client, followed, head, done))
+        started = time.perf_counter()
+        write_latencies = await _write(client, project_ids, writes, writers)
+        write_seconds = time.perf_counter() - started
+        done.set()
+        changes, poll_latencies = await follower
+
+        # Ordering and no gaps: exactly the stored seqs, each once, ascending
+        seqs = [change["seq"] for change in changes]
+        stored = _stored_seqs(followed, head)
+        assert seqs == sorted(set(seqs)), "feed delivered a seq twice or out of order"
+        assert seqs == stored, f"feed missed {len(set(stored) - set(seqs))} changes"
+
+        # Replaying the feed over the initial list gives the final list
+        replayed = dict(initial)
+        for change in changes:
+            if change["task"] is None:
+                replayed.pop(change["task_id"], None)
+            else:
+                replayed[change["task_id"]] = change["task"]
+
+        started = time.perf_counter()
+        final = await _list_all(client, followed)
+        full_seconds = time.perf_counter() - started
+        assert replayed == final, "replaying the feed does not give the final task list"
+
+        sse = await client.get(
+            f"/api/projects/{followed}/tasks/changes",
+            params={"since": head, "limit": PAGE_LIMIT},
+            headers={"accept": "text/event-stream"},
+        )
+        assert _sse_seqs(sse.text) == seqs, "SSE stream differs from the long-poll feed"
+
+        started = time.perf_counter()
+        sync = await client.get(
+            f"/api/projects/{followed}/tasks/changes", params={"since": seqs[-1], "limit": PAGE_LIMIT}
+        )
+        incremental_seconds = time.perf_counter() - started
+        assert sync.json()["changes"] == []
+
+    if db_settings.async_enabled:
+        # aiosqlite keeps a worker thread per connection until disposed
+        await get_async_engine().dispose()
+
+    return {
+        "initial_tasks": len(initial),
+        "writes": writes,
+        "writes_per_s": round(writes / write_seconds, 1),
+        "write": percentiles(write_latencies),
+        "changes_delivered": len(changes),
+        "polls": len(poll_latencies),
+        "ordering_and_gaps": "ok",
+        "sse": "ok",
+        "up_to_date_check_ms": round(incremental_seconds * 1000, 3),
+        "full_list_ms": round(full_seconds * 1000, 3),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--tasks", type=int, default=100000, help="tasks seeded in the followed project")
+    parser.add_argument("--writes", type=int, default=2000)
+    parser.add_argument("--writers", type=int, default=8, help="concurrent writing clients")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        reset_schema()
+        project_ids = seed(1, args.tasks) + seed(1, 0, name_prefix="Other")
+        result = asyncio.run(_run(project_ids, args.writes, args.writers))
+        print(json.dumps(result, indent=2))
+        return
+
+    child_args = ["--child", "--tasks", str(args.tasks),
+                  "--writes", str(args.writes), "--writers", str(args.writers)]
+    # Short poll interval and stream lifetime: the SSE check reads one whole stream
+    env = sqlite_env(CHANGE_FEED_POLL_INTERVAL_SECONDS="0.05", CHANGE_FEED_STREAM_MAX_SECONDS="1")
+    print(run_child(__file__, child_args, env).strip())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Time-to-first-byte and throughput of the streaming task export endpoint.
+
+    poetry run python benchmarks/bench_export.py --tasks 200000 --format ndjson
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from _common import reset_schema, run_child, seed, sqlite_env  # noqa: E402
+
+
+async def _export(project_id: int, export_format: str, trace_memory: bool) -> dict:
+    """Drive the ASGI app directly: httpx's ASGITransport buffers whole bodies."""
+    from todolist.web_app import create_app
+
+    app = create_app()
+    path = f"/api/projects/{project_id}/tasks/export"
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": f"format={export_format}".encode(),
+        "headers": [(b"host", b"bench")],
+        "client": ("127.0.0.1", 50000),
+        "server": ("bench", 80),
+    }
+    request_sent = False
+    disconnected = asyncio.Event()
+    stats = {"status": None, "ttfb": None, "bytes": 0}
+
+    async def receive() -> dict:
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await disconnected.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message: dict) -> None:
+        if message["type"] == "http.response.start":
+            stats["status"] = message["status"]
+        elif message["type"] == "http.response.body" and message.get("body"):
+            if stats["ttfb"] is None:
+                stats["ttfb"] = time.perf_counter() - started
+            stats["bytes"] += len(message["body"])
+
+    if trace_memory:
+        tracemalloc.start()
+    started = time.perf_counter()
+    await app(scope, receive, send)
+    elapsed = time.perf_counter() - started
+    disconnected.set()
+
+    result = {
+        "status": stats["status"],
+        "ttfb_ms": round(stats["ttfb"] * 1000, 3),
+        "total_s": round(elapsed, 3),
+        "bytes": stats["bytes"],
+        "mb_per_s": round(stats["bytes"] / elapsed / 1e6, 2),
+    }
+    if trace_memory:
+        result["peak_traced_mb"] = round(tracemalloc.get_traced_memory()[1] / 1e6, 2)
+        tracemalloc.stop()
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--tasks", type=int, default=200_000)
+    parser.add_argument("--format", choices=["ndjson", "csv"], default="ndjson")
+    parser.add_argument(
+        "--trace-memory",
+        action="store_true",
+        help="report peak traced allocations (slows the run down)",
+    )
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        reset_schema()
+        (project_id,) = seed(1, args.tasks)
+        result = asyncio.run(_export(project_id, args.format, args.trace_memory))
+        print(json.dumps(result))
+        return
+
+    child_args = ["--child", "--tasks", str(args.tasks), "--format", args.format]
+    if args.trace_memory:
+        child_args.append("--trace-memory")
+    output = run_child(__file__, child_args, sqlite_env())
+    print(f"export {args.tasks} tasks as {args.format}: {output.strip()}")
+
+
+if __name__ == "__main__":
+    main()
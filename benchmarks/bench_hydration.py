@@ -0,0 +1,111 @@
+"""
+Per-row cost and memory of turning persisted task rows into Task objects.
+
+Compares the validating constructor on a dict-backed class (the previous
+Task) with the slotted Task.from_row() used by the repositories.
+
+    poetry run python benchmarks/bench_hydration.py --rows 1000000
+"""
+import argparse
+import gc
+import json
+import time
+import tracemalloc
+from datetime import date, datetime
+
+from todolist.models.task import Task
+
+
+class _DictTask(Task):
+    """Task with a per-instance __dict__ (no __slots__ in this subclass)."""
+
+
+def _rows(n: int) -> list[tuple]:
+    now = datetime.now()
+    deadline = date(2030, 1, 1)
+    return [
+        (
+            str(i),
+            f"Task {i}",
+            "Seeded benchmark task",
+            ("todo", "doing", "done")[i % 3],
+            deadline if i % 2 else None,
+            now,
+            None,
+            "1",
+        )
+        for i in range(n)
+    ]
+
+
+def _validated(cls: type, rows: list[tuple]) -> list:
+    return [
+        cls(
+            title=title,
+            description=description,
+            status=status,
+            deadline=deadline,
+            id=task_id,
+            created_at=created_at,
+            closed_at=closed_at,
+            project_id=project_id,
+        )
+        for task_id, title, description, status, deadline, created_at, closed_at, project_id in rows
+    ]
+
+
+def _trusted(cls: type, rows: list[tuple]) -> list:
+    return [
+        cls.from_row(
+            id=task_id,
+            title=title,
+            description=description,
+            status=status,
+            deadline=deadline,
+            created_at=created_at,
+            closed_at=closed_at,
+            project_id=project_id,
+        )
+        for task_id, title, description, status, deadline, created_at, closed_at, project_id in rows
+    ]
+
+
+def _measure(build, cls: type, rows: list[tuple]) -> dict:
+    gc.collect()
+    started = time.perf_counter()
+    objects = build(cls, rows)
+    elapsed = time.perf_counter() - started
+    del objects
+
+    # Field values are shared with the input rows, so traced memory is the
+    # objects themselves plus the result list
+    gc.collect()
+    tracemalloc.start()
+    objects = build(cls, rows)
+    traced = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del objects
+
+    return {
+        "ns_per_row": round(elapsed / len(rows) * 1e9),
+        "mb_per_1m_rows": round(traced / len(rows) * 1_000_000 / 1e6, 1),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    rows = _rows(args.rows)
+    result = {
+        "rows": args.rows,
+        "before_validated_dict": _measure(_validated, _DictTask, rows),
+        "validated_slots": _measure(_validated, Task, rows),
+        "after_from_row_slots": _measure(_trusted, Task, rows),
+    }
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""
+Throughput of list_tasks and list_projects: the Core-row fast path served by
+the API against the former ORM -> domain -> response model path.
+
+The former path is mounted next to the real routes under /legacy, so both are
+measured against the same data in one process.
+
+    poetry run python benchmarks/bench_list_endpoints.py --requests 2000 --limit 500
+
+With --accept application/msgpack the fast path answers in MessagePack (the
+legacy routes always answer in JSON); body sizes are reported for both.
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from _common import percentiles, reset_schema, run_child, seed, sqlite_env  # noqa: E402
+
+
+def _app_with_legacy_routes():
+    from sqlalchemy import select
+
+    from todolist.api.controller_schemas.responses.project_response_schema import (
+        ProjectPageResponse,
+    )
+    from todolist.api.controller_schemas.responses.task_response_schema import (
+        TaskPageResponse,
+    )
+    from todolist.api.controllers.projects_controller import _project_to_response
+    from todolist.api.controllers.tasks_controller import _task_to_response
+    from todolist.api.pagination import split_page
+    from todolist.db.models import ProjectDB
+    from todolist.db.session import get_session
+    from todolist.repositories.project_db import ProjectDBRepository
+    from todolist.repositories.task_db import TaskDBRepository
+    from todolist.web_app import create_app
+
+    app = create_app()
+
+    # The repositories only serve rows now: the ORM query and hydration are done here
+    def orm_page(stmt, to_domain, limit: int) -> list:
+        with get_session() as session:
+            return [to_domain(row) for row in session.execute(stmt.limit(limit + 1)).scalars()]
+
+    @app.get("/legacy/projects", response_model=ProjectPageResponse)
+    def legacy_list_projects(limit: int):
+        stmt = select(ProjectDB).order_by(ProjectDB.id)
+        projects = orm_page(stmt, ProjectDBRepository._to_domain, limit)
+        page, next_cursor = split_page(projects, limit)
+        return ProjectPageResponse(
+            items=[_project_to_response(p) for p in page], next_cursor=next_cursor
+        )
+
+    @app.get("/legacy/projects/{project_id}/tasks", response_model=TaskPageResponse)
+    def legacy_list_tasks(project_id: str, limit: int):
+        stmt = TaskDBRepository.list_by_project_stmt(int(project_id))
+        tasks = orm_page(stmt, TaskDBRepository._to_domain, limit)
+        page, next_cursor = split_page(tasks, limit)
+        return TaskPageResponse(
+            items=[_task_to_response(t) for t in page], next_cursor=next_cursor
+        )
+
+    return app
+
+
+async def _load(client, url: str, total: int, clients: int, accept: str) -> dict:
+    latencies: list[float] = []
+    remaining = iter(range(total))
+    headers = {"accept": accept}
+
+    async def worker() -> None:
+        for _ in remaining:
+            started = time.perf_counter()
+            response = await client.get(url, headers=headers)
+            latencies.append(time.perf_counter() - started)
+            response.raise_for_status()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(clients)))
+    elapsed = time.perf_counter() - started
+    return {"rps": round(total / elapsed, 1), **percentiles(latencies)}
+
+
+async def _run(project_id: int, total: int, clients: int, limit: int, accept: str) -> dict:
+    import httpx
+
+    transport = httpx.ASGITransport(app=_app_with_legacy_routes())
+    results = {}
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for name, path in (
+            ("list_projects", "/projects"),
+            ("list_tasks", f"/projects/{project_id}/tasks"),
+        ):
+            fast_url = f"/api{path}?limit={limit}"
+            legacy_url = f"/legacy{path}?limit={limit}"
+            legacy = await client.get(legacy_url)
+            fast = await client.get(fast_url)
+            assert legacy.json() == fast.json(), f"{name}: responses differ"
+            negotiated = await client.get(fast_url, headers={"accept": accept})
+
+            results[name] = {
+                "orm": await _load(client, legacy_url, total, clients, accept),
+                "core_rows": await _load(client, fast_url, total, clients, accept),
+                "json_bytes": len(fast.content),
+                "response_bytes": len(negotiated.content),
+                "response_type": negotiated.headers["content-type"],
+            }
+            results[name]["speedup"] = round(
+                results[name]["core_rows"]["rps"] / results[name]["orm"]["rps"], 2
+            )
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--requests", type=int, default=2000, help="requests per scenario")
+    parser.add_argument("--clients", type=int, default=10)
+    parser.add_argument("--limit", type=int, default=500, help="page size")
+    parser.add_argument("--accept", default="application/json", help="Accept header of the requests")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        reset_schema()
+        # Enough projects and tasks for both endpoints to return full pages
+        (project_id,) = seed(1, args.limit + 1)
+        seed(args.limit, 0, name_prefix="Empty")
+        result = asyncio.run(
+            _run(project_id, args.requests, args.clients, args.limit, args.accept)
+        )
+        print(json.dumps(result, indent=2))
+        return
+
+    child_args = ["--child", "--requests", str(args.requests),
+                  "--clients", str(args.clients), "--limit", str(args.limit),
+                  "--accept", args.accept]
+    print(run_child(__file__, child_args, sqlite_env(PAGE_SIZE_MAX=str(args.limit))).strip())
+
+
+if __name__ == "__main__":
+    main()
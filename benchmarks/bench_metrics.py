@@ -0,0 +1,128 @@
+"""
+Overhead of the metrics registry: the cost of one update, of a scrape, and
+of API_METRICS=true on request throughput.
+
+    poetry run python benchmarks/bench_metrics.py --requests 5000 --clients 50
+
+The request phase runs the same concurrent GET mix (a task, a page of tasks)
+through the app in-process with API_METRICS on and off, each in a fresh
+interpreter; Server-Timing stays on in both.
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from _common import percentiles, reset_schema, run_child, seed, sqlite_env  # noqa: E402
+
+
+def _per_call_ns(fn, calls: int) -> float:
+    started = time.perf_counter()
+    for _ in range(calls):
+        fn()
+    return round((time.perf_counter() - started) / calls * 1e9, 1)
+
+
+def _registry(calls: int, routes: int) -> dict:
+    from todolist.core.metrics import MetricsRegistry
+
+    registry = MetricsRegistry()
+    counter = registry.counter("bench_total", "Bench counter.")
+    histogram = registry.histogram("bench_seconds", "Bench histogram.", ("method", "route", "status"))
+    for i in range(routes):
+        for status in ("200", "404"):
+            histogram.labels("GET", f"/route/{i}", status).observe(0.01)
+
+    # The first scrape also formats each series' label text once
+    registry.render()
+    started = time.perf_counter()
+    body = registry.render()
+    render_ms = (time.perf_counter() - started) * 1000
+    return {
+        "counter_inc_ns": _per_call_ns(counter.inc, calls),
+        "histogram_observe_ns": _per_call_ns(
+            lambda: histogram.labels("GET", "/route/1", "200").observe(0.003), calls
+        ),
+        "render_series": routes * 2,
+        "render_ms": round(render_ms, 3),
+        "render_bytes": len(body),
+    }
+
+
+async def _requests(project_ids: list[int], clients: int, total: int) -> dict:
+    import httpx
+
+    from todolist.web_app import create_app
+
+    transport = httpx.ASGITransport(app=create_app())
+    latencies: list[float] = []
+    urls = []
+    for i in range(total):
+        pid = project_ids[i % len(project_ids)]
+        # 20 tasks per project: task (pid - 1) * 20 + 1 belongs to project pid
+        base = f"/api/projects/{pid}/tasks"
+        urls.append(base if i % 2 else f"{base}/{(pid - 1) * 20 + 1}")
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+
+        async def worker() -> None:
+            while urls:
+                url = urls.pop()
+                started = time.perf_counter()
+                response = await client.get(url)
+                latencies.append(time.perf_counter() - started)
+                response.raise_for_status()
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(clients)))
+        elapsed = time.perf_counter() - started
+
+        scrape_started = time.perf_counter()
+        scrape = await client.get("/metrics") if os.environ["API_METRICS"] == "true" else None
+        scrape_ms = (time.perf_counter() - scrape_started) * 1000
+
+    result = {"requests": total, "rps": round(total / elapsed, 1), **percentiles(latencies)}
+    if scrape is not None:
+        result["scrape_ms"] = round(scrape_ms, 3)
+        result["scrape_bytes"] = len(scrape.content)
+    return result
+
+
+def _child(args) -> dict:
+    reset_schema()
+    project_ids = seed(args.projects, 20)
+    return asyncio.run(_requests(project_ids, args.clients, args.requests))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--clients", type=int, default=50)
+    parser.add_argument("--projects", type=int, default=20)
+    parser.add_argument("--calls", type=int, default=1000000, help="registry updates timed")
+    parser.add_argument("--routes", type=int, default=50, help="routes in the rendered registry")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(_child(args)))
+        return
+
+    child_args = ["--child", "--requests", str(args.requests), "--clients", str(args.clients),
+                  "--projects", str(args.projects)]
+    result = {"registry": _registry(args.calls, args.routes)}
+    for mode in ("false", "true"):
+        output = run_child(__file__, child_args, sqlite_env(STORAGE_BACKEND="sql", API_METRICS=mode))
+        result[f"api_metrics_{mode}"] = json.loads(output)
+
+    off, on = result["api_metrics_false"]["rps"], result["api_metrics_true"]["rps"]
+    result["throughput_change_pct"] = round((on - off) / off * 100, 2)
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Deleting a project with many tasks through DELETE /api/projects/{id}.
+
+    poetry run python benchmarks/bench_project_delete.py --tasks 200000
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from _common import reset_schema, run_child, seed, sqlite_env  # noqa: E402
+
+
+async def _delete(project_id: int) -> dict:
+    import httpx
+    from sqlalchemy import func, select
+
+    from todolist.db.models import TaskDB
+    from todolist.db.session import engine
+    from todolist.web_app import create_app
+
+    transport = httpx.ASGITransport(app=create_app())
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        started = time.perf_counter()
+        response = await client.delete(f"/api/projects/{project_id}")
+        elapsed = time.perf_counter() - started
+
+    with engine.connect() as conn:
+        remaining = conn.execute(
+            select(func.count()).where(TaskDB.project_id == project_id)
+        ).scalar_one()
+
+    return {
+        "status": response.status_code,
+        "total_s": round(elapsed, 3),
+        "remaining_tasks": remaining,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--tasks", type=int, default=200_000)
+    parser.add_argument(
+        "--other-projects",
+        type=int,
+        default=4,
+        help="projects of the same size that must survive the delete",
+    )
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        reset_schema()
+        project_ids = seed(1 + args.other_projects, args.tasks)
+        result = asyncio.run(_delete(project_ids[0]))
+        result["tasks_per_s"] = round(args.tasks / result["total_s"]) if result["total_s"] else None
+        print(json.dumps(result))
+        return
+
+    child_args = [
+        "--child",
+        "--tasks",
+        str(args.tasks),
+        "--other-projects",
+        str(args.other_projects),
+    ]
+    output = run_child(__file__, child_args, sqlite_env())
+    print(f"delete project with {args.tasks} tasks: {output.strip()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+"""
+Latency of full-text task search (GET /api/search) at a million tasks.
+
+Tasks get titles and descriptions drawn from a Zipf-distributed vocabulary,
+so some words are in a large share of the tasks and most are rare. Each
+query class is timed through TaskDBRepository.search_page_rows (first page,
+and a page ten cursors deep), next to the substring scan a search without
+the index would be.
+
+    poetry run python benchmarks/bench_search.py --tasks 1000000
+
+Seeding goes through the same triggers (SQLite) or generated column
+(PostgreSQL) as API writes, so seed time includes index maintenance.
+"""
+import argparse
+import itertools
+import json
+import os
+import random
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from _common import percentiles, reset_schema, run_child, sqlite_env  # noqa: E402
+
+VOCABULARY_SIZE = 5000
+SEED_CHUNK = 20000
+_SYLLABLES = ["ka", "lo", "mi", "re", "tu", "san", "vel", "dor", "pin", "qua", "zen", "fi"]
+
+
+def _vocabulary() -> list[str]:
+    rng = random.Random(7)
+    words: dict[str, None] = {}
+    while len(words) < VOCABULARY_SIZE:
+        words["".join(rng.choices(_SYLLABLES, k=rng.randint(2, 4)))] = None
+    return list(words)
+
+
+def _seed(tasks: int, projects: int, words: list[str]) -> float:
+    from sqlalchemy import insert
+
+    from todolist.db.models import ProjectDB, TaskDB
+    from todolist.db.session import engine
+
+    rng = random.Random(11)
+    # Zipf: the n-th word is n times rarer than the first
+    cumulative = list(itertools.accumulate(1 / rank for rank in range(1, len(words) + 1)))
+    now = datetime.now()
+
+    started = time.perf_counter()
+    with engine.begin() as conn:
+        project_ids = conn.execute(
+            insert(ProjectDB).returning(ProjectDB.id),
+            [{"name": f"Search {i}", "created_at": now} for i in range(projects)],
+        ).scalars().all()
+        for offset in range(0, tasks, SEED_CHUNK):
+            rows = []
+            for i in range(offset, min(offset + SEED_CHUNK, tasks)):
+                title = " ".join(rng.choices(words, cum_weights=cumulative, k=3))[:30]
+                description = " ".join(rng.choices(words, cum_weights=cumulative, k=12))[:150]
+                rows.append(
+                    {
+                        "title": title,
+                        "description": description,
+                        "status": "todo",
+                        "created_at": now,
+                        "project_id": project_ids[i % projects],
+                    }
+                )
+            conn.execute(insert(TaskDB), rows)
+    return time.perf_counter() - started
+
+
+def _time(fn, repeats: int) -> tuple[dict, object]:
+    samples = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        result = fn()
+        samples.append(time.perf_counter() - started)
+    return percentiles(samples), result
+
+
+def _match_count(repo, search) -> int:
+    from sqlalchemy import func, select
+
+    from todolist.db.session import engine, get_session
+
+    # Unbounded: every match, the same set a client would page through
+    stmt = repo.search_stmt(engine.dialect.name, search, None).subquery()
+    with get_session() as session:
+        return session.execute(select(func.count()).select_from(stmt)).scalar_one()
+
+
+def _scan(words: list[str], limit: int):
+    """What the query costs without the index: a substring scan of both columns."""
+    from sqlalchemy import and_, or_, select
+
+    from todolist.db.models import TaskDB
+    from todolist.db.session import get_session
+
+    stmt = (
+        select(TaskDB.id)
+        .where(
+            and_(
+                *(
+                    or_(TaskDB.title.ilike(f"%{word}%"), TaskDB.description.ilike(f"%{word}%"))
+                    for word in words
+                )
+            )
+        )
+        .order_by(TaskDB.id)
+        .limit(limit)
+    )
+
+    def run():
+        with get_session() as session:
+            return session.execute(stmt).all()
+
+    return run
+
+
+def _child(tasks: int, projects: int, limit: int, repeats: int) -> dict:
+    from todolist.db.session import engine
+    from todolist.models.task_search import TaskSearch
+    from todolist.repositories.task_db import TaskDBRepository
+
+    words = _vocabulary()
+    reset_schema()
+    seed_seconds = _seed(tasks, projects, words)
+
+    repo = TaskDBRepository()
+    queries = {
+        "common_word": words[0],
+        "mid_word": words[99],
+        "rare_word": words[3999],
+        "two_words": f"{words[2]} {words[30]}",
+        "prefix_2_chars": words[0][:2],
+        "no_match": "nonexistentword",
+    }
+
+    results: dict = {}
+    for name, q in queries.items():
+        search = TaskSearch(q)
+        first, _ = _time(lambda: repo.search_page_rows(search, limit + 1), repeats)
+        entry = {"q": q, "matches": _match_count(repo, search), "first_page": first}
+
+        # Ten pages deep: the cursor of page 9, as a client would send it
+        after = None
+        for _ in range(9):
+            page = repo.search_page_rows(search, limit + 1, after)
+            if len(page) <= limit:
+                after = None
+                break
+            after = search.cursor_of(page[limit - 1])
+        if after is not None:
+            entry["page_10"], _ = _time(
+                lambda: repo.search_page_rows(search, limit + 1, after), repeats
+            )
+        results[name] = entry
+
+    scan, _ = _time(_scan(queries["rare_word"].split(), limit + 1), max(1, repeats // 10))
+    return {
+        "dialect": engine.dialect.name,
+        "tasks": tasks,
+        "projects": projects,
+        "limit": limit,
+        "seed_seconds": round(seed_seconds, 1),
+        "seed_tasks_per_s": round(tasks / seed_seconds),
+        "queries": results,
+        "rare_word_substring_scan": scan,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--tasks", type=int, default=1000000)
+    parser.add_argument("--projects", type=int, default=100)
+    parser.add_argument("--limit", type=int, default=50, help="page size")
+    parser.add_argument("--repeats", type=int, default=50, help="timed runs per query")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    child_args = ["--tasks", str(args.tasks), "--projects", str(args.projects),
+                  "--limit", str(args.limit), "--repeats", str(args.repeats)]
+    if args.child:
+        print(json.dumps(_child(args.tasks, args.projects, args.limit, args.repeats), indent=2))
+        return
+
+    print(run_child(__file__, ["--child", *child_args], sqlite_env()).strip())
+
+
+if __name__ == "__main__":
+    main()
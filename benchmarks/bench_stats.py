@@ -0,0 +1,119 @@
+"""
+Dashboard load: GET /api/stats and /api/projects/{id}/stats against counting
+the same numbers client-side from every page of every project's task list.
+
+    poetry run python benchmarks/bench_stats.py --projects 20 --tasks 10000
+
+The two must agree; the run fails otherwise. Revalidating a project's stats
+with its ETag (304, no counting) is timed as well.
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from datetime import date
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from _common import percentiles, reset_schema, run_child, seed, sqlite_env  # noqa: E402
+
+PAGE_LIMIT = 500
+
+
+async def _count_client_side(client, project_ids: list[int]) -> dict:
+    """What the dashboard did before: download every task and count."""
+    today = date.today().isoformat()
+    counts = {}
+    for project_id in project_ids:
+        stats = {"total": 0, "by_status": {}, "overdue": 0}
+        after = None
+        while True:
+            params = {"limit": PAGE_LIMIT, **({"after": after} if after else {})}
+            page = (await client.get(f"/api/projects/{project_id}/tasks", params=params)).json()
+            for task in page["items"]:
+                stats["total"] += 1
+                stats["by_status"][task["status"]] = stats["by_status"].get(task["status"], 0) + 1
+                deadline = task["deadline"]
+                if deadline and deadline[:10] < today and task["status"] != "done":
+                    stats["overdue"] += 1
+            after = page["next_cursor"]
+            if after is None:
+                break
+        counts[str(project_id)] = stats
+    return counts
+
+
+async def _timed(fn, repeats: int):
+    samples, result = [], None
+    for _ in range(repeats):
+        started = time.perf_counter()
+        result = await fn()
+        samples.append(time.perf_counter() - started)
+    return percentiles(samples), result
+
+
+async def _run(project_ids: list[int], repeats: int) -> dict:
+    import httpx
+
+    from todolist.core.settings import db_settings
+    from todolist.db.async_session import get_async_engine
+    from todolist.web_app import create_app
+
+    transport = httpx.ASGITransport(app=create_app())
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=600) as client:
+        stats_latency, stats = await _timed(lambda: client.get("/api/stats"), repeats)
+        client_latency, counted = await _timed(
+            lambda: _count_client_side(client, project_ids), max(1, repeats // 10)
+        )
+        for project in stats.json()["projects"]:
+            expected = counted[project["project_id"]]
+            by_status = {k: v for k, v in project["by_status"].items() if v}
+            assert (project["total"], by_status, project["overdue"]) == (
+                expected["total"], expected["by_status"], expected["overdue"]
+            ), f"stats of project {project['project_id']} differ from the task list"
+
+        url = f"/api/projects/{project_ids[0]}/stats"
+        project_latency, response = await _timed(lambda: client.get(url), repeats)
+        etag = response.headers["etag"]
+        revalidate_latency, response = await _timed(
+            lambda: client.get(url, headers={"if-none-match": etag}), repeats
+        )
+        assert response.status_code == 304
+
+    if db_settings.async_enabled:
+        # aiosqlite keeps a worker thread per connection until disposed
+        await get_async_engine().dispose()
+
+    return {
+        "stats_all_projects": stats_latency,
+        "client_side_count_all_projects": client_latency,
+        "stats_one_project": project_latency,
+        "stats_one_project_304": revalidate_latency,
+        "results_match": "ok",
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--projects", type=int, default=20)
+    parser.add_argument("--tasks", type=int, default=10000, help="tasks per project")
+    parser.add_argument("--repeats", type=int, default=50)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        reset_schema()
+        project_ids = seed(args.projects, args.tasks)
+        result = asyncio.run(_run(project_ids, args.repeats))
+        print(json.dumps({"projects": args.projects, "tasks_per_project": args.tasks, **result}, indent=2))
+        return
+
+    child_args = ["--child", "--projects", str(args.projects),
+                  "--tasks", str(args.tasks), "--repeats", str(args.repeats)]
+    print(run_child(__file__, child_args, sqlite_env()).strip())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+"""
+Write throughput and recovery time of the write-ahead-logged in-memory
+storage (STORAGE_BACKEND=wal), next to TaskDBRepository on SQLite.
+
+    poetry run python benchmarks/bench_wal.py --tasks 10000000
+
+Each phase runs in a fresh interpreter:
+
+- load: --tasks tasks through create_many in batches of --batch, each batch
+  waited on until it is durable (an fsync per batch on both sides).
+- writes: --writers concurrent units of work that create one task each,
+  --writes in total, as API requests do. The log's group commit shares
+  fsyncs between writers.
+- recovery: reopen the store after the load with only the log to replay,
+  write a snapshot, add a tail of --tail tasks, and reopen from the snapshot
+  plus the tail.
+
+The in-memory store needs roughly 0.5KB of RAM per task (about 5GB at 10M).
+"""
+import argparse
+import asyncio
+import json
+import os
+import shutil
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from _common import percentiles, reset_schema, run_child, sqlite_env  # noqa: E402
+
+WAL_DEFAULT_DIR = os.path.join(os.path.dirname(__file__), ".bench-wal")
+PROJECTS = 100
+
+
+def _tasks(count: int, project_ids: list[str], offset: int = 0):
+    from todolist.models.task import Task
+
+    return [
+        Task(
+            f"Task {offset + i}",
+            "Seeded benchmark task",
+            ("todo", "doing", "done")[i % 3],
+            project_id=project_ids[(offset + i) % len(project_ids)],
+        )
+        for i in range(count)
+    ]
+
+
+def _backend():
+    from todolist.repositories.registry import get_storage_backend
+
+    backend = get_storage_backend()
+    started = time.perf_counter()
+    backend.init()
+    return backend, time.perf_counter() - started
+
+
+def _wait_durable(backend) -> None:
+    store = getattr(backend, "store", None)
+    if store is not None:
+        store.wait_durable(store.lsn)
+
+
+def _load(tasks: int, batch: int) -> dict:
+    from todolist.models.project import Project
+
+    backend, _ = _backend()
+    projects, task_repo = backend.project_repository(), backend.task_repository()
+    project_ids = [
+        projects.create(Project(f"Project {i}", "Seeded benchmark project")).id for i in range(PROJECTS)
+    ]
+
+    started = time.perf_counter()
+    for offset in range(0, tasks, batch):
+        task_repo.create_many(_tasks(min(batch, tasks - offset), project_ids, offset))
+        _wait_durable(backend)
+    seconds = time.perf_counter() - started
+    return {"tasks": tasks, "batch": batch, "seconds": round(seconds, 1), "tasks_per_s": round(tasks / seconds)}
+
+
+async def _concurrent_writes(backend, writers: int, writes: int) -> dict:
+    from todolist.models.task import Task
+
+    project_ids = [row["id"] for row in backend.project_repository().list_page_rows(PROJECTS)]
+    latencies: list[float] = []
+
+    async def writer(n: int) -> None:
+        for i in range(n, writes, writers):
+            started = time.perf_counter()
+            async with backend.new_uow() as uow:
+                await uow.tasks.create(
+                    Task(f"Write {i}", "Concurrent benchmark write", project_id=project_ids[i % len(project_ids)])
+                )
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(writer(n) for n in range(writers)))
+    seconds = time.perf_counter() - started
+    await backend.aclose()
+    return {"writers": writers, "writes": writes, "writes_per_s": round(writes / seconds), **percentiles(latencies)}
+
+
+def _writes(writers: int, writes: int) -> dict:
+    backend, _ = _backend()
+    return asyncio.run(_concurrent_writes(backend, writers, writes))
+
+
+def _recover(snapshot: bool, tail: int) -> dict:
+    backend, seconds = _backend()
+    store = backend.store
+    result = {"tasks": len(store.tasks), "replayed_from_lsn": store.snapshot_lsn, "recovery_s": round(seconds, 2)}
+    if snapshot:
+        started = time.perf_counter()
+        store.snapshot()
+        result["snapshot_write_s"] = round(time.perf_counter() - started, 2)
+        project_ids = [row["id"] for row in backend.project_repository().list_page_rows(PROJECTS)]
+        backend.task_repository().create_many(_tasks(tail, project_ids))
+    return result
+
+
+def _child(args) -> dict:
+    if args.phase == "load":
+        if os.environ["STORAGE_BACKEND"] == "sql":
+            reset_schema()
+        return _load(args.tasks, args.batch)
+    if args.phase == "writes":
+        return _writes(args.writers, args.writes)
+    return _recover(args.phase == "recover-log", args.tail)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--tasks", type=int, default=10000000)
+    parser.add_argument("--batch", type=int, default=10000, help="tasks per create_many")
+    parser.add_argument("--writers", type=int, default=64)
+    parser.add_argument("--writes", type=int, default=20000)
+    parser.add_argument("--tail", type=int, default=100000, help="tasks written after the snapshot")
+    parser.add_argument("--wal-dir", default=WAL_DEFAULT_DIR)
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        args.phase = args.child
+        print(json.dumps(_child(args)))
+        return
+
+    shutil.rmtree(args.wal_dir, ignore_errors=True)
+    wal_env = dict(os.environ, STORAGE_BACKEND="wal", STORAGE_WAL_DIR=args.wal_dir)
+    sql_env = sqlite_env(STORAGE_BACKEND="sql")
+    common = ["--tasks", str(args.tasks), "--batch", str(args.batch), "--writers", str(args.writers),
+              "--writes", str(args.writes), "--tail", str(args.tail)]
+
+    def phase(name: str, env: dict) -> dict:
+        return json.loads(run_child(__file__, [*common, "--child", name], env))
+
+    result = {
+        "wal": {
+            "load": phase("load", wal_env),
+            "recovery_log_only": phase("recover-log", wal_env),
+            "recovery_snapshot_and_tail": phase("recover-snapshot", wal_env),
+            "concurrent_writes": phase("writes", wal_env),
+        },
+        "sqlite": {
+            "load": phase("load", sql_env),
+            "concurrent_writes": phase("writes", sql_env),
+        },
+    }
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Compare two suite.py results: p50, p95 and throughput of every operation.
+
+    poetry run python benchmarks/compare.py before.json after.json --threshold 15
+
+Exits with status 1 when an operation got slower than --threshold percent
+(p50 latency, or throughput for the load scenario) on a target both runs
+measured.
+"""
+import argparse
+import json
+import sys
+
+
+def _change(before: float, after: float) -> float:
+    return (after - before) / before * 100 if before else 0.0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("before")
+    parser.add_argument("after")
+    parser.add_argument("--threshold", type=float, default=10.0, help="percent")
+    args = parser.parse_args()
+
+    with open(args.before) as f:
+        before = json.load(f)
+    with open(args.after) as f:
+        after = json.load(f)
+
+    print(f"before: {before['commit']}{' (dirty)' if before['dirty'] else ''} {before['created_at']}")
+    print(f" after: {after['commit']}{' (dirty)' if after['dirty'] else ''} {after['created_at']}")
+    if before["sizes"] != after["sizes"]:
+        print(f"warning: sizes differ: {before['sizes']} vs {after['sizes']}")
+
+    regressions = []
+    for target in sorted(set(before["targets"]) & set(after["targets"])):
+        print(f"\n{target}")
+        print(f"  {'operation':<20} {'p50 ms':>17}  {'p95 ms':>17}  {'per s':>21}  {'p50':>7}")
+        old_ops, new_ops = before["targets"][target], after["targets"][target]
+        for op in sorted(set(old_ops) & set(new_ops)):
+            old, new = old_ops[op], new_ops[op]
+            if not isinstance(old, dict):
+                continue
+            rate = "rps" if op == "load" else "per_s"
+            p50 = _change(old["p50_ms"], new["p50_ms"])
+            throughput = _change(old[rate], new[rate])
+            print(
+                f"  {op:<20} {old['p50_ms']:>8} {new['p50_ms']:>8}  "
+                f"{old['p95_ms']:>8} {new['p95_ms']:>8}  "
+                f"{old[rate]:>10} {new[rate]:>10}  {p50:+6.1f}%"
+            )
+            worse = -throughput if op == "load" else p50
+            if worse > args.threshold:
+                regressions.append(f"{target} {op}: {worse:+.1f}%")
+
+    if regressions:
+        print(f"\nSlower by more than {args.threshold}%:")
+        for line in regressions:
+            print(f"  {line}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
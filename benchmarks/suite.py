@@ -0,0 +1,343 @@
+"""
+Regression suite for the hot paths: latency percentiles and throughput of
+each operation, written as JSON so two commits can be compared.
+
+    poetry run python benchmarks/suite.py --output before.json
+    git checkout <branch>
+    poetry run python benchmarks/suite.py --output after.json
+    poetry run python benchmarks/compare.py before.json after.json
+
+Operations:
+
+- repo.list_by_project, repo.to_domain, repo.create: TaskDBRepository called
+  directly (to_domain hydrates the ORM rows of one project, already loaded).
+- http.list_tasks, http.get_task, http.create_task, http.update_task,
+  http.delete_task: the tasks_controller endpoints, one request at a time,
+  through the FastAPI app in-process.
+- autoclose.run: autoclose_overdue.run() over the overdue half of the tasks,
+  which are reopened before each iteration.
+- load: --clients concurrent clients sending --requests requests (list, get,
+  create and update in a 5:3:1:1 mix) through the app in-process.
+
+Each target is seeded with --projects projects of --tasks tasks. SQLite is
+always measured; PostgreSQL when --postgres-url (or BENCH_POSTGRES_URL)
+names a reachable database. Its tables are dropped and recreated, so never
+point it at data you want to keep.
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+from datetime import date, datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from _common import percentiles, reset_schema, run_child, seed, sqlite_env  # noqa: E402
+
+SUITE_VERSION = 1
+WARMUP = 5
+LOAD_MIX = ("list",) * 5 + ("get",) * 3 + ("create", "update")
+
+
+def _result(samples: list[float], items: int = 1) -> dict:
+    """Percentiles of the per-call samples and items handled per second."""
+    return {
+        "calls": len(samples),
+        "items_per_call": items,
+        "per_s": round(len(samples) * items / sum(samples), 1),
+        **percentiles(samples),
+    }
+
+
+def _measure(fn, iterations: int, items: int = 1) -> dict:
+    for _ in range(min(WARMUP, iterations)):
+        fn()
+    samples = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    return _result(samples, items)
+
+
+async def _ameasure(fn, iterations: int, items: int = 1) -> dict:
+    for _ in range(min(WARMUP, iterations)):
+        await fn()
+    samples = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        await fn()
+        samples.append(time.perf_counter() - started)
+    return _result(samples, items)
+
+
+def _task_ids(project_id: int) -> list[int]:
+    from sqlalchemy import select
+
+    from todolist.db.models import TaskDB
+    from todolist.db.session import engine
+
+    with engine.connect() as conn:
+        return list(conn.execute(select(TaskDB.id).where(TaskDB.project_id == project_id)).scalars())
+
+
+def _repository(args, project_ids: list[int]) -> dict:
+    from sqlalchemy import select
+
+    from todolist.db.models import TaskDB
+    from todolist.db.session import get_session
+    from todolist.models.task import Task
+    from todolist.repositories.task_db import TaskDBRepository
+
+    repo = TaskDBRepository()
+    pid = str(project_ids[0])
+    results = {
+        "repo.list_by_project": _measure(lambda: repo.list_by_project(pid), args.iterations, args.tasks),
+    }
+
+    with get_session() as session:
+        rows = session.execute(select(TaskDB).where(TaskDB.project_id == project_ids[0])).scalars().all()
+        results["repo.to_domain"] = _measure(
+            lambda: [TaskDBRepository._to_domain(row) for row in rows], args.iterations, len(rows)
+        )
+
+    counter = iter(range(10**9))
+    results["repo.create"] = _measure(
+        lambda: repo.create(Task(f"Bench {next(counter)}", "Created by the suite", project_id=pid)),
+        args.iterations,
+    )
+    return results
+
+
+async def _http(args, project_ids: list[int]) -> dict:
+    import httpx
+
+    from todolist.web_app import create_app
+
+    pid = project_ids[1 % len(project_ids)]
+    base = f"/api/projects/{pid}/tasks"
+    task_ids = _task_ids(pid)
+    picks = random.Random(1)
+    counter = iter(range(10**9))
+    created: list[int] = []
+
+    transport = httpx.ASGITransport(app=create_app())
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+
+        async def call(method: str, url: str, **kwargs) -> httpx.Response:
+            response = await client.request(method, url, **kwargs)
+            response.raise_for_status()
+            return response
+
+        async def create() -> None:
+            payload = {"title": f"Bench {next(counter)}", "description": "Created by the suite"}
+            response = await call("POST", base, json=payload)
+            created.append(response.json()["id"])
+
+        async def update() -> None:
+            await call("PUT", f"{base}/{picks.choice(task_ids)}", json={"title": f"Updated {next(counter)}"})
+
+        async def delete() -> None:
+            await call("DELETE", f"{base}/{created.pop()}")
+
+        n = args.iterations
+        results = {
+            "http.list_tasks": await _ameasure(
+                lambda: call("GET", base, params={"limit": args.limit}), n, min(args.limit, args.tasks)
+            ),
+            "http.get_task": await _ameasure(lambda: call("GET", f"{base}/{picks.choice(task_ids)}"), n),
+            "http.create_task": await _ameasure(create, n),
+            "http.update_task": await _ameasure(update, n),
+        }
+        # Deletes what create_task made (warmup included), newest first
+        results["http.delete_task"] = await _ameasure(delete, n)
+    return results
+
+
+def _autoclose(args) -> dict:
+    from sqlalchemy import update
+
+    from todolist.commands import autoclose_overdue
+    from todolist.db.models import TaskDB
+    from todolist.db.session import engine
+
+    overdue = date.today() - timedelta(days=1)
+    reopen = (
+        update(TaskDB)
+        .where(TaskDB.deadline == overdue)
+        .values(status="todo", closed_at=None)
+    )
+    samples = []
+    for _ in range(args.autoclose_runs):
+        with engine.begin() as conn:
+            closed = conn.execute(reopen).rowcount
+        started = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            autoclose_overdue.run()
+        samples.append(time.perf_counter() - started)
+    return {"autoclose.run": _result(samples, closed)}
+
+
+async def _load(args, project_ids: list[int]) -> dict:
+    import httpx
+
+    from todolist.web_app import create_app
+
+    picks = random.Random(2)
+    task_ids = {pid: _task_ids(pid) for pid in project_ids}
+    plan = [(picks.choice(LOAD_MIX), picks.choice(project_ids)) for _ in range(args.requests)]
+    latencies: dict[str, list[float]] = {kind: [] for kind in sorted(set(LOAD_MIX))}
+
+    transport = httpx.ASGITransport(app=create_app())
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+
+        def request(kind: str, pid: int):
+            base = f"/api/projects/{pid}/tasks"
+            if kind == "list":
+                return client.get(base, params={"limit": args.limit})
+            if kind == "get":
+                return client.get(f"{base}/{picks.choice(task_ids[pid])}")
+            if kind == "create":
+                return client.post(base, json={"title": "Load", "description": "Created by the suite"})
+            return client.put(f"{base}/{picks.choice(task_ids[pid])}", json={"title": "Load", "status": "doing"})
+
+        async def worker() -> None:
+            while plan:
+                kind, pid = plan.pop()
+                started = time.perf_counter()
+                response = await request(kind, pid)
+                latencies[kind].append(time.perf_counter() - started)
+                response.raise_for_status()
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(args.clients)))
+        elapsed = time.perf_counter() - started
+
+    return {
+        "load": {
+            "clients": args.clients,
+            "requests": args.requests,
+            "rps": round(args.requests / elapsed, 1),
+            **percentiles([sample for samples in latencies.values() for sample in samples]),
+            "by_kind": {kind: percentiles(samples) for kind, samples in latencies.items() if samples},
+        }
+    }
+
+
+def _child(args) -> dict:
+    reset_schema()
+    started = time.perf_counter()
+    project_ids = seed(args.projects, args.tasks)
+    results = {"seed_s": round(time.perf_counter() - started, 2)}
+
+    groups = set(args.only.split(",")) if args.only else {"repo", "http", "autoclose", "load"}
+    if "repo" in groups:
+        results.update(_repository(args, project_ids))
+    if "http" in groups:
+        results.update(asyncio.run(_http(args, project_ids)))
+    if "autoclose" in groups:
+        results.update(_autoclose(args))
+    if "load" in groups:
+        results.update(asyncio.run(_load(args, project_ids)))
+    return results
+
+
+def _postgres_unreachable(url: str) -> str | None:
+    from sqlalchemy import create_engine, text
+
+    engine = create_engine(url, connect_args={"connect_timeout": 3})
+    try:
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+    except Exception as e:  # noqa: BLE001 - any failure means "skip this target"
+        return f"{type(e).__name__}: {e}".splitlines()[0]
+    finally:
+        engine.dispose()
+    return None
+
+
+def _git(*args: str) -> str | None:
+    try:
+        return subprocess.run(
+            ["git", *args], capture_output=True, text=True, check=True, cwd=os.path.dirname(__file__)
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--projects", type=int, default=20)
+    parser.add_argument("--tasks", type=int, default=1000, help="tasks per project")
+    parser.add_argument("--iterations", type=int, default=200, help="calls per operation")
+    parser.add_argument("--autoclose-runs", type=int, default=5)
+    parser.add_argument("--limit", type=int, default=50, help="page size of list requests")
+    parser.add_argument("--clients", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--only", help="comma-separated groups: repo, http, autoclose, load")
+    parser.add_argument("--postgres-url", default=os.getenv("BENCH_POSTGRES_URL", ""),
+                        help="postgresql+psycopg2:// URL of a scratch database")
+    parser.add_argument("--output", help="write the JSON here as well as to stdout")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(_child(args)))
+        return
+
+    sizes = {
+        "projects": args.projects,
+        "tasks": args.tasks,
+        "iterations": args.iterations,
+        "autoclose_runs": args.autoclose_runs,
+        "limit": args.limit,
+        "clients": args.clients,
+        "requests": args.requests,
+    }
+    child_args = ["--child"] + [f"--{key.replace('_', '-')}={value}" for key, value in sizes.items()]
+    if args.only:
+        child_args.append(f"--only={args.only}")
+
+    targets = {"sqlite": sqlite_env(STORAGE_BACKEND="sql", DB_ASYNC="false")}
+    skipped = {}
+    if not args.postgres_url:
+        skipped["postgres"] = "no --postgres-url"
+    elif reason := _postgres_unreachable(args.postgres_url):
+        skipped["postgres"] = reason
+    else:
+        targets["postgres"] = dict(
+            os.environ,
+            STORAGE_BACKEND="sql",
+            DB_ASYNC="false",
+            DB_URL=args.postgres_url,
+            DB_ASYNC_URL=args.postgres_url.replace("+psycopg2", "+asyncpg"),
+        )
+
+    result = {
+        "suite_version": SUITE_VERSION,
+        "commit": _git("rev-parse", "HEAD"),
+        "dirty": bool(_git("status", "--porcelain", "--untracked-files=no")),
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "machine": f"{platform.system()} {platform.machine()}, {os.cpu_count()} CPUs",
+        "sizes": sizes,
+        "targets": {name: json.loads(run_child(__file__, child_args, env)) for name, env in targets.items()},
+        "skipped": skipped,
+    }
+
+    output = json.dumps(result, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
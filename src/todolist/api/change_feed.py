@@ -0,0 +1,106 @@
+"""
+Polling side of the task change feed: plain reads, long-polls and SSE streams.
+
+Every poll runs in its own short unit of work, so a client waiting for
+changes holds no connection between polls. Another worker's writes are seen
+on the next poll, CHANGE_FEED_POLL_INTERVAL_SECONDS later at most.
+"""
+import time
+from typing import AsyncIterator, Callable, List, Optional
+
+import anyio
+
+from todolist.api.dependencies import new_uow
+from todolist.api.serializers import task_change_event
+from todolist.core.constants import (
+    CHANGE_FEED_HEARTBEAT_SECONDS,
+    CHANGE_FEED_POLL_INTERVAL_SECONDS,
+    CHANGE_FEED_STREAM_MAX_SECONDS,
+)
+
+SSE_MEDIA_TYPE = "text/event-stream"
+
+
+def wants_event_stream(accept: Optional[str]) -> bool:
+    return bool(accept) and SSE_MEDIA_TYPE in accept.lower()
+
+
+class TaskChangeFeed:
+    """Change feed of one project; every read returns None once the project is gone."""
+
+    def __init__(
+        self,
+        project_id: str,
+        poll_interval: float = CHANGE_FEED_POLL_INTERVAL_SECONDS,
+        uow_factory: Callable = new_uow,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._project_id = project_id
+        self._poll_interval = poll_interval
+        self._uow_factory = uow_factory
+        self._clock = clock
+
+    async def head(self) -> Optional[int]:
+        """seq to follow the feed from when the client has none yet."""
+        async with self._uow_factory() as uow:
+            if await uow.projects.get_version(self._project_id) is None:
+                return None
+            return await uow.tasks.get_change_head(self._project_id)
+
+    async def fetch(self, since: int, limit: int) -> Optional[List[dict]]:
+        async with self._uow_factory() as uow:
+            changes = await uow.tasks.list_changes(self._project_id, since, limit)
+            # Deleting a project deletes its feed, so only an empty read can
+            # mean the project is gone
+            if not changes and await uow.projects.get_version(self._project_id) is None:
+                return None
+            return changes
+
+    async def wait(self, since: int, limit: int, timeout: float) -> Optional[List[dict]]:
+        """Long-poll: the first non-empty read within timeout seconds, else []."""
+        deadline = self._clock() + timeout
+        while True:
+            changes = await self.fetch(since, limit)
+            if changes or changes is None:
+                return changes
+            remaining = deadline - self._clock()
+            if remaining <= 0:
+                return changes
+            await anyio.sleep(min(self._poll_interval, remaining))
+
+    async def events(
+        self,
+        since: int,
+        limit: int,
+        heartbeat: float = CHANGE_FEED_HEARTBEAT_SECONDS,
+        max_duration: float = CHANGE_FEED_STREAM_MAX_SECONDS,
+    ) -> AsyncIterator[str]:
+        """
+        Server-Sent Events from seq > since, one event per change.
+
+        Idle streams get a comment line every heartbeat seconds so proxies keep
+        them open. The stream ends after max_duration (EventSource clients
+        reconnect with Last-Event-ID) or with a "gone" event when the project
+        is deleted.
+        """
+        retry_ms = int(self._poll_interval * 1000)
+        yield f"retry: {retry_ms}\n\n"
+
+        started = last_sent = self._clock()
+        while self._clock() - started < max_duration:
+            changes = await self.fetch(since, limit)
+            if changes is None:
+                yield "event: gone\ndata: {}\n\n"
+                return
+            for change in changes:
+                yield task_change_event(change)
+                since = change["seq"]
+            if changes:
+                last_sent = self._clock()
+                if len(changes) == limit:
+                    # More are waiting: catch up without sleeping
+                    continue
+            elif self._clock() - last_sent >= heartbeat:
+                yield ": keep-alive\n\n"
+                last_sent = self._clock()
+            await anyio.sleep(self._poll_interval)
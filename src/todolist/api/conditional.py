@@ -0,0 +1,93 @@
+"""
+Conditional GETs: weak ETags and Last-Modified from a row's updated_at.
+
+A project's updated_at is its version: it moves on every write to the project
+or to any of its tasks, so the task list of a project can be revalidated
+without reading a single task row. Tags are weak (W/"...") because the same
+version may be rendered as JSON or MessagePack, so the representation is
+folded into the tag and Vary: Accept is sent alongside.
+"""
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Annotated, Optional
+
+from fastapi import Header, Response, status
+
+IfNoneMatchHeader = Annotated[
+    Optional[str],
+    Header(description="ETag(s) of a cached copy; a match answers 304 Not Modified."),
+]
+IfModifiedSinceHeader = Annotated[
+    Optional[str],
+    Header(description="Last-Modified of a cached copy; ignored with If-None-Match."),
+]
+
+
+def weak_etag(*parts: object) -> str:
+    return 'W/"' + "-".join(str(part) for part in parts) + '"'
+
+
+def version_tag(version: datetime) -> str:
+    # Microseconds, not seconds: two writes in the same second must not share a tag
+    return version.strftime("%Y%m%d%H%M%S%f")
+
+
+def http_date(version: datetime) -> str:
+    """IMF-fixdate of a naive UTC timestamp (whole seconds only)."""
+    return format_datetime(
+        version.replace(microsecond=0, tzinfo=timezone.utc), usegmt=True
+    )
+
+
+def _opaque(tag: str) -> str:
+    tag = tag.strip()
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """Weak comparison of an If-None-Match list (or *) against etag."""
+    wanted = _opaque(etag)
+    return any(
+        candidate.strip() == "*" or _opaque(candidate) == wanted
+        for candidate in if_none_match.split(",")
+    )
+
+
+def not_modified(
+    etag: str,
+    version: datetime,
+    if_none_match: Optional[str],
+    if_modified_since: Optional[str],
+) -> bool:
+    """
+    Whether the client's copy is current (RFC 9110 section 13.2.2).
+
+    If-Modified-Since is only consulted without If-None-Match and compares at
+    second precision, so a write in the same second as the cached copy is not
+    seen through it; ETags do not have that blind spot.
+    """
+    if if_none_match is not None:
+        return etag_matches(if_none_match, etag)
+    if if_modified_since is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is not None:
+            since = since.replace(tzinfo=None) - since.utcoffset()
+        return version.replace(microsecond=0) <= since
+    return False
+
+
+def validator_headers(etag: str, version: datetime, vary: bool = False) -> dict:
+    headers = {"ETag": etag, "Last-Modified": http_date(version)}
+    if vary:
+        headers["Vary"] = "Accept"
+    return headers
+
+
+def not_modified_response(etag: str, version: datetime, vary: bool = False) -> Response:
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED,
+        headers=validator_headers(etag, version, vary),
+    )
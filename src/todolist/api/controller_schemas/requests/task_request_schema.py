@@ -1,8 +1,9 @@
-from typing import Optional
+from typing import List, Optional
 
 from pydantic import BaseModel, Field
 
 from todolist.core.constants import (
+    TASK_BATCH_MAX_SIZE,
     TASK_TITLE_MIN_LENGTH,
     TASK_TITLE_MAX_LENGTH,
     TASK_DESCRIPTION_MIN_LENGTH,
@@ -58,3 +59,12 @@ class TaskUpdateRequest(BaseModel):
         description="New status of the task (e.g. todo,doing,done).",
         examples=["doing"],
     )
+
+
+class TaskBatchCreateRequest(BaseModel):
+    items: List[TaskCreateRequest] = Field(
+        ...,
+        min_length=1,
+        max_length=TASK_BATCH_MAX_SIZE,
+        description=f"Tasks to create (at most {TASK_BATCH_MAX_SIZE}).",
+    )
@@ -3,3 +3,23 @@ from pydantic import BaseModel
 
 class HealthResponse(BaseModel):
     status: str
+
+
+class PoolHealthResponse(BaseModel):
+    status: str
+    size: int
+    checked_in: int
+    checked_out: int
+    overflow: int
+
+
+class CacheStatsResponse(BaseModel):
+    status: str
+    backend: str
+    hits: int
+    misses: int
+    evictions: int
+    expirations: int
+    size: int
+    max_size: int
+    hit_ratio: float
@@ -1,4 +1,5 @@
 from datetime import datetime
+from typing import List, Optional
 
 from pydantic import BaseModel
 
@@ -11,3 +12,8 @@ class ProjectResponse(BaseModel):
 
     class Config:
         orm_mode = True
+
+
+class ProjectPageResponse(BaseModel):
+    items: List[ProjectResponse]
+    next_cursor: Optional[str]
@@ -0,0 +1,19 @@
+from typing import Dict, List
+
+from pydantic import BaseModel
+
+
+class ProjectStatsResponse(BaseModel):
+    project_id: str
+    total: int
+    # One entry per VALID_STATUSES value, zeros included
+    by_status: Dict[str, int]
+    # Not done and past the deadline (what autoclose would close today)
+    overdue: int
+
+
+class StatsResponse(BaseModel):
+    total: int
+    by_status: Dict[str, int]
+    overdue: int
+    projects: List[ProjectStatsResponse]
@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Optional
+from typing import List, Literal, Optional
 
 from pydantic import BaseModel
 
@@ -15,3 +15,44 @@ class TaskResponse(BaseModel):
 
     class Config:
         orm_mode = True
+
+
+class TaskPageResponse(BaseModel):
+    items: List[TaskResponse]
+    next_cursor: Optional[str]
+
+
+class TaskSearchHitResponse(TaskResponse):
+    # Relevance within this search only: higher is better, not comparable across queries
+    rank: float
+
+
+class TaskSearchResponse(BaseModel):
+    items: List[TaskSearchHitResponse]
+    next_cursor: Optional[str]
+
+
+class TaskBatchItemResult(BaseModel):
+    index: int
+    task: Optional[TaskResponse] = None
+    error: Optional[str] = None
+
+
+class TaskBatchResponse(BaseModel):
+    created: int
+    failed: int
+    results: List[TaskBatchItemResult]
+
+
+class TaskChangeResponse(BaseModel):
+    seq: int
+    op: Literal["created", "updated", "deleted"]
+    task_id: str
+    changed_at: datetime
+    # The task as it is now; null for a deletion and once it has been deleted
+    task: Optional[TaskResponse]
+
+
+class TaskChangesResponse(BaseModel):
+    changes: List[TaskChangeResponse]
+    next_since: int
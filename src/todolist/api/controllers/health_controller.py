@@ -1,11 +1,17 @@
 from fastapi import APIRouter
 from todolist.api.controller_schemas.responses.health_response_schema import (
+    CacheStatsResponse,
     HealthResponse,
+    PoolHealthResponse,
 )
+from todolist.api.timing import TimedRoute
+from todolist.db.session import pool_status
+from todolist.repositories.cached_project import project_cache
 
 router = APIRouter(
     prefix="/api/health",
     tags=["health"],
+    route_class=TimedRoute,
 )
 
 
@@ -18,3 +24,31 @@ router = APIRouter(
 async def health_check() -> HealthResponse:
 
     return HealthResponse(status="ok")
+
+
+@router.get(
+    "/db",
+    response_model=PoolHealthResponse,
+    summary="Database pool health",
+    description=(
+        "Reports the connection pool counters of this worker: pool size, "
+        "idle (checked in), in use (checked out) and overflow connections."
+    ),
+)
+async def db_pool_health() -> PoolHealthResponse:
+
+    return PoolHealthResponse(status="ok", **pool_status())
+
+
+@router.get(
+    "/cache",
+    response_model=CacheStatsResponse,
+    summary="Project cache statistics",
+    description=(
+        "Reports the project lookup cache of this worker: hits, misses, "
+        "LRU evictions, TTL expirations and the current number of entries."
+    ),
+)
+async def project_cache_stats() -> CacheStatsResponse:
+
+    return CacheStatsResponse(status="ok", **project_cache.backend.stats().as_dict())
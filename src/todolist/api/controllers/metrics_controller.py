@@ -0,0 +1,24 @@
+from fastapi import APIRouter, Response
+
+from todolist.api.timing import TimedRoute
+from todolist.core.metrics import CONTENT_TYPE, registry
+
+router = APIRouter(
+    tags=["metrics"],
+    route_class=TimedRoute,
+)
+
+
+@router.get(
+    "/metrics",
+    response_class=Response,
+    summary="Metrics",
+    description=(
+        "Metrics of this worker process in the Prometheus text format: request "
+        "latency histograms per route, connection pool gauges and the "
+        "autoclose counters."
+    ),
+)
+async def metrics() -> Response:
+
+    return Response(content=registry.render(), media_type=CONTENT_TYPE)
@@ -1,24 +1,38 @@
-from typing import List
-
-from fastapi import APIRouter, Depends, HTTPException, status
-
+from operator import itemgetter
+
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+
+from todolist.api.conditional import (
+    IfModifiedSinceHeader,
+    IfNoneMatchHeader,
+    not_modified,
+    not_modified_response,
+    validator_headers,
+    version_tag,
+    weak_etag,
+)
 from todolist.api.controller_schemas.requests.project_request_schema import (
     ProjectCreateRequest,
     ProjectUpdateRequest,
 )
 from todolist.api.controller_schemas.responses.project_response_schema import (
+    ProjectPageResponse,
     ProjectResponse,
 )
-from todolist.api.dependencies import get_project_repo, get_task_repo
-from todolist.core.constants import ERR_DUPLICATE_PROJECT
-from todolist.exceptions import NotFoundError
+from todolist.api.dependencies import get_project_repo
+from todolist.api.pagination import PageAfter, PageLimit, split_page
+from todolist.api.responses import AcceptHeader, NEGOTIATED_PAGE_RESPONSES
+from todolist.api.serializers import project_page_response
+from todolist.api.timing import TimedRoute
+from todolist.core.constants import ERR_NOT_FOUND_PROJECT, PAGE_SIZE_DEFAULT
+from todolist.exceptions import DuplicateError, NotFoundError
 from todolist.models.project import Project
-from todolist.repositories.project_db import ProjectDBRepository
-from todolist.repositories.task_db import TaskDBRepository
+from todolist.repositories.base import AsyncProjectRepository
 
 router = APIRouter(
     prefix="/api/projects",
     tags=["projects"],
+    route_class=TimedRoute,
 )
 
 
@@ -33,34 +47,70 @@ def _project_to_response(project: Project) -> ProjectResponse:
 
 @router.get(
     "",
-    response_model=List[ProjectResponse],
+    response_model=ProjectPageResponse,
+    responses=NEGOTIATED_PAGE_RESPONSES,
     summary="List all projects",
-    description="Returns all projects ordered by ID.",
+    description=(
+        "Returns one page of projects ordered by ID. "
+        "Pass next_cursor as 'after' to fetch the following page. "
+        "Send 'Accept: application/msgpack' for a MessagePack body."
+    ),
 )
-def list_projects(
-    project_repo: ProjectDBRepository = Depends(get_project_repo),
-) -> List[ProjectResponse]:
-    projects = project_repo.list_all()
-    return [_project_to_response(p) for p in projects]
+async def list_projects(
+    limit: PageLimit = PAGE_SIZE_DEFAULT,
+    after: PageAfter = None,
+    accept: AcceptHeader = None,
+    project_repo: AsyncProjectRepository = Depends(get_project_repo),
+) -> Response:
+    rows = await project_repo.list_page_rows(limit + 1, after)
+    page, next_cursor = split_page(rows, limit, itemgetter("id"))
+    return project_page_response(page, next_cursor, accept)
 
 
 @router.get(
     "/{project_id}",
     response_model=ProjectResponse,
+    responses={
+        status.HTTP_304_NOT_MODIFIED: {"description": "The cached project is current."}
+    },
     summary="Get project by ID",
-    description="Returns a single project by its ID.",
+    description=(
+        "Returns a single project by its ID, with a weak ETag for "
+        "conditional requests."
+    ),
 )
-def get_project(
+async def get_project(
     project_id: str,
-    project_repo: ProjectDBRepository = Depends(get_project_repo),
-) -> ProjectResponse:
+    response: Response,
+    if_none_match: IfNoneMatchHeader = None,
+    if_modified_since: IfModifiedSinceHeader = None,
+    project_repo: AsyncProjectRepository = Depends(get_project_repo),
+) -> ProjectResponse | Response:
+    # The version is read uncached: task writes move it without touching the
+    # cache, on every backend, which can only cost a spurious 200
+    version = await project_repo.get_version(project_id)
+    if version is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=ERR_NOT_FOUND_PROJECT.format(project_id=project_id),
+        )
     try:
-        project = project_repo.get_by_id(project_id)
+        project = await project_repo.get_by_id(project_id)
     except NotFoundError as e:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=str(e),
         )
+
+    # The body may come from the cache: its own version is part of the tag,
+    # so a stale body gets a tag that stops matching once the entry is refreshed
+    etag = weak_etag(
+        "project", project.id, version_tag(version), version_tag(project.updated_at)
+    )
+    if not_modified(etag, version, if_none_match, if_modified_since):
+        return not_modified_response(etag, version)
+
+    response.headers.update(validator_headers(etag, version))
     return _project_to_response(project)
 
 
@@ -71,24 +121,22 @@ def get_project(
     summary="Create new project",
     description="Creates a new project with unique name.",
 )
-def create_project(
+async def create_project(
     payload: ProjectCreateRequest,
-    project_repo: ProjectDBRepository = Depends(get_project_repo),
+    project_repo: AsyncProjectRepository = Depends(get_project_repo),
 ) -> ProjectResponse:
-    existing_projects = project_repo.list_all()
-    normalized_new_name = payload.name.strip().lower()
-    if any(p.name.lower() == normalized_new_name for p in existing_projects):
-        raise HTTPException(
-            status_code=status.HTTP_409_CONFLICT,
-            detail=ERR_DUPLICATE_PROJECT.format(name=payload.name),
-        )
-
     project = Project(
         name=payload.name,
         description=payload.description,
     )
 
-    created_project = project_repo.create(project)
+    try:
+        created_project = await project_repo.create(project)
+    except DuplicateError as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e),
+        )
     return _project_to_response(created_project)
 
 
@@ -101,13 +149,13 @@ def create_project(
         "If a field is not provided, its previous value will be kept."
     ),
 )
-def update_project(
+async def update_project(
     project_id: str,
     payload: ProjectUpdateRequest,
-    project_repo: ProjectDBRepository = Depends(get_project_repo),
+    project_repo: AsyncProjectRepository = Depends(get_project_repo),
 ) -> ProjectResponse:
     try:
-        project = project_repo.get_by_id(project_id)
+        project = await project_repo.get_by_id(project_id)
     except NotFoundError as e:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -121,16 +169,6 @@ def update_project(
         else project.description
     )
 
-    all_projects = project_repo.list_all()
-    if any(
-        p.id != project.id and p.name.lower() == new_name.lower()
-        for p in all_projects
-    ):
-        raise HTTPException(
-            status_code=status.HTTP_409_CONFLICT,
-            detail=ERR_DUPLICATE_PROJECT.format(name=new_name),
-        )
-
     new_project = Project(
         name=new_name,
         description=new_description,
@@ -139,12 +177,17 @@ def update_project(
     )
 
     try:
-        updated = project_repo.update(project_id, new_project)
+        updated = await project_repo.update(project_id, new_project)
     except NotFoundError as e:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=str(e),
         )
+    except DuplicateError as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e),
+        )
 
     return _project_to_response(updated)
 
@@ -158,18 +201,15 @@ def update_project(
         "If project does not exist, returns 404."
     ),
 )
-def delete_project(
+async def delete_project(
     project_id: str,
-    project_repo: ProjectDBRepository = Depends(get_project_repo),
-    task_repo: TaskDBRepository = Depends(get_task_repo),
+    project_repo: AsyncProjectRepository = Depends(get_project_repo),
 ) -> None:
     try:
-        project_repo.delete(project_id)
+        await project_repo.delete(project_id)
     except NotFoundError as e:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=str(e),
         )
-
-    task_repo.delete_all_by_project(project_id)
     return
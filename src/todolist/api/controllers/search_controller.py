@@ -0,0 +1,57 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+
+from todolist.api.controller_schemas.responses.task_response_schema import (
+    TaskSearchResponse,
+)
+from todolist.api.dependencies import get_task_repo
+from todolist.api.pagination import PageCursor, PageLimit, split_page
+from todolist.api.responses import AcceptHeader, NEGOTIATED_PAGE_RESPONSES
+from todolist.api.serializers import task_search_response
+from todolist.api.timing import TimedRoute
+from todolist.core.constants import PAGE_SIZE_DEFAULT, SEARCH_QUERY_MAX_LENGTH
+from todolist.exceptions import ValidationError
+from todolist.models.task_search import TaskSearch
+from todolist.repositories.base import AsyncTaskRepository
+
+router = APIRouter(
+    prefix="/api/search",
+    tags=["search"],
+    route_class=TimedRoute,
+)
+
+
+@router.get(
+    "",
+    response_model=TaskSearchResponse,
+    responses=NEGOTIATED_PAGE_RESPONSES,
+    summary="Search tasks",
+    description=(
+        "Full-text search over the titles and descriptions of the tasks of "
+        "every project. Each word of q must match the start of a word of the "
+        "task; title matches rank higher. Results are ordered by rank (best "
+        "first); pass next_cursor as 'after' with the same q to fetch the "
+        "following page. Send 'Accept: application/msgpack' for a MessagePack body."
+    ),
+)
+async def search_tasks(
+    q: str = Query(
+        ...,
+        min_length=1,
+        max_length=SEARCH_QUERY_MAX_LENGTH,
+        description="Words to search for.",
+    ),
+    limit: PageLimit = PAGE_SIZE_DEFAULT,
+    after: PageCursor = None,
+    accept: AcceptHeader = None,
+    task_repo: AsyncTaskRepository = Depends(get_task_repo),
+) -> Response:
+    try:
+        search = TaskSearch(q)
+        if after is not None:
+            search.parse_cursor(after)
+    except ValidationError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    rows = await task_repo.search_page_rows(search, limit + 1, after)
+    page, next_cursor = split_page(rows, limit, search.cursor_of)
+    return task_search_response(page, next_cursor, accept)
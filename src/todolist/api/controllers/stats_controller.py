@@ -0,0 +1,89 @@
+from datetime import date
+
+from fastapi import APIRouter, Depends, HTTPException, Path, Response, status
+
+from todolist.api.conditional import IfNoneMatchHeader, etag_matches, version_tag, weak_etag
+from todolist.api.controller_schemas.responses.stats_response_schema import (
+    ProjectStatsResponse,
+    StatsResponse,
+)
+from todolist.api.dependencies import get_project_repo, get_task_repo
+from todolist.api.timing import TimedRoute
+from todolist.core.constants import ERR_NOT_FOUND_PROJECT
+from todolist.repositories.base import AsyncProjectRepository, AsyncTaskRepository
+
+router = APIRouter(
+    prefix="/api",
+    tags=["stats"],
+    route_class=TimedRoute,
+)
+
+
+@router.get(
+    "/stats",
+    response_model=StatsResponse,
+    summary="Task statistics of all projects",
+    description=(
+        "Counts the tasks of every project (total, per status and overdue) "
+        "with one grouped query, plus the totals over all projects."
+    ),
+)
+async def get_stats(
+    task_repo: AsyncTaskRepository = Depends(get_task_repo),
+) -> StatsResponse:
+    projects = await task_repo.count_stats(date.today())
+    by_status: dict[str, int] = {}
+    for project in projects:
+        for task_status, count in project["by_status"].items():
+            by_status[task_status] = by_status.get(task_status, 0) + count
+    return StatsResponse(
+        total=sum(project["total"] for project in projects),
+        by_status=by_status,
+        overdue=sum(project["overdue"] for project in projects),
+        projects=projects,
+    )
+
+
+@router.get(
+    "/projects/{project_id}/stats",
+    response_model=ProjectStatsResponse,
+    responses={
+        status.HTTP_304_NOT_MODIFIED: {"description": "The cached statistics are current."}
+    },
+    summary="Task statistics of a project",
+    description=(
+        "Counts the project's tasks: total, per status and overdue. "
+        "Carries a weak ETag from the project's version and today's date; "
+        "send it back in If-None-Match to get 304 Not Modified without counting."
+    ),
+)
+async def get_project_stats(
+    response: Response,
+    project_id: str = Path(..., description="ID of the project."),
+    if_none_match: IfNoneMatchHeader = None,
+    project_repo: AsyncProjectRepository = Depends(get_project_repo),
+    task_repo: AsyncTaskRepository = Depends(get_task_repo),
+) -> ProjectStatsResponse | Response:
+    version = await project_repo.get_version(project_id)
+    if version is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=ERR_NOT_FOUND_PROJECT.format(project_id=project_id),
+        )
+
+    # Overdue counts move at midnight without any write, so the date is part
+    # of the tag and no Last-Modified is sent
+    today = date.today()
+    etag = weak_etag("stats", project_id, version_tag(version), today.isoformat())
+    if if_none_match is not None and etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+    stats = await task_repo.count_stats(today, project_id)
+    if not stats:
+        # Deleted between the two reads
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=ERR_NOT_FOUND_PROJECT.format(project_id=project_id),
+        )
+    response.headers["ETag"] = etag
+    return ProjectStatsResponse(**stats[0])
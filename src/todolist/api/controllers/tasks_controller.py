@@ -1,24 +1,70 @@
-from typing import List
+from datetime import date
+from typing import Annotated, List, Literal, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Path, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Path, Query, Response, status
+from fastapi.responses import JSONResponse, StreamingResponse
 
+from todolist.api.change_feed import SSE_MEDIA_TYPE, TaskChangeFeed, wants_event_stream
+from todolist.api.conditional import (
+    IfModifiedSinceHeader,
+    IfNoneMatchHeader,
+    not_modified,
+    not_modified_response,
+    validator_headers,
+    version_tag,
+    weak_etag,
+)
 from todolist.api.controller_schemas.requests.task_request_schema import (
+    TaskBatchCreateRequest,
     TaskCreateRequest,
     TaskUpdateRequest,
 )
 from todolist.api.controller_schemas.responses.task_response_schema import (
+    TaskBatchItemResult,
+    TaskBatchResponse,
+    TaskChangesResponse,
+    TaskPageResponse,
     TaskResponse,
 )
-from todolist.api.dependencies import get_project_repo, get_task_repo
-from todolist.core.constants import ERR_NOT_FOUND_TASK
+from todolist.api.dependencies import (
+    AnyUnitOfWork,
+    get_project_repo,
+    get_streaming_task_repo,
+    get_task_repo,
+    get_uow,
+    new_uow,
+)
+from todolist.api.exporters import CHUNK_WRITERS, MEDIA_TYPES
+from todolist.api.pagination import PageCursor, PageLimit, split_page
+from todolist.api.responses import (
+    AcceptHeader,
+    MSGPACK_MEDIA_TYPE,
+    NEGOTIATED_PAGE_RESPONSES,
+    negotiate,
+)
+from todolist.api.serializers import task_changes_response, task_page_response
+from todolist.api.timing import TimedRoute
+from todolist.core.constants import (
+    CHANGE_FEED_WAIT_MAX_SECONDS,
+    ERR_NOT_FOUND_PROJECT,
+    ERR_NOT_FOUND_TASK,
+    EXPORT_BATCH_SIZE,
+    PAGE_SIZE_DEFAULT,
+    TASK_TITLE_MAX_LENGTH,
+)
 from todolist.exceptions import NotFoundError, ValidationError
 from todolist.models.task import Task
-from todolist.repositories.project_db import ProjectDBRepository
-from todolist.repositories.task_db import TaskDBRepository
+from todolist.models.task_filter import TASK_SORT_FIELDS, TaskFilter
+from todolist.repositories.base import (
+    AsyncProjectRepository,
+    AsyncTaskRepository,
+    TaskRepository,
+)
 
 router = APIRouter(
     prefix="/api/projects/{project_id}/tasks",
     tags=["tasks"],
+    route_class=TimedRoute,
 )
 
 
@@ -34,64 +80,291 @@ def _task_to_response(task: Task) -> TaskResponse:
     )
 
 
-def _ensure_project_exists(
+def _project_not_found(project_id: str) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND,
+        detail=ERR_NOT_FOUND_PROJECT.format(project_id=project_id),
+    )
+
+
+async def _ensure_project_exists(
+    project_id: str,
+    project_repo: AsyncProjectRepository,
+) -> None:
+    if not await project_repo.exists(project_id):
+        raise _project_not_found(project_id)
+
+
+async def _ensure_project_current(
     project_id: str,
-    project_repo: ProjectDBRepository,
+    project_repo: AsyncProjectRepository,
 ) -> None:
+    """Uncached check: also drops the cached project when another worker deleted it."""
+    if await project_repo.get_version(project_id) is None:
+        raise _project_not_found(project_id)
+
+
+async def _task_not_found(
+    project_id: str,
+    task_id: str,
+    project_repo: AsyncProjectRepository,
+) -> HTTPException:
+    """Only runs after a scoped lookup missed: tells a missing project from a missing task."""
+    await _ensure_project_current(project_id, project_repo)
+    return HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND,
+        detail=ERR_NOT_FOUND_TASK.format(task_id=task_id, project_id=project_id),
+    )
+
+
+async def _project_deleted(project_id: str, uow: AnyUnitOfWork) -> HTTPException:
+    """
+    The task insert hit the foreign key: the project passed the cached check
+    but was deleted since. Rolls back the failed insert, then reads the
+    project uncached so the stale entry is dropped for the next requests.
+    """
+    await uow.rollback()
+    await uow.projects.get_version(project_id)
+    return _project_not_found(project_id)
+
+
+def _bad_request(e: ValidationError) -> HTTPException:
+    return HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+def _task_filter(
+    task_status: Optional[List[str]] = Query(
+        None,
+        alias="status",
+        description="Only tasks with this status; repeat the parameter for several.",
+    ),
+    deadline_before: Optional[date] = Query(
+        None, description="Only tasks with a deadline before this date (exclusive)."
+    ),
+    deadline_after: Optional[date] = Query(
+        None, description="Only tasks with a deadline after this date (exclusive)."
+    ),
+    q: Optional[str] = Query(
+        None,
+        min_length=1,
+        max_length=TASK_TITLE_MAX_LENGTH,
+        description="Only tasks whose title contains this text (case-insensitive).",
+    ),
+    sort: str = Query(
+        "id",
+        description=(
+            f"Sort key, one of {', '.join(TASK_SORT_FIELDS)}; prefix with '-' "
+            "for descending. Tasks without a deadline sort last (first with -deadline)."
+        ),
+    ),
+) -> TaskFilter:
     try:
-        project_repo.get_by_id(project_id)
-    except NotFoundError as e:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=str(e),
+        return TaskFilter(
+            statuses=tuple(task_status or ()),
+            deadline_before=deadline_before,
+            deadline_after=deadline_after,
+            q=q,
+            sort=sort,
         )
+    except ValidationError as e:
+        raise _bad_request(e)
 
 
 @router.get(
     "",
-    response_model=List[TaskResponse],
+    response_model=TaskPageResponse,
+    responses={
+        **NEGOTIATED_PAGE_RESPONSES,
+        status.HTTP_304_NOT_MODIFIED: {"description": "The cached page is current."},
+    },
     summary="List tasks for a project",
-    description="Returns all tasks belonging to the given project.",
+    description=(
+        "Returns one page of the project's tasks matching the filters, ordered "
+        "by 'sort' (ID by default). Pass next_cursor as 'after' to fetch the "
+        "following page with the same filters and sort. "
+        "Send 'Accept: application/msgpack' for a MessagePack body. "
+        "Pages carry a weak ETag derived from the project's version: send it "
+        "back in If-None-Match to get 304 Not Modified while no task of the "
+        "project has changed."
+    ),
 )
-def list_tasks(
+async def list_tasks(
     project_id: str = Path(..., description="ID of the project to list tasks for."),
-    project_repo: ProjectDBRepository = Depends(get_project_repo),
-    task_repo: TaskDBRepository = Depends(get_task_repo),
-) -> List[TaskResponse]:
-    _ensure_project_exists(project_id, project_repo)
+    limit: PageLimit = PAGE_SIZE_DEFAULT,
+    after: PageCursor = None,
+    task_filter: TaskFilter = Depends(_task_filter),
+    accept: AcceptHeader = None,
+    if_none_match: IfNoneMatchHeader = None,
+    if_modified_since: IfModifiedSinceHeader = None,
+    project_repo: AsyncProjectRepository = Depends(get_project_repo),
+    task_repo: AsyncTaskRepository = Depends(get_task_repo),
+) -> Response:
+    # One primary-key lookup answers both "does the project exist" and
+    # "has anything changed"; task rows are only read when it has
+    if after is not None:
+        try:
+            task_filter.parse_cursor(after)
+        except ValidationError as e:
+            raise _bad_request(e)
+
+    version = await project_repo.get_version(project_id)
+    if version is None:
+        raise _project_not_found(project_id)
+
+    representation = "msgpack" if negotiate(accept) == MSGPACK_MEDIA_TYPE else "json"
+    etag = weak_etag(
+        "tasks",
+        project_id,
+        version_tag(version),
+        limit,
+        after or "",
+        "" if task_filter.is_default else task_filter.cache_key(),
+        representation,
+    )
+    if not_modified(etag, version, if_none_match, if_modified_since):
+        return not_modified_response(etag, version, vary=True)
+
+    rows = await task_repo.list_by_project_page_rows(
+        project_id, limit + 1, after, task_filter
+    )
+    page, next_cursor = split_page(rows, limit, task_filter.cursor_of)
+    response = task_page_response(page, next_cursor, accept)
+    response.headers.update(validator_headers(etag, version))
+    return response
+
+
+# Registered before "/{task_id}" so "export" is not taken for a task ID
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    summary="Export all tasks of a project",
+    description=(
+        "Streams every task of the project as NDJSON (default) or CSV. "
+        "Rows are read in batches from a server-side cursor, so memory use "
+        "does not depend on the project size."
+    ),
+)
+async def export_tasks(
+    project_id: str = Path(..., description="ID of the project to export."),
+    export_format: Literal["ndjson", "csv"] = Query(
+        "ndjson", alias="format", description="Output format: ndjson or csv."
+    ),
+    stream_repo: TaskRepository = Depends(get_streaming_task_repo),
+) -> StreamingResponse:
+    # No request-wide unit of work: the project check gets its own, closed
+    # before the download starts, and the stream reads on its own session
+    async with new_uow() as uow:
+        await _ensure_project_exists(project_id, uow.projects)
+
+    batches = stream_repo.stream_by_project(project_id, EXPORT_BATCH_SIZE)
+    return StreamingResponse(
+        CHUNK_WRITERS[export_format](batches),
+        media_type=MEDIA_TYPES[export_format],
+        headers={
+            "Content-Disposition": (
+                f'attachment; filename="project-{project_id}-tasks.{export_format}"'
+            )
+        },
+    )
+
+
+@router.get(
+    "/changes",
+    response_model=TaskChangesResponse,
+    responses={200: {"content": {SSE_MEDIA_TYPE: {}}}},
+    summary="Follow task changes of a project",
+    description=(
+        "Returns the task creations, updates and deletions with seq > since, "
+        "oldest first; pass next_since back as since to continue. Without "
+        "since, returns no changes and the current seq to start from. "
+        "With wait > 0 the request is held until a change arrives or wait "
+        "seconds pass (long-poll). Send 'Accept: text/event-stream' for a "
+        "Server-Sent Events stream, resumable with Last-Event-ID."
+    ),
+)
+async def list_task_changes(
+    project_id: str = Path(..., description="ID of the project to follow."),
+    since: Optional[int] = Query(
+        None, ge=0, description="seq of the last change the client has seen."
+    ),
+    limit: PageLimit = PAGE_SIZE_DEFAULT,
+    wait: float = Query(
+        0,
+        ge=0,
+        le=CHANGE_FEED_WAIT_MAX_SECONDS,
+        description="Seconds to wait for a change when there is none yet.",
+    ),
+    accept: Annotated[
+        Optional[str],
+        Header(description="application/json (default) or text/event-stream."),
+    ] = None,
+    last_event_id: Annotated[
+        Optional[int],
+        Header(ge=0, description="SSE reconnects: takes precedence over since."),
+    ] = None,
+) -> Response:
+    # No request-wide unit of work: each poll opens its own, so a waiting
+    # client does not hold a database connection
+    feed = TaskChangeFeed(project_id)
+    stream = wants_event_stream(accept)
+    if last_event_id is not None:
+        since = last_event_id
+
+    # A stream checks the project up front: once it starts the status is 200
+    if since is None or stream:
+        head = await feed.head()
+        if head is None:
+            raise _project_not_found(project_id)
+        if since is None:
+            if not stream:
+                return task_changes_response([], head)
+            since = head
 
-    tasks = task_repo.list_by_project(project_id)
-    return [_task_to_response(t) for t in tasks]
+    if stream:
+        return StreamingResponse(
+            feed.events(since, limit),
+            media_type=SSE_MEDIA_TYPE,
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+
+    changes = await feed.wait(since, limit, wait)
+    if changes is None:
+        raise _project_not_found(project_id)
+    next_since = changes[-1]["seq"] if changes else since
+    return task_changes_response(changes, next_since)
 
 
 @router.get(
     "/{task_id}",
     response_model=TaskResponse,
+    responses={
+        status.HTTP_304_NOT_MODIFIED: {"description": "The cached task is current."}
+    },
     summary="Get task details",
-    description="Returns a single task by its ID within the given project.",
+    description=(
+        "Returns a single task by its ID within the given project, "
+        "with a weak ETag for conditional requests."
+    ),
 )
-def get_task(
+async def get_task(
+    response: Response,
     project_id: str = Path(..., description="ID of the project."),
     task_id: str = Path(..., description="ID of the task."),
-    project_repo: ProjectDBRepository = Depends(get_project_repo),
-    task_repo: TaskDBRepository = Depends(get_task_repo),
-) -> TaskResponse:
-    _ensure_project_exists(project_id, project_repo)
-
+    if_none_match: IfNoneMatchHeader = None,
+    if_modified_since: IfModifiedSinceHeader = None,
+    project_repo: AsyncProjectRepository = Depends(get_project_repo),
+    task_repo: AsyncTaskRepository = Depends(get_task_repo),
+) -> TaskResponse | Response:
     try:
-        task = task_repo.get_by_id(task_id)
-    except NotFoundError as e:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=str(e),
-        )
+        task = await task_repo.get_in_project(project_id, task_id)
+    except NotFoundError:
+        raise await _task_not_found(project_id, task_id, project_repo)
 
-    if task.project_id != project_id:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=ERR_NOT_FOUND_TASK.format(task_id=task_id, project_id=project_id),
-        )
+    etag = weak_etag("task", task.id, version_tag(task.updated_at))
+    if not_modified(etag, task.updated_at, if_none_match, if_modified_since):
+        return not_modified_response(etag, task.updated_at)
 
+    response.headers.update(validator_headers(etag, task.updated_at))
     return _task_to_response(task)
 
 
@@ -102,13 +375,14 @@ def get_task(
     summary="Create new task for a project",
     description="Creates a new task under the given project.",
 )
-def create_task(
+async def create_task(
     payload: TaskCreateRequest,
     project_id: str = Path(..., description="ID of the project."),
-    project_repo: ProjectDBRepository = Depends(get_project_repo),
-    task_repo: TaskDBRepository = Depends(get_task_repo),
+    project_repo: AsyncProjectRepository = Depends(get_project_repo),
+    task_repo: AsyncTaskRepository = Depends(get_task_repo),
+    uow: AnyUnitOfWork = Depends(get_uow, scope="function"),
 ) -> TaskResponse:
-    _ensure_project_exists(project_id, project_repo)
+    await _ensure_project_exists(project_id, project_repo)
 
     try:
         task = Task(
@@ -123,10 +397,74 @@ def create_task(
             detail=str(e),
         )
 
-    created_task = task_repo.create(task)
+    try:
+        created_task = await task_repo.create(task)
+    except NotFoundError:
+        raise await _project_deleted(project_id, uow)
+    # Task writes row-lock their project (its version) until commit: commit
+    # before the response is built rather than after
+    await uow.commit()
     return _task_to_response(created_task)
 
 
+@router.post(
+    ":batch",
+    response_model=TaskBatchResponse,
+    status_code=status.HTTP_201_CREATED,
+    summary="Create many tasks for a project",
+    description=(
+        "Validates every item first and creates all of them with a single "
+        "INSERT, or none of them: if any item is invalid the response is 400 "
+        "with the error of each failing item and nothing is stored."
+    ),
+    responses={status.HTTP_400_BAD_REQUEST: {"model": TaskBatchResponse}},
+)
+async def create_tasks_batch(
+    payload: TaskBatchCreateRequest,
+    project_id: str = Path(..., description="ID of the project."),
+    project_repo: AsyncProjectRepository = Depends(get_project_repo),
+    task_repo: AsyncTaskRepository = Depends(get_task_repo),
+    uow: AnyUnitOfWork = Depends(get_uow, scope="function"),
+) -> TaskBatchResponse | JSONResponse:
+    await _ensure_project_exists(project_id, project_repo)
+
+    tasks: list[Task] = []
+    errors: list[TaskBatchItemResult] = []
+    for index, item in enumerate(payload.items):
+        try:
+            tasks.append(
+                Task(
+                    title=item.title,
+                    description=item.description or "",
+                    project_id=project_id,
+                    deadline=item.deadline,
+                )
+            )
+        except ValidationError as e:
+            errors.append(TaskBatchItemResult(index=index, error=str(e)))
+
+    if errors:
+        body = TaskBatchResponse(created=0, failed=len(errors), results=errors)
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content=body.model_dump(mode="json"),
+        )
+
+    try:
+        created_tasks = await task_repo.create_many(tasks)
+    except NotFoundError:
+        raise await _project_deleted(project_id, uow)
+    await uow.commit()
+    return TaskBatchResponse(
+        created=len(created_tasks),
+        failed=0,
+        results=[
+            TaskBatchItemResult(index=index, task=_task_to_response(task))
+            for index, task in enumerate(created_tasks)
+        ],
+    )
+
+
 @router.put(
     "/{task_id}",
     response_model=TaskResponse,
@@ -136,28 +474,18 @@ def create_task(
         "Only provided fields will be changed."
     ),
 )
-def update_task(
+async def update_task(
     payload: TaskUpdateRequest,
     project_id: str = Path(..., description="ID of the project."),
     task_id: str = Path(..., description="ID of the task."),
-    project_repo: ProjectDBRepository = Depends(get_project_repo),
-    task_repo: TaskDBRepository = Depends(get_task_repo),
+    project_repo: AsyncProjectRepository = Depends(get_project_repo),
+    task_repo: AsyncTaskRepository = Depends(get_task_repo),
+    uow: AnyUnitOfWork = Depends(get_uow, scope="function"),
 ) -> TaskResponse:
-    _ensure_project_exists(project_id, project_repo)
-
     try:
-        existing_task = task_repo.get_by_id(task_id)
-    except NotFoundError as e:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=str(e),
-        )
-
-    if existing_task.project_id != project_id:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=ERR_NOT_FOUND_TASK.format(task_id=task_id, project_id=project_id),
-        )
+        existing_task = await task_repo.get_in_project(project_id, task_id)
+    except NotFoundError:
+        raise await _task_not_found(project_id, task_id, project_repo)
 
     new_title = payload.title.strip() if payload.title is not None else existing_task.title
     new_description = (
@@ -186,7 +514,12 @@ def update_task(
             detail=str(e),
         )
 
-    saved_task = task_repo.update_task(updated_task)
+    try:
+        saved_task = await task_repo.update_task(updated_task)
+    except NotFoundError:
+        # Deleted by a concurrent request since it was read above
+        raise await _task_not_found(project_id, task_id, project_repo)
+    await uow.commit()
     return _task_to_response(saved_task)
 
 
@@ -196,27 +529,14 @@ def update_task(
     summary="Delete task",
     description="Deletes a single task from the project.",
 )
-def delete_task(
+async def delete_task(
     project_id: str = Path(..., description="ID of the project."),
     task_id: str = Path(..., description="ID of the task."),
-    project_repo: ProjectDBRepository = Depends(get_project_repo),
-    task_repo: TaskDBRepository = Depends(get_task_repo),
+    project_repo: AsyncProjectRepository = Depends(get_project_repo),
+    task_repo: AsyncTaskRepository = Depends(get_task_repo),
 ) -> None:
-    _ensure_project_exists(project_id, project_repo)
-
     try:
-        task = task_repo.get_by_id(task_id)
-    except NotFoundError as e:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=str(e),
-        )
-
-    if task.project_id != project_id:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=ERR_NOT_FOUND_TASK.format(task_id=task_id, project_id=project_id),
-        )
-
-    task_repo.delete(task_id)
+        await task_repo.delete_in_project(project_id, task_id)
+    except NotFoundError:
+        raise await _task_not_found(project_id, task_id, project_repo)
     return
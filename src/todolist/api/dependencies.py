@@ -1,10 +1,51 @@
-from todolist.repositories.project_db import ProjectDBRepository
-from todolist.repositories.task_db import TaskDBRepository
+from typing import AsyncIterator
 
+from fastapi import Depends
 
-def get_project_repo() -> ProjectDBRepository:
-    return ProjectDBRepository()
+from todolist.repositories.base import (
+    AsyncProjectRepository,
+    AsyncTaskRepository,
+    TaskRepository,
+)
+from todolist.repositories.registry import get_storage_backend
+from todolist.repositories.unit_of_work import (
+    AsyncUnitOfWork,
+    MemoryUnitOfWork,
+    ThreadedUnitOfWork,
+)
 
+AnyUnitOfWork = AsyncUnitOfWork | ThreadedUnitOfWork | MemoryUnitOfWork
 
-def get_task_repo() -> TaskDBRepository:
-    return TaskDBRepository()
+
+def new_uow() -> AnyUnitOfWork:
+    """A unit of work of the configured backend (STORAGE_BACKEND), not yet entered."""
+    return get_storage_backend().new_uow()
+
+
+async def get_uow() -> AsyncIterator[AnyUnitOfWork]:
+    """
+    One unit of work per request; FastAPI caches it across dependencies.
+
+    Declared with scope="function": it commits when the handler's response is
+    built, before it is sent, so a failed commit reaches the client as an
+    error and a read right after a 2xx sees the write.
+    """
+    async with new_uow() as uow:
+        yield uow
+
+
+async def get_project_repo(
+    uow: AnyUnitOfWork = Depends(get_uow, scope="function"),
+) -> AsyncProjectRepository:
+    return uow.projects
+
+
+async def get_task_repo(
+    uow: AnyUnitOfWork = Depends(get_uow, scope="function"),
+) -> AsyncTaskRepository:
+    return uow.tasks
+
+
+def get_streaming_task_repo() -> TaskRepository:
+    """Unbound repository for streamed responses, read while the response is sent."""
+    return get_storage_backend().task_repository()
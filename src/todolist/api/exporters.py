@@ -0,0 +1,64 @@
+import csv
+import io
+import json
+from datetime import date, datetime
+from typing import Iterable, Iterator, Sequence
+
+EXPORT_FIELDS = [
+    "id",
+    "project_id",
+    "title",
+    "description",
+    "status",
+    "deadline",
+    "created_at",
+    "closed_at",
+]
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+def _json_default(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+def _csv_row(row: dict) -> dict:
+    # Same ISO 8601 dates as the JSON formats instead of str(datetime)
+    return {
+        key: value.isoformat() if isinstance(value, (date, datetime)) else value
+        for key, value in row.items()
+    }
+
+
+def ndjson_chunks(batches: Iterable[Sequence[dict]]) -> Iterator[str]:
+    """One JSON object per line; one chunk per fetched batch."""
+    for rows in batches:
+        yield "".join(
+            json.dumps(row, default=_json_default, ensure_ascii=False) + "\n"
+            for row in rows
+        )
+
+
+def csv_chunks(batches: Iterable[Sequence[dict]]) -> Iterator[str]:
+    """Header first, then one CSV chunk per fetched batch."""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_FIELDS)
+    writer.writeheader()
+    yield buffer.getvalue()
+
+    for rows in batches:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(_csv_row(row) for row in rows)
+        yield buffer.getvalue()
+
+
+CHUNK_WRITERS = {
+    "ndjson": ndjson_chunks,
+    "csv": csv_chunks,
+}
@@ -0,0 +1,58 @@
+"""
+Request metrics of the API, exported at GET /metrics with the rest of the
+registry (core.metrics).
+
+Requests are labelled with their route template (/api/projects/{project_id}),
+not the raw path, so the number of series stays bounded; requests that match
+no route share route="unmatched".
+"""
+from time import perf_counter
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from todolist.core.metrics import registry
+
+REQUEST_DURATION = registry.histogram(
+    "todolist_http_request_duration_seconds",
+    "Time from the request reaching the app to the end of the response body.",
+    ("method", "route", "status"),
+)
+REQUESTS_IN_PROGRESS = registry.gauge(
+    "todolist_http_requests_in_progress",
+    "Requests being handled by this process.",
+)
+
+
+class MetricsMiddleware:
+    """Observes the duration of each HTTP request by method, route and status."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = perf_counter()
+        # Stays 500 when the app raises before it responds
+        status = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        REQUESTS_IN_PROGRESS.inc()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            REQUESTS_IN_PROGRESS.dec()
+            # The router stores the matched route in the (shared) scope
+            route = scope.get("route")
+            REQUEST_DURATION.labels(
+                scope["method"],
+                getattr(route, "path", "unmatched"),
+                str(status),
+            ).observe(perf_counter() - started)
@@ -0,0 +1,41 @@
+from operator import attrgetter
+from typing import Annotated, Callable, List, Optional, Tuple, TypeVar
+
+from fastapi import Query
+
+from todolist.core.constants import PAGE_SIZE_MAX
+
+T = TypeVar("T")
+
+PageLimit = Annotated[
+    int,
+    Query(ge=1, le=PAGE_SIZE_MAX, description="Maximum number of items to return."),
+]
+PageAfter = Annotated[
+    Optional[str],
+    Query(
+        pattern=r"^\d+$",
+        description="Cursor returned as next_cursor by the previous page.",
+    ),
+]
+
+PageCursor = Annotated[
+    Optional[str],
+    Query(
+        pattern=r"^[A-Za-z0-9_-]+$",
+        max_length=512,
+        description="Cursor returned as next_cursor by the previous page (same sort).",
+    ),
+]
+
+
+def split_page(
+    items: List[T],
+    limit: int,
+    cursor_of: Callable[[T], str] = attrgetter("id"),
+) -> Tuple[List[T], Optional[str]]:
+    """Split a fetch of limit + 1 rows into the page and the next page's cursor."""
+    if len(items) <= limit:
+        return items, None
+    page = items[:limit]
+    return page, cursor_of(page[-1])
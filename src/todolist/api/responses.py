@@ -0,0 +1,93 @@
+"""
+Response classes of the Web API and Accept-header negotiation.
+
+orjson and msgpack are optional (the "fast" extra): without them the app
+falls back to the stdlib JSON encoder and list endpoints only serve JSON.
+"""
+from typing import Annotated, Optional
+
+from fastapi import Header
+from fastapi.responses import JSONResponse, ORJSONResponse, Response
+
+from todolist.core.settings import api_settings
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the installed extras
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - depends on the installed extras
+    msgpack = None
+
+JSON_MEDIA_TYPE = "application/json"
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+
+_MSGPACK_ALIASES = (MSGPACK_MEDIA_TYPE, "application/x-msgpack")
+
+AcceptHeader = Annotated[
+    Optional[str],
+    Header(description="application/json (default) or application/msgpack."),
+]
+
+# OpenAPI: list endpoints can also answer in MessagePack
+NEGOTIATED_PAGE_RESPONSES = {200: {"content": {MSGPACK_MEDIA_TYPE: {}}}}
+
+
+class MsgPackResponse(Response):
+    media_type = MSGPACK_MEDIA_TYPE
+
+    def render(self, content) -> bytes:
+        return msgpack.packb(content)
+
+
+def default_response_class() -> type[JSONResponse]:
+    """Response class for FastAPI(default_response_class=...) from API_JSON_ENCODER."""
+    encoder = api_settings.json_encoder.strip().lower()
+    if encoder == "json":
+        return JSONResponse
+    if encoder == "orjson" and orjson is None:
+        raise RuntimeError(
+            "API_JSON_ENCODER=orjson needs the orjson package (poetry install -E fast)."
+        )
+    if encoder in ("orjson", "auto"):
+        return ORJSONResponse if orjson is not None else JSONResponse
+    raise ValueError(
+        f"Invalid API_JSON_ENCODER '{api_settings.json_encoder}'. "
+        "Must be one of auto, orjson, json."
+    )
+
+
+def _quality(params: list[str]) -> float:
+    for param in params:
+        name, _, value = param.partition("=")
+        if name.strip().lower() == "q":
+            try:
+                return float(value)
+            except ValueError:
+                return 0.0
+    return 1.0
+
+
+def negotiate(accept: Optional[str]) -> str:
+    """
+    JSON or MessagePack for a list endpoint, from the Accept header.
+
+    MessagePack is only chosen when it is listed explicitly and ranked above
+    JSON; wildcards, ties and a missing msgpack package all mean JSON.
+    """
+    if not accept or msgpack is None:
+        return JSON_MEDIA_TYPE
+
+    json_q = msgpack_q = 0.0
+    for entry in accept.split(","):
+        media_type, *params = entry.split(";")
+        media_type = media_type.strip().lower()
+        q = _quality(params)
+        if media_type in _MSGPACK_ALIASES:
+            msgpack_q = max(msgpack_q, q)
+        elif media_type in (JSON_MEDIA_TYPE, "application/*", "*/*"):
+            json_q = max(json_q, q)
+
+    return MSGPACK_MEDIA_TYPE if msgpack_q > json_q else JSON_MEDIA_TYPE
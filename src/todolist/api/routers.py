@@ -1,11 +1,19 @@
 from fastapi import FastAPI
 
 from todolist.api.controllers.health_controller import router as health_router
+from todolist.api.controllers.metrics_controller import router as metrics_router
 from todolist.api.controllers.projects_controller import router as projects_router
+from todolist.api.controllers.search_controller import router as search_router
+from todolist.api.controllers.stats_controller import router as stats_router
 from todolist.api.controllers.tasks_controller import router as tasks_router
+from todolist.core.settings import api_settings
 
 
 def init_routers(app: FastAPI) -> None:
     app.include_router(health_router)
     app.include_router(projects_router)
     app.include_router(tasks_router)
+    app.include_router(search_router)
+    app.include_router(stats_router)
+    if api_settings.metrics:
+        app.include_router(metrics_router)
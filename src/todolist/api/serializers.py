@@ -0,0 +1,147 @@
+"""
+Pre-built serializers for the list and search endpoints and the task change feed.
+
+The repositories' *_page_rows methods return plain dicts already shaped like
+the response items, so a page is dumped straight to JSON bytes by
+pydantic-core. No ORM objects, domain objects or response models are built
+and nothing is validated again on the way out. The TypedDicts mirror
+ProjectPageResponse, TaskPageResponse, TaskSearchResponse and
+TaskChangesResponse, which still
+document the endpoints.
+
+MessagePack bodies carry the same values as the JSON ones (dates as ISO
+strings), packed from pydantic-core's JSON-mode Python output.
+"""
+from datetime import date, datetime
+from typing import Annotated, List, Optional
+
+from fastapi import Response
+from pydantic import PlainSerializer, TypeAdapter
+# pydantic needs typing_extensions.TypedDict before Python 3.12
+from typing_extensions import TypedDict
+
+from todolist.api.responses import MSGPACK_MEDIA_TYPE, MsgPackResponse, negotiate
+from todolist.core.timing import serializing
+
+
+def _date_as_midnight(value: date) -> str:
+    # TaskResponse.deadline is a datetime, so dates have always been rendered
+    # as midnight timestamps
+    return f"{value.isoformat()}T00:00:00"
+
+
+Deadline = Annotated[
+    Optional[date],
+    PlainSerializer(_date_as_midnight, return_type=str, when_used="unless-none"),
+]
+
+
+class ProjectItem(TypedDict):
+    id: str
+    name: str
+    description: str
+    created_at: datetime
+
+
+class ProjectPage(TypedDict):
+    items: List[ProjectItem]
+    next_cursor: Optional[str]
+
+
+class TaskItem(TypedDict):
+    id: str
+    project_id: str
+    title: str
+    description: Optional[str]
+    status: str
+    deadline: Deadline
+    created_at: datetime
+
+
+class TaskPage(TypedDict):
+    items: List[TaskItem]
+    next_cursor: Optional[str]
+
+
+class TaskSearchItem(TaskItem):
+    rank: float
+
+
+class TaskSearchPage(TypedDict):
+    items: List[TaskSearchItem]
+    next_cursor: Optional[str]
+
+
+class TaskChangeItem(TypedDict):
+    seq: int
+    op: str
+    task_id: str
+    changed_at: datetime
+    task: Optional[TaskItem]
+
+
+class TaskChangePage(TypedDict):
+    changes: List[TaskChangeItem]
+    next_since: int
+
+
+_project_page = TypeAdapter(ProjectPage)
+_task_page = TypeAdapter(TaskPage)
+_task_search_page = TypeAdapter(TaskSearchPage)
+_task_change = TypeAdapter(TaskChangeItem)
+_task_change_page = TypeAdapter(TaskChangePage)
+
+
+# List responses vary with the Accept header, so caches must key on it
+_VARY = {"Vary": "Accept"}
+
+
+def _page_response(
+    adapter: TypeAdapter,
+    items: List[dict],
+    next_cursor: Optional[str],
+    accept: Optional[str],
+) -> Response:
+    body = {"items": items, "next_cursor": next_cursor}
+    with serializing():
+        if negotiate(accept) == MSGPACK_MEDIA_TYPE:
+            return MsgPackResponse(adapter.dump_python(body, mode="json"), headers=_VARY)
+        return Response(
+            content=adapter.dump_json(body),
+            media_type="application/json",
+            headers=_VARY,
+        )
+
+
+def project_page_response(
+    items: List[dict], next_cursor: Optional[str], accept: Optional[str] = None
+) -> Response:
+    return _page_response(_project_page, items, next_cursor, accept)
+
+
+def task_page_response(
+    items: List[dict], next_cursor: Optional[str], accept: Optional[str] = None
+) -> Response:
+    return _page_response(_task_page, items, next_cursor, accept)
+
+
+def task_search_response(
+    items: List[dict], next_cursor: Optional[str], accept: Optional[str] = None
+) -> Response:
+    return _page_response(_task_search_page, items, next_cursor, accept)
+
+
+def task_changes_response(changes: List[dict], next_since: int) -> Response:
+    with serializing():
+        return Response(
+            content=_task_change_page.dump_json(
+                {"changes": changes, "next_since": next_since}
+            ),
+            media_type="application/json",
+        )
+
+
+def task_change_event(change: dict) -> str:
+    """One Server-Sent Event: the seq as its id (resumed via Last-Event-ID), the op as its type."""
+    data = _task_change.dump_json(change).decode()
+    return f"id: {change['seq']}\nevent: {change['op']}\ndata: {data}\n\n"
@@ -0,0 +1,100 @@
+"""
+Server-Timing header: how many SQL statements a request ran and where its
+time went.
+
+    Server-Timing: db;dur=3.412;desc="queries: 4", commit;dur=0.950, serialize;dur=0.208, total;dur=6.070
+
+- db: time spent in cursor.execute (see db.session.instrument_engine); the
+  COMMIT is not a statement and is not part of it
+- commit: the unit of work's commits (a fsync wait with STORAGE_BACKEND=wal),
+  all of them before the response headers are sent
+- serialize: response model validation and encoding after the endpoint
+  returned, plus pre-serialized page bodies (api.serializers)
+- total: from the request reaching the app to the response headers, so for
+  streamed responses the time to the first byte
+"""
+import functools
+import inspect
+from time import perf_counter
+from typing import Any, Callable
+
+from fastapi.routing import APIRoute
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from todolist.core.timing import RequestTimings, current_timings, end_request, start_request
+
+
+def _mark_returned() -> None:
+    timings = current_timings()
+    if timings is not None:
+        timings.endpoint_returned = perf_counter()
+
+
+def _timed_endpoint(endpoint: Callable[..., Any]) -> Callable[..., Any]:
+    # include_router re-creates each route from route.endpoint, already wrapped
+    if getattr(endpoint, "_marks_return", False):
+        return endpoint
+
+    # functools.wraps keeps the signature FastAPI reads the parameters from
+    if inspect.iscoroutinefunction(endpoint):
+
+        @functools.wraps(endpoint)
+        async def timed(*args, **kwargs):
+            result = await endpoint(*args, **kwargs)
+            _mark_returned()
+            return result
+
+    else:
+
+        @functools.wraps(endpoint)
+        def timed(*args, **kwargs):
+            result = endpoint(*args, **kwargs)
+            _mark_returned()
+            return result
+
+    timed._marks_return = True
+    return timed
+
+
+class TimedRoute(APIRoute):
+    """APIRoute that notes when its endpoint returns: what follows until the response is serialization."""
+
+    def __init__(self, path: str, endpoint: Callable[..., Any], **kwargs: Any) -> None:
+        super().__init__(path, _timed_endpoint(endpoint), **kwargs)
+
+
+def server_timing_header(timings: RequestTimings, now: float) -> str:
+    return (
+        f'db;dur={timings.db_seconds * 1000:.3f};desc="queries: {timings.query_count}", '
+        f"commit;dur={timings.commit_seconds * 1000:.3f}, "
+        f"serialize;dur={timings.serialization_seconds * 1000:.3f}, "
+        f"total;dur={(now - timings.started) * 1000:.3f}"
+    )
+
+
+class ServerTimingMiddleware:
+    """Collects the timings of each HTTP request and adds them to its response headers."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timings, token = start_request()
+
+        async def send_with_timing(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                now = perf_counter()
+                if timings.endpoint_returned is not None:
+                    timings.serialization_seconds += now - timings.endpoint_returned
+                MutableHeaders(scope=message).append("Server-Timing", server_timing_header(timings, now))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            end_request(token)
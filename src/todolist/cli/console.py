@@ -1,11 +1,12 @@
 from todolist.services import ProjectService, TaskService
-from todolist.repositories.project_db import ProjectDBRepository
-from todolist.repositories.task_db import TaskDBRepository
+from todolist.repositories.registry import get_storage_backend
 
 
 def run_console() -> None:
-    project_repo = ProjectDBRepository()
-    task_repo = TaskDBRepository()
+    backend = get_storage_backend()
+    backend.init()
+    project_repo = backend.project_repository()
+    task_repo = backend.task_repository()
 
     project_service = ProjectService(project_repo)
     task_service = TaskService(task_repo, project_service)
@@ -51,7 +52,7 @@ def run_console() -> None:
         elif choice == "4":
             pid = input("Enter project ID to delete: ")
             try:
-                project_service.delete_project(pid, task_service)
+                project_service.delete_project(pid)
             except Exception as e:
                 print(f"Error: {e}")
 
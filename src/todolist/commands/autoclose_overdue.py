@@ -1,5 +1,27 @@
+import time
 from datetime import date, datetime
-from todolist.repositories.task_db import TaskDBRepository
+
+from todolist.core.metrics import registry
+from todolist.repositories.registry import get_storage_backend
+
+TASKS_CLOSED = registry.counter(
+    "todolist_autoclose_tasks_closed_total",
+    "Overdue tasks closed by autoclose runs.",
+)
+RUNS = registry.counter(
+    "todolist_autoclose_runs_total",
+    "Autoclose runs by result (success, failure).",
+    ("result",),
+)
+RUN_DURATION = registry.histogram(
+    "todolist_autoclose_run_duration_seconds",
+    "Duration of autoclose runs.",
+    buckets=(0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 300.0, 900.0, 3600.0),
+)
+LAST_SUCCESS = registry.gauge(
+    "todolist_autoclose_last_success_timestamp_seconds",
+    "Unix time the last successful autoclose run finished (0: none yet).",
+)
 
 
 def run() -> None:
@@ -8,27 +30,28 @@ def run() -> None:
 
     Overdue = deadline < today AND status != "done"
     """
-    repo = TaskDBRepository()
-    today = date.today()
-
-    overdue_tasks = repo.list_overdue_open_tasks(today)
-
-    if not overdue_tasks:
+    started = time.perf_counter()
+    try:
+        backend = get_storage_backend()
+        backend.init()
+        repo = backend.task_repository()
+        today = date.today()
+
+        closed_count = repo.close_overdue(today, datetime.now())
+    except Exception:
+        RUNS.labels("failure").inc()
+        raise
+    finally:
+        RUN_DURATION.observe(time.perf_counter() - started)
+
+    RUNS.labels("success").inc()
+    TASKS_CLOSED.inc(closed_count)
+    LAST_SUCCESS.set(time.time())
+
+    if not closed_count:
         print(f"[INFO] No overdue tasks found for {today}.")
         return
 
-    print(f"[INFO] Found {len(overdue_tasks)} overdue tasks. Closing them...")
-
-    closed_count = 0
-    now = datetime.now()
-
-    for task in overdue_tasks:
-        task.status = "done"
-        task.closed_at = now
-
-        repo.update_task(task)
-        closed_count += 1
-
     print(
         f"[INFO] Auto-closed {closed_count} tasks with deadline before {today} "
         f"and status != 'done'."
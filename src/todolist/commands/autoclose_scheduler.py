@@ -3,14 +3,20 @@ import time
 import schedule
 
 from todolist.commands.autoclose_overdue import run as run_autoclose_overdue
+from todolist.core.constants import AUTOCLOSE_METRICS_PORT
+from todolist.core.metrics import serve_metrics
 
 
 def run() -> None:
     """
     Run a simple scheduler that calls the auto-close command every day.
 
-    By default: every day at 01:00 local time.
+    By default: every day at 01:00 local time. With AUTOCLOSE_METRICS_PORT
+    set, the run counters are served at GET /metrics on that port.
     """
+    if AUTOCLOSE_METRICS_PORT:
+        serve_metrics(AUTOCLOSE_METRICS_PORT)
+        print(f"[INFO] Metrics served on port {AUTOCLOSE_METRICS_PORT} at /metrics.")
 
     schedule.every().day.at("01:00").do(run_autoclose_overdue)
 
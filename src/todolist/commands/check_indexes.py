@@ -0,0 +1,81 @@
+from datetime import date
+
+from sqlalchemy import Select
+
+from todolist.db.session import engine
+from todolist.models.task_filter import TaskFilter
+from todolist.models.task_search import TaskSearch
+from todolist.repositories.task_db import TaskDBRepository
+
+
+def _explain(stmt: Select) -> str:
+    compiled = stmt.compile(
+        dialect=engine.dialect,
+        compile_kwargs={"literal_binds": True},
+    )
+
+    with engine.connect() as conn:
+        if engine.dialect.name == "sqlite":
+            rows = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}").all()
+            return "\n".join(str(row[-1]) for row in rows)
+
+        # Small tables are cheaper to scan; make the planner show whether the
+        # index is usable at all instead of whether it is worth it right now.
+        conn.exec_driver_sql("SET LOCAL enable_seqscan = off")
+        rows = conn.exec_driver_sql(f"EXPLAIN {compiled}").all()
+        conn.rollback()
+        return "\n".join(row[0] for row in rows)
+
+
+def run() -> None:
+    """
+    Check that the hot task queries are served by their indexes.
+
+    Runs EXPLAIN on the statements used by TaskDBRepository and exits with
+    a non-zero status when an expected index does not show up in the plan.
+    """
+    checks = [
+        (
+            "list_by_project",
+            TaskDBRepository.list_by_project_stmt(1),
+            "ix_tasks_project_id_id",
+        ),
+        (
+            "list_by_project?status=todo",
+            TaskDBRepository.list_by_project_stmt(1, TaskFilter(statuses=("todo",))),
+            "ix_tasks_project_id_status_id",
+        ),
+        (
+            "list_by_project?sort=deadline",
+            TaskDBRepository.list_by_project_stmt(1, TaskFilter(sort="deadline")),
+            "ix_tasks_project_id_deadline_id",
+        ),
+        (
+            "list_by_project?sort=-title",
+            TaskDBRepository.list_by_project_stmt(1, TaskFilter(sort="-title")),
+            "ix_tasks_project_id_title_id",
+        ),
+        (
+            "search?q=report",
+            TaskDBRepository.search_stmt(engine.dialect.name, TaskSearch("report"), 50),
+            # On SQLite the plan names the FTS5 table instead of an index
+            "ix_tasks_search_vector" if engine.dialect.name == "postgresql" else "tasks_fts",
+        ),
+        (
+            "list_overdue_open_tasks",
+            TaskDBRepository.overdue_open_stmt(date.today()),
+            "ix_tasks_open_deadline",
+        ),
+    ]
+
+    failed = False
+    for name, stmt, index_name in checks:
+        plan = _explain(stmt)
+        if index_name in plan:
+            print(f"[OK] {name} uses {index_name}.")
+        else:
+            failed = True
+            print(f"[FAIL] {name} does not use {index_name}. Plan:\n{plan}")
+
+    if failed:
+        raise SystemExit(1)
@@ -0,0 +1,360 @@
+import asyncio
+import time
+from datetime import date, datetime, timedelta
+from typing import Callable, List, Tuple
+
+from todolist.core.settings import storage_settings
+from todolist.exceptions import DuplicateError, NotFoundError
+from todolist.models.project import Project
+from todolist.models.task import Task
+from todolist.models.task_filter import TaskFilter
+from todolist.models.task_search import TaskSearch
+from todolist.repositories.registry import StorageBackend, get_storage_backend
+
+MISSING_ID = "999999999"
+PAGE_ROW_KEYS = {"id", "project_id", "title", "description", "status", "deadline", "created_at"}
+EXPORT_ROW_KEYS = {"id", "project_id", "title", "description", "status", "deadline", "created_at", "closed_at"}
+
+# (title, description, status, deadline in days from today)
+TASKS = [
+    ("Write report", "Quarterly report for the board", "todo", -3),
+    ("Review budget", "Budget review with the finance team", "doing", 5),
+    ("Plan offsite", "Offsite agenda and a report template", "todo", None),
+    ("Ship release", "Release notes and the final report", "done", -1),
+    ("Archive files", "Old files go to the archive", "doing", -10),
+]
+# Expected orders, as indexes into TASKS
+SORTS = {
+    "id": [0, 1, 2, 3, 4],
+    "-id": [4, 3, 2, 1, 0],
+    "deadline": [4, 0, 3, 1, 2],
+    "-deadline": [2, 1, 3, 0, 4],
+    "title": [4, 2, 1, 3, 0],
+    "-title": [0, 3, 1, 2, 4],
+}
+
+
+def _raises(error: type, fn: Callable, *args) -> None:
+    try:
+        fn(*args)
+    except error:
+        return
+    raise AssertionError(f"expected {error.__name__}")
+
+
+def _expect(actual, expected) -> None:
+    if actual != expected:
+        raise AssertionError(f"got {actual!r}, expected {expected!r}")
+
+
+class _Scenario:
+    """One pass over every repository method; each step depends on the previous ones."""
+
+    def __init__(self, backend: StorageBackend):
+        self.projects = backend.project_repository()
+        self.tasks = backend.task_repository()
+        self.backend = backend
+        self.today = date.today()
+        self.project_ids: List[str] = []
+        self.task_ids: List[str] = []
+
+    def _new_project(self, name: str) -> str:
+        project = self.projects.create(Project(name, "Project of storage:conformance"))
+        self.project_ids.append(project.id)
+        return project.id
+
+    def _tasks_in_order(self, positions: List[int]) -> List[str]:
+        return [self.task_ids[i] for i in positions]
+
+    def steps(self) -> List[Tuple[str, Callable[[], None]]]:
+        return [
+            ("projects: create, get, list, count", self.project_crud),
+            ("projects: case-insensitive unique names", self.project_names),
+            ("projects: missing ids", self.project_missing),
+            ("tasks: create and create_many", self.task_create),
+            ("tasks: get_by_id and get_in_project", self.task_get),
+            ("tasks: filters", self.task_filters),
+            ("tasks: sorts and keyset pages", self.task_sorts),
+            ("tasks: search", self.task_search),
+            ("tasks: stream_by_project", self.task_stream),
+            ("tasks: count_stats", self.task_stats),
+            ("tasks: change feed and project version", self.task_changes),
+            ("tasks: overdue and close_overdue", self.task_overdue),
+            ("tasks: deletes", self.task_deletes),
+            ("projects: update", self.project_update),
+            ("unit of work: async repositories", self.unit_of_work),
+            ("projects: delete", self.project_delete),
+        ]
+
+    def project_crud(self) -> None:
+        first = self._new_project("Conformance Alpha")
+        second = self._new_project("Conformance Beta")
+        _expect(int(first) < int(second), True)
+        _expect(self.projects.get_by_id(first).name, "Conformance Alpha")
+        _expect(self.projects.exists(first), True)
+        _expect(self.projects.count(), 2)
+        _expect([p.id for p in self.projects.list_all()], [first, second])
+        _expect([row["id"] for row in self.projects.list_page_rows(1)], [first])
+        _expect([row["id"] for row in self.projects.list_page_rows(5, after=first)], [second])
+        rows = self.projects.list_page_rows(5)
+        _expect([row["id"] for row in rows], [first, second])
+        _expect(set(rows[0]), {"id", "name", "description", "created_at"})
+        _expect(self.projects.get_version(first) is not None, True)
+
+    def project_names(self) -> None:
+        first = self.project_ids[0]
+        _raises(DuplicateError, self.projects.create, Project("conformance ALPHA", "Same name, other case"))
+        _expect(self.projects.exists_by_normalized_name(" CONFORMANCE alpha "), True)
+        _expect(self.projects.exists_by_normalized_name("Conformance Alpha", exclude_id=first), False)
+        _expect(self.projects.count(), 2)
+
+    def project_missing(self) -> None:
+        _raises(NotFoundError, self.projects.get_by_id, MISSING_ID)
+        _raises(NotFoundError, self.projects.delete, MISSING_ID)
+        _expect(self.projects.exists(MISSING_ID), False)
+        _expect(self.projects.get_version(MISSING_ID), None)
+
+    def task_create(self) -> None:
+        project_id = self.project_ids[0]
+        tasks = [
+            Task(
+                title,
+                description,
+                status,
+                None if days is None else self.today + timedelta(days=days),
+                project_id=project_id,
+            )
+            for title, description, status, days in TASKS
+        ]
+        first = self.tasks.create(tasks[0])
+        rest = self.tasks.create_many(tasks[1:])
+        self.task_ids = [first.id, *(task.id for task in rest)]
+        _expect(sorted(self.task_ids, key=int), self.task_ids)
+        for task in [first, *rest]:
+            _expect((task.created_at is not None, task.project_id), (True, project_id))
+        _expect(self.tasks.create_many([]), [])
+
+        other = self.tasks.create(
+            Task("Other project task", "Belongs to the second project", project_id=self.project_ids[1])
+        )
+        self.other_task_id = other.id
+
+    def task_get(self) -> None:
+        first_project, second_project = self.project_ids
+        task = self.tasks.get_by_id(self.task_ids[0])
+        _expect((task.title, task.status, task.project_id), ("Write report", "todo", first_project))
+        _expect(task.deadline, self.today - timedelta(days=3))
+        _expect(self.tasks.get_in_project(first_project, self.task_ids[0]).id, self.task_ids[0])
+        _raises(NotFoundError, self.tasks.get_in_project, second_project, self.task_ids[0])
+        _raises(NotFoundError, self.tasks.get_by_id, MISSING_ID)
+
+    def task_filters(self) -> None:
+        project_id = self.project_ids[0]
+        cases = [
+            (TaskFilter(), [0, 1, 2, 3, 4]),
+            (TaskFilter(statuses=("todo",)), [0, 2]),
+            (TaskFilter(statuses=("todo", "done")), [0, 2, 3]),
+            (TaskFilter(deadline_before=self.today), [0, 3, 4]),
+            (TaskFilter(deadline_after=self.today), [1]),
+            (TaskFilter(q="RE"), [0, 1, 3]),
+            (TaskFilter(statuses=("doing",), deadline_before=self.today), [4]),
+        ]
+        for task_filter, positions in cases:
+            tasks = self.tasks.list_by_project(project_id, task_filter)
+            _expect([task.id for task in tasks], self._tasks_in_order(positions))
+
+    def task_sorts(self) -> None:
+        project_id = self.project_ids[0]
+        for sort, positions in SORTS.items():
+            task_filter = TaskFilter(sort=sort)
+            expected = self._tasks_in_order(positions)
+            _expect([t.id for t in self.tasks.list_by_project(project_id, task_filter)], expected)
+
+            # Two at a time through the cursors clients get
+            paged, after = [], None
+            while True:
+                rows = self.tasks.list_by_project_page_rows(project_id, 2, after, task_filter)
+                paged.extend(row["id"] for row in rows)
+                if len(rows) < 2:
+                    break
+                after = task_filter.cursor_of(rows[-1])
+            _expect(paged, expected)
+
+        row = self.tasks.list_by_project_page_rows(project_id, 1)[0]
+        _expect(set(row), PAGE_ROW_KEYS)
+        _expect((row["id"], row["project_id"]), (self.task_ids[0], project_id))
+
+    def task_search(self) -> None:
+        report = {self.task_ids[i] for i in (0, 2, 3)}
+        for q in ("report", "REP", "rep,"):
+            search = TaskSearch(q)
+            rows = self.tasks.search_page_rows(search, 10)
+            _expect({row["id"] for row in rows}, report)
+            # The only title match ranks first
+            _expect(rows[0]["id"], self.task_ids[0])
+            _expect(set(rows[0]), PAGE_ROW_KEYS | {"rank"})
+
+            paged, after = [], None
+            while True:
+                page = self.tasks.search_page_rows(search, 1, after)
+                paged.extend(row["id"] for row in page)
+                if not page:
+                    break
+                after = search.cursor_of(page[-1])
+            _expect(paged, [row["id"] for row in rows])
+
+        _expect(self.tasks.search_page_rows(TaskSearch("report budget"), 10), [])
+        _expect(
+            [row["id"] for row in self.tasks.search_page_rows(TaskSearch("budget finance"), 10)],
+            [self.task_ids[1]],
+        )
+
+    def task_stream(self) -> None:
+        batches = list(self.tasks.stream_by_project(self.project_ids[0], batch_size=2))
+        _expect([len(batch) for batch in batches], [2, 2, 1])
+        rows = [row for batch in batches for row in batch]
+        _expect([row["id"] for row in rows], self.task_ids)
+        _expect(set(rows[0]), EXPORT_ROW_KEYS)
+        _expect(list(self.tasks.stream_by_project(MISSING_ID)), [])
+
+    def task_stats(self) -> None:
+        first_project, second_project = self.project_ids
+        stats = {entry["project_id"]: entry for entry in self.tasks.count_stats(self.today)}
+        _expect(list(stats), [first_project, second_project])
+        first = stats[first_project]
+        _expect(
+            (first["total"], first["by_status"], first["overdue"]),
+            (5, {"todo": 2, "doing": 2, "done": 1}, 2),
+        )
+        _expect(stats[second_project]["total"], 1)
+        _expect(self.tasks.count_stats(self.today, first_project), [first])
+        _expect(self.tasks.count_stats(self.today, MISSING_ID), [])
+
+    def task_changes(self) -> None:
+        project_id = self.project_ids[0]
+        changes = self.tasks.list_changes(project_id, 0, 100)
+        _expect([change["op"] for change in changes], ["created"] * 5)
+        _expect([change["task_id"] for change in changes], self.task_ids)
+        _expect(changes[0]["task"]["title"], "Write report")
+        seqs = [change["seq"] for change in changes]
+        _expect(sorted(seqs), seqs)
+        head = self.tasks.get_change_head(project_id)
+        _expect(head, seqs[-1])
+        _expect(self.tasks.list_changes(project_id, seqs[1], 2), changes[2:4])
+        _expect(self.tasks.get_change_head(MISSING_ID), 0)
+
+        version = self.projects.get_version(project_id)
+        time.sleep(0.01)
+        task = self.tasks.get_by_id(self.task_ids[1])
+        task.status = "done"
+        updated = self.tasks.update_task(task)
+        _expect((updated.status, updated.title), ("done", "Review budget"))
+        _expect(self.tasks.get_by_id(task.id).status, "done")
+        _expect(self.projects.get_version(project_id) > version, True)
+        _expect(
+            [(c["op"], c["task_id"]) for c in self.tasks.list_changes(project_id, head, 10)],
+            [("updated", task.id)],
+        )
+        _raises(NotFoundError, self.tasks.update_task, Task("Missing", "Not stored anywhere", id=MISSING_ID))
+
+    def task_overdue(self) -> None:
+        overdue = {self.task_ids[0], self.task_ids[4]}
+        _expect({t.id for t in self.tasks.list_overdue_open_tasks(self.today)}, overdue)
+        closed_at = datetime.now().replace(microsecond=0)
+        _expect(self.tasks.close_overdue(self.today, closed_at, batch_size=1), 2)
+        _expect(self.tasks.list_overdue_open_tasks(self.today), [])
+        closed = self.tasks.get_by_id(self.task_ids[0])
+        _expect((closed.status, closed.closed_at), ("done", closed_at))
+        _expect(self.tasks.close_overdue(self.today, closed_at), 0)
+
+    def task_deletes(self) -> None:
+        first_project, second_project = self.project_ids
+        head = self.tasks.get_change_head(first_project)
+        _raises(NotFoundError, self.tasks.delete_in_project, second_project, self.task_ids[0])
+        self.tasks.delete_in_project(first_project, self.task_ids[0])
+        _raises(NotFoundError, self.tasks.get_by_id, self.task_ids[0])
+        self.tasks.delete(self.task_ids[1])
+        _raises(NotFoundError, self.tasks.delete, self.task_ids[1])
+        changes = self.tasks.list_changes(first_project, head, 10)
+        _expect(
+            [(c["op"], c["task_id"], c["task"]) for c in changes],
+            [("deleted", self.task_ids[0], None), ("deleted", self.task_ids[1], None)],
+        )
+        self.tasks.delete_all_by_project(first_project)
+        _expect(self.tasks.list_by_project(first_project), [])
+        _expect(self.tasks.get_by_id(self.other_task_id).project_id, second_project)
+
+    def project_update(self) -> None:
+        first_project, second_project = self.project_ids
+        updated = self.projects.update(first_project, Project("Conformance Gamma", "Renamed by the check"))
+        _expect((updated.id, updated.name), (first_project, "Conformance Gamma"))
+        _expect(self.projects.exists_by_normalized_name("conformance alpha"), False)
+        _raises(DuplicateError, self.projects.update, second_project, Project("CONFORMANCE GAMMA", "Taken by another"))
+        _raises(NotFoundError, self.projects.update, MISSING_ID, Project("Conformance Delta", "Nothing to rename"))
+
+    def unit_of_work(self) -> None:
+        async def write() -> Tuple[str, str]:
+            async with self.backend.new_uow() as uow:
+                project = await uow.projects.create(Project("Conformance Async", "Written through a unit of work"))
+                self.project_ids.append(project.id)
+                task = Task("Async task", "Created inside the same unit", project_id=project.id)
+                task = await uow.tasks.create(task)
+                rows = await uow.tasks.list_by_project_page_rows(project.id, 10)
+                _expect([row["id"] for row in rows], [task.id])
+            await self.backend.aclose()
+            return project.id, task.id
+
+        project_id, task_id = asyncio.run(write())
+        # Committed on exit: visible to a repository outside the unit of work
+        _expect(self.tasks.get_in_project(project_id, task_id).title, "Async task")
+
+    def project_delete(self) -> None:
+        second_project = self.project_ids[1]
+        for project_id in self.project_ids:
+            self.projects.delete(project_id)
+        self.project_ids = []
+        _expect(self.projects.count(), 0)
+        _raises(NotFoundError, self.tasks.get_by_id, self.other_task_id)
+        _expect(self.tasks.get_change_head(second_project), 0)
+
+    def cleanup(self) -> None:
+        for project_id in self.project_ids:
+            try:
+                self.projects.delete(project_id)
+            except NotFoundError:
+                pass
+
+
+def run() -> None:
+    """
+    Check that the configured storage backend (STORAGE_BACKEND) behaves like
+    every other: the same scenario through every repository method, with the
+    results the API relies on (orders, cursors, errors, change feed, stats).
+
+    Refuses to run against a backend that already holds projects, removes
+    what it created, and exits with a non-zero status when a step fails.
+    """
+    backend = get_storage_backend()
+    backend.init()
+    scenario = _Scenario(backend)
+    print(f"[INFO] Storage backend: {storage_settings.backend}.")
+
+    if scenario.projects.count():
+        print("[FAIL] The storage is not empty; run the check against a fresh one.")
+        raise SystemExit(1)
+
+    failed = False
+    try:
+        for name, step in scenario.steps():
+            try:
+                step()
+            except Exception as e:
+                failed = True
+                print(f"[FAIL] {name}: {type(e).__name__}: {e}")
+            else:
+                print(f"[OK] {name}.")
+    finally:
+        scenario.cleanup()
+
+    if failed:
+        raise SystemExit(1)
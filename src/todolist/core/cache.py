@@ -0,0 +1,171 @@
+"""
+Small key/value caches used as read-through layers in front of the database.
+
+CacheBackend is the extension point: TTLCache (in-process LRU with a TTL) is
+the default, NullCache turns caching off, and any other implementation can be
+plugged in with PROJECT_CACHE_BACKEND=package.module:ClassName. A backend is
+called from the event loop, so its methods must not block for long.
+"""
+from __future__ import annotations
+
+import importlib
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Hashable
+
+# Returned by CacheBackend.get() for absent or expired keys (None is a value)
+MISSING = object()
+
+
+@dataclass
+class CacheStats:
+    backend: str
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    size: int = 0
+    max_size: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def as_dict(self) -> dict:
+        return {**asdict(self), "hit_ratio": round(self.hit_ratio, 4)}
+
+
+class CacheBackend(ABC):
+    @abstractmethod
+    def get(self, key: Hashable) -> Any:
+        """The cached value, or MISSING."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def set(self, key: Hashable, value: Any) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def delete(self, *keys: Hashable) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def clear(self) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def stats(self) -> CacheStats:
+        raise NotImplementedError
+
+
+class TTLCache(CacheBackend):
+    """
+    Thread-safe LRU cache whose entries also expire ttl seconds after being set.
+
+    Expired entries are dropped lazily when they are looked up; the least
+    recently used entry is evicted when a set() would exceed max_size.
+    """
+
+    def __init__(
+        self,
+        max_size: int,
+        ttl: float,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._max_size = max_size
+        self._ttl = ttl
+        self._clock = clock
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = CacheStats(backend="memory", max_size=max_size)
+
+    def get(self, key: Hashable) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._stats.misses += 1
+                return MISSING
+
+            expires_at, value = entry
+            if expires_at <= self._clock():
+                del self._entries[key]
+                self._stats.expirations += 1
+                self._stats.misses += 1
+                return MISSING
+
+            self._entries.move_to_end(key)
+            self._stats.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        if self._max_size <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (self._clock() + self._ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+                self._stats.evictions += 1
+
+    def delete(self, *keys: Hashable) -> None:
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(**{**asdict(self._stats), "size": len(self._entries)})
+
+
+class NullCache(CacheBackend):
+    """Stores nothing: every lookup is a miss."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._misses = 0
+
+    def get(self, key: Hashable) -> Any:
+        with self._lock:
+            self._misses += 1
+        return MISSING
+
+    def set(self, key: Hashable, value: Any) -> None:
+        pass
+
+    def delete(self, *keys: Hashable) -> None:
+        pass
+
+    def clear(self) -> None:
+        pass
+
+    def stats(self) -> CacheStats:
+        return CacheStats(backend="none", misses=self._misses)
+
+
+def build_cache_backend(backend: str, max_size: int, ttl: float) -> CacheBackend:
+    """
+    Backend from its setting: memory, none, or package.module:ClassName.
+
+    A custom class is called with max_size and ttl keyword arguments.
+    """
+    if backend == "memory":
+        return TTLCache(max_size=max_size, ttl=ttl)
+    if backend == "none":
+        return NullCache()
+
+    module_name, sep, class_name = backend.partition(":")
+    if not sep:
+        raise ValueError(
+            f"Invalid cache backend '{backend}'. "
+            "Must be memory, none or package.module:ClassName."
+        )
+    backend_class = getattr(importlib.import_module(module_name), class_name)
+    return backend_class(max_size=max_size, ttl=ttl)
@@ -6,6 +6,28 @@ load_dotenv()
 PROJECT_OF_NUMBER_MAX = int(os.getenv("PROJECT_OF_NUMBER_MAX", 5))
 TASK_OF_NUMBER_MAX = int(os.getenv("TASK_OF_NUMBER_MAX", 5))
 
+AUTOCLOSE_BATCH_SIZE = int(os.getenv("AUTOCLOSE_BATCH_SIZE", 1000))
+# Port the autoclose scheduler serves GET /metrics on (0: none)
+AUTOCLOSE_METRICS_PORT = int(os.getenv("AUTOCLOSE_METRICS_PORT", 0))
+
+PAGE_SIZE_DEFAULT = int(os.getenv("PAGE_SIZE_DEFAULT", 50))
+PAGE_SIZE_MAX = int(os.getenv("PAGE_SIZE_MAX", 500))
+
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", 1000))
+TASK_BATCH_MAX_SIZE = int(os.getenv("TASK_BATCH_MAX_SIZE", 10000))
+
+CHANGE_FEED_POLL_INTERVAL_SECONDS = float(os.getenv("CHANGE_FEED_POLL_INTERVAL_SECONDS", 0.5))
+CHANGE_FEED_WAIT_MAX_SECONDS = float(os.getenv("CHANGE_FEED_WAIT_MAX_SECONDS", 30))
+CHANGE_FEED_HEARTBEAT_SECONDS = float(os.getenv("CHANGE_FEED_HEARTBEAT_SECONDS", 15))
+CHANGE_FEED_STREAM_MAX_SECONDS = float(os.getenv("CHANGE_FEED_STREAM_MAX_SECONDS", 300))
+
+SEARCH_QUERY_MAX_LENGTH = int(os.getenv("SEARCH_QUERY_MAX_LENGTH", 200))
+SEARCH_MAX_TERMS = int(os.getenv("SEARCH_MAX_TERMS", 8))
+
+PROJECT_CACHE_BACKEND = os.getenv("PROJECT_CACHE_BACKEND", "memory")
+PROJECT_CACHE_MAX_SIZE = int(os.getenv("PROJECT_CACHE_MAX_SIZE", 1024))
+PROJECT_CACHE_TTL_SECONDS = float(os.getenv("PROJECT_CACHE_TTL_SECONDS", 30))
+
 VALID_STATUSES_STR = os.getenv("VALID_STATUSES", "todo,doing,done")
 VALID_STATUSES = set(VALID_STATUSES_STR.split(","))
 
@@ -35,6 +57,18 @@ ERR_INVALID_STATUS = os.getenv(
     "ERR_INVALID_STATUS",
     "Invalid status '{status}'. Must be one of {valid_statuses}.",
 )
+ERR_INVALID_SORT = os.getenv(
+    "ERR_INVALID_SORT",
+    "Invalid sort '{sort}'. Must be one of {valid_sorts}, optionally prefixed with '-'.",
+)
+ERR_INVALID_CURSOR = os.getenv(
+    "ERR_INVALID_CURSOR",
+    "Invalid cursor '{cursor}' for this sort order.",
+)
+ERR_INVALID_SEARCH = os.getenv(
+    "ERR_INVALID_SEARCH",
+    "Search query '{q}' contains no words to search for.",
+)
 ERR_MAX_PROJECTS = os.getenv(
     "ERR_MAX_PROJECTS",
     "Maximum project limit reached.",
@@ -4,6 +4,31 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
+
+def _env_bool(name: str, default: str) -> bool:
+    return os.getenv(name, default).strip().lower() in ("1", "true", "yes", "on")
+
+
+@dataclass
+class StorageSettings:
+    # Where projects and tasks live: sql (SQLAlchemy at DB_URL or the DB_* parts),
+    # sqlite (the file below, no server), memory, wal (memory, logged to
+    # wal_dir), or package.module:ClassName
+    backend: str = os.getenv("STORAGE_BACKEND", "sql").strip()
+    sqlite_path: str = os.getenv("STORAGE_SQLITE_PATH", "todolist.db")
+
+    wal_dir: str = os.getenv("STORAGE_WAL_DIR", "todolist-wal")
+    # Units of work return once their writes are fsynced; off: up to one flush is lost on a crash
+    wal_sync_commit: bool = _env_bool("STORAGE_WAL_SYNC_COMMIT", "true")
+    # Extra wait before each fsync so more writes share it (0: flush as soon as possible)
+    wal_fsync_interval_ms: float = float(os.getenv("STORAGE_WAL_FSYNC_INTERVAL_MS", 0))
+    # Log size since the last snapshot that triggers the next one
+    wal_snapshot_mb: int = int(os.getenv("STORAGE_WAL_SNAPSHOT_MB", 256))
+
+
+storage_settings = StorageSettings()
+
+
 @dataclass
 class DatabaseSettings:
     host: str = os.getenv("DB_HOST", "localhost")
@@ -12,10 +37,106 @@ class DatabaseSettings:
     password: str = os.getenv("DB_PASSWORD", "todolist")
     name: str = os.getenv("DB_NAME", "todolist")
 
+    # Full SQLAlchemy URLs override the PostgreSQL parts above (e.g. SQLite locally)
+    url_override: str = os.getenv("DB_URL", "")
+    async_url_override: str = os.getenv("DB_ASYNC_URL", "")
+    # Serve the API through AsyncSession and an async driver instead of psycopg2
+    async_enabled: bool = _env_bool("DB_ASYNC", "false")
+
+    # Connection pool (per process, so multiply by the number of workers)
+    pool_size: int = int(os.getenv("DB_POOL_SIZE", 5))
+    max_overflow: int = int(os.getenv("DB_MAX_OVERFLOW", 10))
+    pool_timeout: int = int(os.getenv("DB_POOL_TIMEOUT", 30))
+    pool_recycle: int = int(os.getenv("DB_POOL_RECYCLE", 1800))
+    pool_pre_ping: bool = _env_bool("DB_POOL_PRE_PING", "true")
+
+    # Server-side statement timeout in milliseconds (0 disables it)
+    statement_timeout_ms: int = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", 0))
+    # psycopg2 executemany strategy: values_only, values_plus_batch
+    executemany_mode: str = os.getenv("DB_EXECUTEMANY_MODE", "values_plus_batch")
+    echo: bool = _env_bool("DB_ECHO", "false")
+
+    # Log statements slower than this at WARNING, with their parameters (0 disables it)
+    slow_query_ms: float = float(os.getenv("DB_SLOW_QUERY_MS", 500))
+    # Off: log slow statements without their parameters (e.g. to keep data out of logs)
+    slow_query_parameters: bool = _env_bool("DB_SLOW_QUERY_PARAMETERS", "true")
+
     @property
     def url(self) -> str:
+        if self.url_override:
+            return self.url_override
+        if storage_settings.backend == "sqlite":
+            return f"sqlite:///{storage_settings.sqlite_path}"
         # SQLAlchemy URL for PostgreSQL
         return f"postgresql+psycopg2://{self.user}:{self.password}@{self.host}:{self.port}/{self.name}"
 
+    @property
+    def async_url(self) -> str:
+        if self.async_url_override:
+            return self.async_url_override
+        if storage_settings.backend == "sqlite":
+            return f"sqlite+aiosqlite:///{storage_settings.sqlite_path}"
+        return f"postgresql+asyncpg://{self.user}:{self.password}@{self.host}:{self.port}/{self.name}"
+
+    def _pool_options(self, url: str) -> dict:
+        if url.startswith("sqlite") and (":memory:" in url or url.endswith("://")):
+            # In-memory SQLite uses a per-thread pool; sizing options do not apply
+            return {"echo": self.echo}
+
+        return {
+            "echo": self.echo,
+            "pool_size": self.pool_size,
+            "max_overflow": self.max_overflow,
+            "pool_timeout": self.pool_timeout,
+            "pool_recycle": self.pool_recycle,
+            "pool_pre_ping": self.pool_pre_ping,
+        }
+
+    @property
+    def max_connections(self) -> int:
+        """Upper bound of connections one engine of this process can open."""
+        return self.pool_size + self.max_overflow
+
+    @property
+    def async_engine_options(self) -> dict:
+        """Keyword arguments for create_async_engine()."""
+        options = self._pool_options(self.async_url)
+
+        if self.async_url.startswith("postgresql+asyncpg") and self.statement_timeout_ms:
+            options["connect_args"] = {
+                "server_settings": {"statement_timeout": str(self.statement_timeout_ms)}
+            }
+
+        return options
+
+    @property
+    def engine_options(self) -> dict:
+        """Keyword arguments for create_engine() derived from the settings above."""
+        options = self._pool_options(self.url)
+
+        if self.url.startswith("sqlite"):
+            # Sessions are handed between threadpool workers within a request
+            options["connect_args"] = {"check_same_thread": False}
+
+        if self.url.startswith("postgresql+psycopg2"):
+            options["executemany_mode"] = self.executemany_mode
+            if self.statement_timeout_ms:
+                options["connect_args"] = {
+                    "options": f"-c statement_timeout={self.statement_timeout_ms}"
+                }
+
+        return options
+
+
+@dataclass
+class ApiSettings:
+    # Encoder of the app's default response class: auto (orjson when installed), orjson, json
+    json_encoder: str = os.getenv("API_JSON_ENCODER", "auto")
+    # Server-Timing header on every response: SQL statements and time, serialization, total
+    server_timing: bool = _env_bool("API_SERVER_TIMING", "true")
+    # GET /metrics and the per-route request histograms behind it
+    metrics: bool = _env_bool("API_METRICS", "true")
+
 
 db_settings = DatabaseSettings()
+api_settings = ApiSettings()
@@ -0,0 +1,85 @@
+"""
+Where the time of the current API request goes.
+
+The timing middleware starts a RequestTimings per request; the engine
+listeners and the serializers add to it. Worker threads (anyio.to_thread)
+and AsyncSession's greenlets run in a copy of the request's context, so
+they find the same object. Outside a request there is none and recording
+is a no-op.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from time import perf_counter
+from typing import Iterator, Optional
+
+
+class RequestTimings:
+    __slots__ = (
+        "started", "query_count", "db_seconds", "commit_seconds", "serialization_seconds", "endpoint_returned",
+    )
+
+    def __init__(self) -> None:
+        self.started = perf_counter()
+        self.query_count = 0
+        self.db_seconds = 0.0
+        self.commit_seconds = 0.0
+        self.serialization_seconds = 0.0
+        # Set when the endpoint returns; response models are serialized after it
+        self.endpoint_returned: Optional[float] = None
+
+
+_current: ContextVar[Optional[RequestTimings]] = ContextVar("request_timings", default=None)
+
+
+def start_request() -> tuple:
+    """New timings for the request about to run; returns (timings, token for end_request)."""
+    timings = RequestTimings()
+    return timings, _current.set(timings)
+
+
+def end_request(token) -> None:
+    _current.reset(token)
+
+
+def current_timings() -> Optional[RequestTimings]:
+    return _current.get()
+
+
+def record_query(seconds: float) -> None:
+    timings = _current.get()
+    if timings is not None:
+        timings.query_count += 1
+        timings.db_seconds += seconds
+
+
+@contextmanager
+def serializing() -> Iterator[None]:
+    """Count the enclosed block as serialization time of the current request."""
+    timings = _current.get()
+    if timings is None:
+        yield
+        return
+    started = perf_counter()
+    try:
+        yield
+    finally:
+        timings.serialization_seconds += perf_counter() - started
+
+
+@contextmanager
+def committing() -> Iterator[None]:
+    """Count the enclosed block as commit time of the current request."""
+    timings = _current.get()
+    if timings is None:
+        yield
+        return
+    started = perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = perf_counter() - started
+        timings.commit_seconds += elapsed
+        # The unit of work's exit commits after the endpoint returned: keep
+        # that out of the serialization time measured from that point
+        if timings.endpoint_returned is not None:
+            timings.endpoint_returned += elapsed
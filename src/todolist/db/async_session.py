@@ -0,0 +1,33 @@
+from functools import lru_cache
+
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+
+from todolist.core.settings import db_settings
+from todolist.db.session import instrument_engine
+
+
+@lru_cache(maxsize=None)
+def get_async_engine() -> AsyncEngine:
+    # Created lazily so the async driver is only needed when DB_ASYNC is on
+    async_engine = create_async_engine(
+        db_settings.async_url,
+        **db_settings.async_engine_options,
+    )
+    # Cursor events fire on the sync engine underneath
+    instrument_engine(async_engine.sync_engine, "async")
+    return async_engine
+
+
+@lru_cache(maxsize=None)
+def get_async_sessionmaker() -> async_sessionmaker[AsyncSession]:
+    return async_sessionmaker(
+        bind=get_async_engine(),
+        autoflush=False,
+        expire_on_commit=False,
+    )
+
@@ -3,10 +3,28 @@ from __future__ import annotations
 from datetime import date, datetime
 from typing import List, Optional
 
-from sqlalchemy import Date, DateTime, ForeignKey, Integer, String, Text
+from sqlalchemy import (
+    DDL,
+    BigInteger,
+    Date,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+    event,
+    func,
+    text,
+)
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from todolist.db.base import Base
+from todolist.db.search import (
+    POSTGRESQL_SEARCH_DDL,
+    SQLITE_SEARCH_DDL,
+    SQLITE_SEARCH_DROP,
+)
 
 from todolist.core.constants import (
     TASK_TITLE_MAX_LENGTH,
@@ -19,22 +37,57 @@ class ProjectDB(Base):
     __tablename__ = "projects"
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
-    name: Mapped[str] = mapped_column(String(PROJECT_NAME_MAX_LENGTH), unique=True, nullable=False)
+    name: Mapped[str] = mapped_column(String(PROJECT_NAME_MAX_LENGTH), nullable=False)
     description: Mapped[Optional[str]] = mapped_column(String(PROJECT_DESCRIPTION_MAX_LENGTH), nullable=True)
     created_at: Mapped[datetime] = mapped_column(
         DateTime, nullable=False, default=datetime.utcnow
     )
+    # Version watermark of the project and its tasks: task writes bump it too
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow
+    )
 
     tasks: Mapped[List["TaskDB"]] = relationship(
         back_populates="project",
         cascade="all, delete-orphan",
+        # tasks.project_id is ON DELETE CASCADE: never load children to delete them
+        passive_deletes=True,
     )
 
 
+# Case-insensitive project name uniqueness, enforced by the database; it also
+# covers exact duplicates, so name has no unique constraint of its own
+PROJECT_NAME_INDEX = "uq_projects_lower_name"
+Index(PROJECT_NAME_INDEX, func.lower(ProjectDB.name), unique=True)
+
+
 class TaskDB(Base):
     """ORM model for tasks table."""
 
     __tablename__ = "tasks"
+    __table_args__ = (
+        # list_by_project / delete_all_by_project: WHERE project_id = ? ORDER BY id
+        Index("ix_tasks_project_id_id", "project_id", "id"),
+        # list_overdue_open_tasks / close_overdue: only open tasks are indexed
+        Index(
+            "ix_tasks_open_deadline",
+            "deadline",
+            postgresql_where=text("status <> 'done'"),
+            sqlite_where=text("status <> 'done'"),
+        ),
+        # list_tasks filters and sorts: WHERE project_id = ? [AND status IN (...)]
+        # ORDER BY <sort key>, id
+        Index("ix_tasks_project_id_status_id", "project_id", "status", "id"),
+        Index("ix_tasks_project_id_deadline_id", "project_id", "deadline", "id"),
+        Index("ix_tasks_project_id_title_id", "project_id", "title", "id"),
+        # list_tasks q: title ILIKE '%...%' (PostgreSQL only, needs pg_trgm)
+        Index(
+            "ix_tasks_title_trgm",
+            "title",
+            postgresql_using="gin",
+            postgresql_ops={"title": "gin_trgm_ops"},
+        ).ddl_if(dialect="postgresql"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
 
@@ -48,6 +101,9 @@ class TaskDB(Base):
     created_at: Mapped[datetime] = mapped_column(
         DateTime, nullable=False, default=datetime.utcnow
     )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow
+    )
     closed_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
 
     project_id: Mapped[int] = mapped_column(
@@ -55,4 +111,58 @@ class TaskDB(Base):
         nullable=False,
     )
 
-    project: Mapped[ProjectDB] = relationship(back_populates="tasks")
\ No newline at end of file
+    project: Mapped[ProjectDB] = relationship(back_populates="tasks")
+
+
+# ix_tasks_title_trgm needs the extension when the schema is built with create_all
+event.listen(
+    Base.metadata,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
+
+# Full-text search index (see todolist.db.search), built after the tasks table
+for _statement in POSTGRESQL_SEARCH_DDL:
+    event.listen(
+        TaskDB.__table__, "after_create", DDL(_statement).execute_if(dialect="postgresql")
+    )
+for _statement in SQLITE_SEARCH_DDL:
+    event.listen(
+        TaskDB.__table__, "after_create", DDL(_statement).execute_if(dialect="sqlite")
+    )
+event.listen(
+    TaskDB.__table__, "before_drop", DDL(SQLITE_SEARCH_DROP).execute_if(dialect="sqlite")
+)
+
+class TaskChangeDB(Base):
+    """
+    Append-only log of task writes, read by the change feed.
+
+    seq is assigned after the write has locked its project row (see
+    TaskDBRepository._record_changes), so the changes of one project commit in
+    seq order and a reader polling "seq > since" never skips one.
+    AUTOINCREMENT keeps SQLite from reusing the seq of deleted rows.
+    """
+
+    __tablename__ = "task_changes"
+    __table_args__ = (
+        # list_changes: WHERE project_id = ? AND seq > ? ORDER BY seq
+        Index("ix_task_changes_project_id_seq", "project_id", "seq"),
+        {"sqlite_autoincrement": True},
+    )
+
+    seq: Mapped[int] = mapped_column(
+        BigInteger().with_variant(Integer, "sqlite"),
+        primary_key=True,
+        autoincrement=True,
+    )
+    project_id: Mapped[int] = mapped_column(
+        ForeignKey("projects.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    # No foreign key: the entry of a deletion outlives its task
+    task_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    op: Mapped[str] = mapped_column(String(16), nullable=False)
+    changed_at: Mapped[datetime] = mapped_column(
+        DateTime, nullable=False, default=datetime.utcnow
+    )
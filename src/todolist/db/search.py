@@ -0,0 +1,83 @@
+"""
+Full-text index of task titles and descriptions, one per database.
+
+PostgreSQL: tasks.search_vector, a stored generated tsvector (title weighted
+A, description B) with a GIN index; the database keeps it current on every
+write. SQLite: tasks_fts, an external-content FTS5 table over tasks kept in
+sync by triggers, so the text is not stored twice.
+
+Neither is part of the mapped models: create_all builds them through the
+listeners in todolist.db.models and migrations through f1c8e5a3b7d9. Both
+are reached from queries through the lightweight handles below.
+"""
+from sqlalchemy import Integer, column, literal_column, table
+
+# 'simple' folds case and nothing else: no stemming or stop words, so
+# titles in any language are indexed the same way
+TEXT_SEARCH_CONFIG = "simple"
+
+POSTGRESQL_SEARCH_DDL = (
+    f"""
+    ALTER TABLE tasks ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('{TEXT_SEARCH_CONFIG}', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('{TEXT_SEARCH_CONFIG}', coalesce(description, '')), 'B')
+    ) STORED
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_tasks_search_vector ON tasks USING gin (search_vector)",
+)
+
+SQLITE_SEARCH_DDL = (
+    # prefix='2 3': "ab*" and "abc*" are looked up directly instead of
+    # merging every term that starts with them
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS tasks_fts USING fts5(
+        title, description,
+        content='tasks', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2',
+        prefix='2 3'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tasks_fts_ai AFTER INSERT ON tasks BEGIN
+        INSERT INTO tasks_fts (rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tasks_fts_ad AFTER DELETE ON tasks BEGIN
+        INSERT INTO tasks_fts (tasks_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+    END
+    """,
+    # Status changes (autoclose) do not touch the index
+    """
+    CREATE TRIGGER IF NOT EXISTS tasks_fts_au AFTER UPDATE OF title, description ON tasks BEGIN
+        INSERT INTO tasks_fts (tasks_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+        INSERT INTO tasks_fts (rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+    # Indexes rows that existed before the table (no-op on an empty one)
+    "INSERT INTO tasks_fts (tasks_fts) VALUES ('rebuild')",
+)
+
+# The triggers go with the tasks table; the FTS5 table has to be dropped itself
+SQLITE_SEARCH_DROP = "DROP TABLE IF EXISTS tasks_fts"
+
+# Schema objects alembic autogenerate must leave alone: they are not mapped
+SEARCH_SCHEMA_OBJECTS = frozenset(
+    {
+        "search_vector",
+        "ix_tasks_search_vector",
+        "tasks_fts",
+        "tasks_fts_data",
+        "tasks_fts_idx",
+        "tasks_fts_docsize",
+        "tasks_fts_config",
+    }
+)
+
+search_vector = literal_column("tasks.search_vector")
+tasks_fts = table("tasks_fts", column("rowid", Integer))
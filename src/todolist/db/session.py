@@ -1,14 +1,69 @@
-from sqlalchemy import create_engine
+import logging
+from time import perf_counter
+from typing import Dict, Iterator
+
+from sqlalchemy import Engine, create_engine, event
 from contextlib import contextmanager
 from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.pool import QueuePool
 
+from todolist.core.metrics import registry
 from todolist.core.settings import db_settings
+from todolist.core.timing import record_query
+
+logger = logging.getLogger(__name__)
+
+# Longer parameter reprs (executemany batches) are cut in the slow-query log
+SLOW_QUERY_PARAMETERS_MAX_LENGTH = 2000
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    # One statement at a time per connection; a failed one is simply overwritten
+    conn.info["query_started"] = perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    seconds = perf_counter() - conn.info["query_started"]
+    record_query(seconds)
+
+    if db_settings.slow_query_ms and seconds * 1000 >= db_settings.slow_query_ms:
+        if db_settings.slow_query_parameters:
+            shown = repr(parameters)
+            if len(shown) > SLOW_QUERY_PARAMETERS_MAX_LENGTH:
+                shown = f"{shown[:SLOW_QUERY_PARAMETERS_MAX_LENGTH]}... ({len(shown)} chars)"
+        else:
+            shown = "(hidden)"
+        logger.warning(
+            "Slow query (%.1f ms%s): %s; parameters: %s",
+            seconds * 1000,
+            ", executemany" if executemany else "",
+            statement,
+            shown,
+        )
+
+
+# Engines whose pools are reported at GET /metrics, by the "engine" label
+_instrumented_engines: Dict[str, Engine] = {}
+
+
+def instrument_engine(sync_engine: Engine, name: str = "sync") -> None:
+    """
+    Time every statement of the engine: counted into the current request's
+    timings and logged when slower than DB_SLOW_QUERY_MS. Its pool counters
+    are exported as metrics labelled engine=name. Idempotent.
+    """
+    if not event.contains(sync_engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+    _instrumented_engines[name] = sync_engine
+
 
 engine = create_engine(
     db_settings.url,
-    echo=False,
     future=True,
+    **db_settings.engine_options,
 )
+instrument_engine(engine)
 
 SessionLocal = sessionmaker(
     bind=engine,
@@ -28,3 +83,52 @@ def get_session() -> Session:
         raise
     finally:
         session.close()
+
+
+@contextmanager
+def session_scope(session: Session | None = None) -> Iterator[Session]:
+    """
+    Reuse an injected session, or fall back to a short-lived get_session().
+
+    An injected session belongs to a unit of work: changes are flushed so
+    later queries in the same transaction see them, but only the owner commits.
+    """
+    if session is None:
+        with get_session() as new_session:
+            yield new_session
+        return
+
+    yield session
+    session.flush()
+
+
+def pool_status(target: Engine | None = None) -> dict:
+    """Snapshot of the connection pool counters of target (default: the sync engine)."""
+    pool = (target or engine).pool
+    if not isinstance(pool, QueuePool):
+        return {"size": 0, "checked_in": 0, "checked_out": 0, "overflow": 0}
+
+    return {
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        # QueuePool reports negative overflow while the base pool is not full
+        "overflow": max(pool.overflow(), 0),
+    }
+
+
+def _pool_collector(key: str):
+    def collect():
+        for name, pooled_engine in list(_instrumented_engines.items()):
+            yield "", (("engine", name),), pool_status(pooled_engine)[key]
+
+    return collect
+
+
+for _key, _documentation in (
+    ("size", "Connections the pool keeps open."),
+    ("checked_in", "Idle connections in the pool."),
+    ("checked_out", "Connections in use."),
+    ("overflow", "Connections open beyond the pool size."),
+):
+    registry.add_collector(f"todolist_db_pool_{_key}", "gauge", _documentation, _pool_collector(_key))
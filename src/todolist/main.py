@@ -3,6 +3,8 @@ import sys
 from todolist.cli.console import run_console
 from todolist.commands.autoclose_overdue import run as run_autoclose_overdue
 from todolist.commands.autoclose_scheduler import run as run_autoclose_scheduler
+from todolist.commands.check_indexes import run as run_check_indexes
+from todolist.commands.check_storage import run as run_check_storage
 
 def main():
     if len(sys.argv) > 1:
@@ -15,6 +17,14 @@ def main():
         if command == "tasks:start-autoclose-scheduler":
             run_autoclose_scheduler()
             return
+
+        if command == "db:check-indexes":
+            run_check_indexes()
+            return
+
+        if command == "storage:conformance":
+            run_check_storage()
+            return
     run_console()
 
 if __name__ == "__main__":
@@ -1,2 +1,4 @@
 from .project import Project
-from .task import Task
\ No newline at end of file
+from .task import Task
+from .task_filter import TaskFilter
+from .task_search import TaskSearch
@@ -10,12 +10,15 @@ from todolist.core.constants import (
 
 
 class Project:
+    __slots__ = ("id", "name", "description", "created_at", "updated_at")
+
     def __init__(
         self,
         name: str,
         description: str,
         id: str | None = None,
         created_at: datetime | None = None,
+        updated_at: datetime | None = None,
     ):
         validate_length(
             "Project name",
@@ -35,6 +38,25 @@ class Project:
         self.name = name.strip()
         self.description = description.strip()
         self.created_at = created_at or datetime.now()
+        self.updated_at = updated_at
+
+    @classmethod
+    def from_row(
+        cls,
+        id: str,
+        name: str,
+        description: str,
+        created_at: datetime,
+        updated_at: datetime | None = None,
+    ) -> "Project":
+        """Trusted constructor for persisted rows: they were validated on write."""
+        project = cls.__new__(cls)
+        project.id = id
+        project.name = name
+        project.description = description
+        project.created_at = created_at
+        project.updated_at = updated_at
+        return project
 
     def __str__(self):
         short_id = self.id[:8] if self.id else "????????"
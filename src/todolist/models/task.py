@@ -14,6 +14,18 @@ from todolist.core.constants import (
 
 
 class Task:
+    __slots__ = (
+        "id",
+        "title",
+        "description",
+        "status",
+        "deadline",
+        "created_at",
+        "closed_at",
+        "project_id",
+        "updated_at",
+    )
+
     def __init__(
         self,
         title: str,
@@ -24,6 +36,7 @@ class Task:
         created_at: datetime | None = None,
         closed_at: datetime | None = None,
         project_id: str | None = None,
+        updated_at: datetime | None = None,
     ):
         validate_length(
             "Task title",
@@ -55,6 +68,33 @@ class Task:
         self.created_at = created_at or datetime.now()
         self.closed_at = closed_at
         self.project_id = project_id
+        self.updated_at = updated_at
+
+    @classmethod
+    def from_row(
+        cls,
+        id: str,
+        title: str,
+        description: str,
+        status: str,
+        deadline: date | None,
+        created_at: datetime,
+        closed_at: datetime | None,
+        project_id: str,
+        updated_at: datetime | None = None,
+    ) -> "Task":
+        """Trusted constructor for persisted rows: they were validated on write."""
+        task = cls.__new__(cls)
+        task.id = id
+        task.title = title
+        task.description = description
+        task.status = status
+        task.deadline = deadline
+        task.created_at = created_at
+        task.closed_at = closed_at
+        task.project_id = project_id
+        task.updated_at = updated_at
+        return task
 
     def _validate_deadline(self, deadline):
         if not deadline:
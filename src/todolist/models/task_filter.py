@@ -0,0 +1,101 @@
+import base64
+import hashlib
+import json
+from dataclasses import dataclass
+from datetime import date
+from typing import Any, Optional, Tuple
+
+from todolist.core.constants import (
+    ERR_INVALID_CURSOR,
+    ERR_INVALID_SORT,
+    ERR_INVALID_STATUS,
+    VALID_STATUSES,
+)
+from todolist.exceptions import ValidationError
+
+# Sort keys of list_tasks; "-" in front sorts descending. Ties are broken by id
+# in the same direction, so every order is total and pages can be keyset-based.
+TASK_SORT_FIELDS = ("id", "deadline", "title")
+
+
+@dataclass(frozen=True)
+class TaskFilter:
+    """
+    Which tasks of a project to list and in which order.
+
+    deadline_before / deadline_after are exclusive bounds; tasks without a
+    deadline never match them. q matches a case-insensitive title substring.
+    """
+
+    statuses: Tuple[str, ...] = ()
+    deadline_before: Optional[date] = None
+    deadline_after: Optional[date] = None
+    q: Optional[str] = None
+    sort: str = "id"
+
+    def __post_init__(self):
+        for status in self.statuses:
+            if status not in VALID_STATUSES:
+                raise ValidationError(
+                    ERR_INVALID_STATUS.format(
+                        status=status,
+                        valid_statuses=", ".join(VALID_STATUSES),
+                    )
+                )
+        if self.field not in TASK_SORT_FIELDS:
+            raise ValidationError(
+                ERR_INVALID_SORT.format(
+                    sort=self.sort,
+                    valid_sorts=", ".join(TASK_SORT_FIELDS),
+                )
+            )
+
+    @property
+    def field(self) -> str:
+        return self.sort.lstrip("-")
+
+    @property
+    def descending(self) -> bool:
+        return self.sort.startswith("-")
+
+    @property
+    def is_default(self) -> bool:
+        return self == TaskFilter()
+
+    def cache_key(self) -> str:
+        """Short stable digest of the filter, for ETags."""
+        raw = json.dumps(
+            [sorted(self.statuses), str(self.deadline_before),
+             str(self.deadline_after), self.q, self.sort]
+        )
+        return hashlib.blake2b(raw.encode(), digest_size=8).hexdigest()
+
+    def cursor_of(self, row: dict) -> str:
+        """
+        next_cursor of a page ending with row (a list_by_project_page_rows dict).
+
+        Sorted by id it is the plain id, as before sorting existed; otherwise
+        an opaque token carrying the sort value and the id.
+        """
+        if self.field == "id":
+            return str(row["id"])
+        value = row[self.field]
+        if isinstance(value, date):
+            value = value.isoformat()
+        token = json.dumps([value, int(row["id"])], separators=(",", ":"))
+        return base64.urlsafe_b64encode(token.encode()).decode().rstrip("=")
+
+    def parse_cursor(self, after: str) -> Tuple[Any, int]:
+        """(sort value, id) of a cursor made by cursor_of for the same sort."""
+        try:
+            if self.field == "id":
+                return int(after), int(after)
+            padded = after + "=" * (-len(after) % 4)
+            value, task_id = json.loads(base64.urlsafe_b64decode(padded))
+            if self.field == "deadline" and value is not None:
+                value = date.fromisoformat(value)
+            elif self.field == "title" and not isinstance(value, str):
+                raise ValueError(value)
+            return value, int(task_id)
+        except (ValueError, TypeError):
+            raise ValidationError(ERR_INVALID_CURSOR.format(cursor=after))
@@ -0,0 +1,53 @@
+import base64
+import json
+import re
+from dataclasses import dataclass, field
+from typing import Tuple
+
+from todolist.core.constants import (
+    ERR_INVALID_CURSOR,
+    ERR_INVALID_SEARCH,
+    SEARCH_MAX_TERMS,
+)
+from todolist.exceptions import ValidationError
+
+# Letters and digits only: punctuation and operators of the full-text query
+# languages never reach the database, so any input is a valid query
+_TERM = re.compile(r"[^\W_]+")
+
+
+@dataclass(frozen=True)
+class TaskSearch:
+    """
+    A full-text search over task titles and descriptions.
+
+    Every word of q must match the start of a word of the task (so "rep"
+    finds "report"); title matches rank above description matches.
+    """
+
+    q: str
+    terms: Tuple[str, ...] = field(init=False)
+
+    def __post_init__(self):
+        terms = tuple(dict.fromkeys(_TERM.findall(self.q.lower())))
+        if not terms:
+            raise ValidationError(ERR_INVALID_SEARCH.format(q=self.q))
+        object.__setattr__(self, "terms", terms[:SEARCH_MAX_TERMS])
+
+    @staticmethod
+    def cursor_of(row: dict) -> str:
+        """next_cursor of a page ending with row (a search_page_rows dict)."""
+        token = json.dumps([row["rank"], int(row["id"])], separators=(",", ":"))
+        return base64.urlsafe_b64encode(token.encode()).decode().rstrip("=")
+
+    @staticmethod
+    def parse_cursor(after: str) -> Tuple[float, int]:
+        """(rank, id) of a cursor made by cursor_of."""
+        try:
+            padded = after + "=" * (-len(after) % 4)
+            rank, task_id = json.loads(base64.urlsafe_b64decode(padded))
+            if isinstance(rank, bool) or not isinstance(rank, (int, float)):
+                raise ValueError(rank)
+            return float(rank), int(task_id)
+        except (ValueError, TypeError):
+            raise ValidationError(ERR_INVALID_CURSOR.format(cursor=after))
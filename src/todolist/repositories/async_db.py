@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+from datetime import date, datetime
+from typing import Any, Awaitable, Callable, List, TypeVar
+
+from sqlalchemy.orm import Session
+
+from todolist.models.project import Project
+from todolist.models.task import Task
+from todolist.models.task_filter import TaskFilter
+from todolist.models.task_search import TaskSearch
+from todolist.repositories.base import (
+    AsyncProjectRepository,
+    AsyncTaskRepository,
+    ProjectRepository,
+    TaskRepository,
+)
+from todolist.repositories.project_db import ProjectDBRepository
+from todolist.repositories.task_db import TaskDBRepository
+
+T = TypeVar("T")
+
+# Runs a callable against the unit of work's sync Session without blocking the
+# event loop: AsyncSession.run_sync() for the async driver, a worker thread for
+# psycopg2. The SQL itself lives only in the sync DB repositories. Backends
+# without a session (in-memory) pass None and their own sync repositories.
+SessionRunner = Callable[[Callable[[Session], T]], Awaitable[T]]
+
+
+class AsyncProjectDBRepository(AsyncProjectRepository):
+    def __init__(
+        self,
+        run: SessionRunner,
+        repository: Callable[[Session], ProjectRepository] = ProjectDBRepository,
+    ):
+        self._run = run
+        self._repository = repository
+
+    async def _call(self, method: str, *args: Any) -> Any:
+        return await self._run(
+            lambda session: getattr(self._repository(session), method)(*args)
+        )
+
+    async def list_all(self) -> List[Project]:
+        return await self._call("list_all")
+
+    async def list_page_rows(self, limit: int, after: str | None = None) -> List[dict]:
+        return await self._call("list_page_rows", limit, after)
+
+    async def get_by_id(self, project_id: str) -> Project:
+        return await self._call("get_by_id", project_id)
+
+    async def exists(self, project_id: str) -> bool:
+        return await self._call("exists", project_id)
+
+    async def get_version(self, project_id: str) -> datetime | None:
+        return await self._call("get_version", project_id)
+
+    async def exists_by_normalized_name(
+        self, name: str, exclude_id: str | None = None
+    ) -> bool:
+        return await self._call("exists_by_normalized_name", name, exclude_id)
+
+    async def count(self) -> int:
+        return await self._call("count")
+
+    async def create(self, project: Project) -> Project:
+        return await self._call("create", project)
+
+    async def delete(self, project_id: str) -> None:
+        await self._call("delete", project_id)
+
+    async def update(self, project_id: str, new_project: Project) -> Project:
+        return await self._call("update", project_id, new_project)
+
+
+class AsyncTaskDBRepository(AsyncTaskRepository):
+    def __init__(
+        self,
+        run: SessionRunner,
+        repository: Callable[[Session], TaskRepository] = TaskDBRepository,
+    ):
+        self._run = run
+        self._repository = repository
+
+    async def _call(self, method: str, *args: Any) -> Any:
+        return await self._run(
+            lambda session: getattr(self._repository(session), method)(*args)
+        )
+
+    async def get_by_id(self, task_id: str) -> Task:
+        return await self._call("get_by_id", task_id)
+
+    async def get_in_project(self, project_id: str, task_id: str) -> Task:
+        return await self._call("get_in_project", project_id, task_id)
+
+    async def list_by_project(
+        self, project_id: str, task_filter: TaskFilter | None = None
+    ) -> List[Task]:
+        return await self._call("list_by_project", project_id, task_filter)
+
+    async def list_by_project_page_rows(
+        self,
+        project_id: str,
+        limit: int,
+        after: str | None = None,
+        task_filter: TaskFilter | None = None,
+    ) -> List[dict]:
+        return await self._call(
+            "list_by_project_page_rows", project_id, limit, after, task_filter
+        )
+
+    async def search_page_rows(
+        self, search: TaskSearch, limit: int, after: str | None = None
+    ) -> List[dict]:
+        return await self._call("search_page_rows", search, limit, after)
+
+    async def create(self, task: Task) -> Task:
+        return await self._call("create", task)
+
+    async def create_many(self, tasks: List[Task]) -> List[Task]:
+        return await self._call("create_many", tasks)
+
+    async def list_changes(self, project_id: str, since: int, limit: int) -> List[dict]:
+        return await self._call("list_changes", project_id, since, limit)
+
+    async def get_change_head(self, project_id: str) -> int:
+        return await self._call("get_change_head", project_id)
+
+    async def count_stats(self, today: date, project_id: str | None = None) -> List[dict]:
+        return await self._call("count_stats", today, project_id)
+
+    async def update_task(self, task: Task) -> Task:
+        return await self._call("update_task", task)
+
+    async def delete_all_by_project(self, project_id: str) -> None:
+        await self._call("delete_all_by_project", project_id)
+
+    async def delete(self, task_id: str) -> None:
+        await self._call("delete", task_id)
+
+    async def delete_in_project(self, project_id: str, task_id: str) -> None:
+        await self._call("delete_in_project", project_id, task_id)
+
+    async def list_overdue_open_tasks(self, today: date) -> List[Task]:
+        return await self._call("list_overdue_open_tasks", today)
@@ -1,10 +1,12 @@
 from __future__ import annotations
 from abc import ABC, abstractmethod
-from typing import List
-from datetime import date
+from typing import Iterator, List, Sequence
+from datetime import date, datetime
 
 from todolist.models.project import Project
 from todolist.models.task import Task
+from todolist.models.task_filter import TaskFilter
+from todolist.models.task_search import TaskSearch
 
 
 class ProjectRepository(ABC):
@@ -12,10 +14,33 @@ class ProjectRepository(ABC):
     def list_all(self) -> List[Project]:
         raise NotImplementedError
 
+    @abstractmethod
+    def list_page_rows(self, limit: int, after: str | None = None) -> List[dict]:
+        raise NotImplementedError
+
     @abstractmethod
     def get_by_id(self, project_id: str) -> Project:
         raise NotImplementedError
 
+    @abstractmethod
+    def exists(self, project_id: str) -> bool:
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_version(self, project_id: str) -> datetime | None:
+        """updated_at of the project, bumped by every write to it or its tasks; None if missing."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def exists_by_normalized_name(
+        self, name: str, exclude_id: str | None = None
+    ) -> bool:
+        raise NotImplementedError
+
+    @abstractmethod
+    def count(self) -> int:
+        raise NotImplementedError
+
     @abstractmethod
     def create(self, project: Project) -> Project:
         raise NotImplementedError
@@ -35,13 +60,61 @@ class TaskRepository(ABC):
         raise NotImplementedError
 
     @abstractmethod
-    def list_by_project(self, project_id: str) -> List[Task]:
+    def get_in_project(self, project_id: str, task_id: str) -> Task:
+        raise NotImplementedError
+
+    @abstractmethod
+    def list_by_project(
+        self, project_id: str, task_filter: TaskFilter | None = None
+    ) -> List[Task]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def list_by_project_page_rows(
+        self,
+        project_id: str,
+        limit: int,
+        after: str | None = None,
+        task_filter: TaskFilter | None = None,
+    ) -> List[dict]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def search_page_rows(
+        self, search: TaskSearch, limit: int, after: str | None = None
+    ) -> List[dict]:
+        """Tasks of every project matching search, best match first, with their rank."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def stream_by_project(
+        self, project_id: str, batch_size: int
+    ) -> Iterator[Sequence[dict]]:
         raise NotImplementedError
 
     @abstractmethod
     def create(self, task: Task) -> Task:
         raise NotImplementedError
 
+    @abstractmethod
+    def create_many(self, tasks: List[Task]) -> List[Task]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def list_changes(self, project_id: str, since: int, limit: int) -> List[dict]:
+        """Change feed entries of the project with seq > since, in seq order."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_change_head(self, project_id: str) -> int:
+        """seq of the project's latest change feed entry, 0 if it has none."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def count_stats(self, today: date, project_id: str | None = None) -> List[dict]:
+        """Task counts (total, per status, overdue on today) of every project or of one."""
+        raise NotImplementedError
+
     @abstractmethod
     def update_task(self, task: Task) -> Task:
         raise NotImplementedError
@@ -53,7 +126,137 @@ class TaskRepository(ABC):
     @abstractmethod
     def delete(self, task_id: str) -> None:
         raise NotImplementedError
+
+    @abstractmethod
+    def delete_in_project(self, project_id: str, task_id: str) -> None:
+        raise NotImplementedError
     
     @abstractmethod
     def list_overdue_open_tasks(self, today: date) -> List[Task]:
       raise NotImplementedError
+
+    @abstractmethod
+    def close_overdue(
+        self, today: date, closed_at: datetime, batch_size: int
+    ) -> int:
+        raise NotImplementedError
+
+
+class AsyncProjectRepository(ABC):
+    """Awaitable counterpart of ProjectRepository used by the Web API."""
+
+    @abstractmethod
+    async def list_all(self) -> List[Project]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def list_page_rows(self, limit: int, after: str | None = None) -> List[dict]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_by_id(self, project_id: str) -> Project:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def exists(self, project_id: str) -> bool:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_version(self, project_id: str) -> datetime | None:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def exists_by_normalized_name(
+        self, name: str, exclude_id: str | None = None
+    ) -> bool:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def count(self) -> int:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def create(self, project: Project) -> Project:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def delete(self, project_id: str) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def update(self, project_id: str, new_project: Project) -> Project:
+        raise NotImplementedError
+
+
+class AsyncTaskRepository(ABC):
+    """Awaitable counterpart of TaskRepository used by the Web API."""
+
+    @abstractmethod
+    async def get_by_id(self, task_id: str) -> Task:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_in_project(self, project_id: str, task_id: str) -> Task:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def list_by_project(
+        self, project_id: str, task_filter: TaskFilter | None = None
+    ) -> List[Task]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def list_by_project_page_rows(
+        self,
+        project_id: str,
+        limit: int,
+        after: str | None = None,
+        task_filter: TaskFilter | None = None,
+    ) -> List[dict]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def search_page_rows(
+        self, search: TaskSearch, limit: int, after: str | None = None
+    ) -> List[dict]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def create(self, task: Task) -> Task:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def create_many(self, tasks: List[Task]) -> List[Task]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def list_changes(self, project_id: str, since: int, limit: int) -> List[dict]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_change_head(self, project_id: str) -> int:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def count_stats(self, today: date, project_id: str | None = None) -> List[dict]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def update_task(self, task: Task) -> Task:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def delete_all_by_project(self, project_id: str) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def delete(self, task_id: str) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def delete_in_project(self, project_id: str, task_id: str) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def list_overdue_open_tasks(self, today: date) -> List[Task]:
+        raise NotImplementedError
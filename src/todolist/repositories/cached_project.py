@@ -0,0 +1,219 @@
+"""
+Read-through caching of project lookups in front of a project repository.
+
+get_by_id, exists and list_all are answered from the cache when possible;
+create, update and delete drop the affected entries. The unit of work calls
+invalidate_written() again once its transaction has ended, so a read that
+raced the write and cached the old row does not outlive the commit.
+
+Every process has its own in-memory cache: writes made by other workers are
+picked up after PROJECT_CACHE_TTL_SECONDS, or immediately with a shared
+backend plugged in through PROJECT_CACHE_BACKEND. get_version always reads
+the database, and drops the cached project when it finds none: callers that
+must not act on a deleted project check it that way.
+"""
+from __future__ import annotations
+
+from datetime import datetime
+from typing import List, Optional
+
+from todolist.core.cache import MISSING, CacheBackend, build_cache_backend
+from todolist.core.constants import (
+    PROJECT_CACHE_BACKEND,
+    PROJECT_CACHE_MAX_SIZE,
+    PROJECT_CACHE_TTL_SECONDS,
+)
+from todolist.exceptions import NotFoundError
+from todolist.models.project import Project
+from todolist.repositories.base import AsyncProjectRepository, ProjectRepository
+
+_LIST_ALL_KEY = ("projects", "all")
+
+
+def _copy(project: Project) -> Project:
+    # Callers may mutate what they get back; the cached instance must not change
+    return Project.from_row(
+        id=project.id,
+        name=project.name,
+        description=project.description,
+        created_at=project.created_at,
+        updated_at=project.updated_at,
+    )
+
+
+class ProjectCache:
+    """Project entries of one cache backend: one per id, plus the full list."""
+
+    def __init__(self, backend: CacheBackend):
+        self.backend = backend
+
+    @staticmethod
+    def _key(project_id: str) -> tuple:
+        return ("project", str(project_id))
+
+    def get(self, project_id: str) -> Optional[Project]:
+        project = self.backend.get(self._key(project_id))
+        return None if project is MISSING else _copy(project)
+
+    def put(self, project: Project) -> None:
+        self.backend.set(self._key(project.id), _copy(project))
+
+    def get_list(self) -> Optional[List[Project]]:
+        projects = self.backend.get(_LIST_ALL_KEY)
+        return None if projects is MISSING else [_copy(p) for p in projects]
+
+    def put_list(self, projects: List[Project]) -> None:
+        self.backend.set(_LIST_ALL_KEY, [_copy(p) for p in projects])
+
+    def invalidate(self, project_ids: set[str]) -> None:
+        self.backend.delete(_LIST_ALL_KEY, *(self._key(pid) for pid in project_ids))
+
+
+project_cache = ProjectCache(
+    build_cache_backend(
+        PROJECT_CACHE_BACKEND,
+        max_size=PROJECT_CACHE_MAX_SIZE,
+        ttl=PROJECT_CACHE_TTL_SECONDS,
+    )
+)
+
+
+class CachedProjectRepository(ProjectRepository):
+    def __init__(self, inner: ProjectRepository, cache: ProjectCache = project_cache):
+        self._inner = inner
+        self._cache = cache
+        self._written: set[str] = set()
+
+    def _invalidate(self, project_id: str) -> None:
+        self._written.add(str(project_id))
+        self._cache.invalidate(self._written)
+
+    def invalidate_written(self) -> None:
+        self._cache.invalidate(self._written)
+        self._written.clear()
+
+    def get_by_id(self, project_id: str) -> Project:
+        project = self._cache.get(project_id)
+        if project is None:
+            project = self._inner.get_by_id(project_id)
+            self._cache.put(project)
+        return project
+
+    def exists(self, project_id: str) -> bool:
+        # Answered through get_by_id so a miss fills the cache; only projects
+        # that exist are cached
+        try:
+            self.get_by_id(project_id)
+        except NotFoundError:
+            return False
+        return True
+
+    def get_version(self, project_id: str) -> datetime | None:
+        # Not cached: task writes bump the version without going through this
+        # repository. A miss also drops the project if it is still cached, so
+        # a deletion made by another worker is seen before the TTL runs out.
+        version = self._inner.get_version(project_id)
+        if version is None:
+            self._cache.invalidate({str(project_id)})
+        return version
+
+    def list_all(self) -> List[Project]:
+        projects = self._cache.get_list()
+        if projects is None:
+            projects = self._inner.list_all()
+            self._cache.put_list(projects)
+        return projects
+
+    def list_page_rows(self, limit: int, after: str | None = None) -> List[dict]:
+        return self._inner.list_page_rows(limit, after)
+
+    def exists_by_normalized_name(
+        self, name: str, exclude_id: str | None = None
+    ) -> bool:
+        return self._inner.exists_by_normalized_name(name, exclude_id)
+
+    def count(self) -> int:
+        return self._inner.count()
+
+    def create(self, project: Project) -> Project:
+        created = self._inner.create(project)
+        self._invalidate(created.id)
+        return created
+
+    def delete(self, project_id: str) -> None:
+        self._invalidate(project_id)
+        self._inner.delete(project_id)
+
+    def update(self, project_id: str, new_project: Project) -> Project:
+        self._invalidate(project_id)
+        return self._inner.update(project_id, new_project)
+
+
+class CachedAsyncProjectRepository(AsyncProjectRepository):
+    """Awaitable counterpart of CachedProjectRepository: hits skip the session entirely."""
+
+    def __init__(
+        self, inner: AsyncProjectRepository, cache: ProjectCache = project_cache
+    ):
+        self._inner = inner
+        self._cache = cache
+        self._written: set[str] = set()
+
+    def _invalidate(self, project_id: str) -> None:
+        self._written.add(str(project_id))
+        self._cache.invalidate(self._written)
+
+    def invalidate_written(self) -> None:
+        self._cache.invalidate(self._written)
+        self._written.clear()
+
+    async def get_by_id(self, project_id: str) -> Project:
+        project = self._cache.get(project_id)
+        if project is None:
+            project = await self._inner.get_by_id(project_id)
+            self._cache.put(project)
+        return project
+
+    async def exists(self, project_id: str) -> bool:
+        try:
+            await self.get_by_id(project_id)
+        except NotFoundError:
+            return False
+        return True
+
+    async def get_version(self, project_id: str) -> datetime | None:
+        version = await self._inner.get_version(project_id)
+        if version is None:
+            self._cache.invalidate({str(project_id)})
+        return version
+
+    async def list_all(self) -> List[Project]:
+        projects = self._cache.get_list()
+        if projects is None:
+            projects = await self._inner.list_all()
+            self._cache.put_list(projects)
+        return projects
+
+    async def list_page_rows(self, limit: int, after: str | None = None) -> List[dict]:
+        return await self._inner.list_page_rows(limit, after)
+
+    async def exists_by_normalized_name(
+        self, name: str, exclude_id: str | None = None
+    ) -> bool:
+        return await self._inner.exists_by_normalized_name(name, exclude_id)
+
+    async def count(self) -> int:
+        return await self._inner.count()
+
+    async def create(self, project: Project) -> Project:
+        created = await self._inner.create(project)
+        self._invalidate(created.id)
+        return created
+
+    async def delete(self, project_id: str) -> None:
+        self._invalidate(project_id)
+        await self._inner.delete(project_id)
+
+    async def update(self, project_id: str, new_project: Project) -> Project:
+        self._invalidate(project_id)
+        return await self._inner.update(project_id, new_project)
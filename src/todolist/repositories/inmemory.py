@@ -1,81 +1,655 @@
+"""
+In-memory storage: dict-indexed projects and tasks behind the repository ABCs.
+
+One MemoryStore holds everything and the repositories are thin views over
+it. Lookups by id are dict hits, and every project keeps its task ids in a
+sorted list: ids only grow, so creating a task appends. Pages sorted by id
+cost a bisect plus the page. Other sorts, search, stats and autoclose scan
+the tasks involved. Repository calls hold the store's lock while they run
+(streaming and autoclose take it per batch), so each call is atomic and sees
+one consistent state. There are no transactions: a unit of work does not roll
+back calls it already made.
+
+Every write reaches the store as one operation, through MemoryStore.apply().
+The operation's arguments carry the ids and timestamps it assigns, so
+replaying the same operations rebuilds the same state. Records are immutable
+tuples, replaced rather than changed, so a shallow copy of the dicts is a
+consistent view for as long as it is needed.
+"""
+from __future__ import annotations
+
+import re
+import threading
+import unicodedata
+from bisect import bisect_left, bisect_right, insort
+from datetime import date, datetime
+from itertools import islice
+from operator import attrgetter
+from typing import Callable, Dict, Iterator, List, NamedTuple, Sequence, Tuple
+
+from todolist.core.constants import (
+    AUTOCLOSE_BATCH_SIZE,
+    ERR_DUPLICATE_PROJECT,
+    ERR_NOT_FOUND_PROJECT,
+    ERR_NOT_FOUND_TASK,
+    EXPORT_BATCH_SIZE,
+    VALID_STATUSES_STR,
+)
 from todolist.exceptions import DuplicateError, NotFoundError
 from todolist.models.project import Project
 from todolist.models.task import Task
-from todolist.core.constants import TASK_OF_NUMBER_MAX, PROJECT_OF_NUMBER_MAX, ERR_MAX_PROJECTS, ERR_MAX_TASKS, ERR_DUPLICATE_PROJECT, ERR_NOT_FOUND_PROJECT, ERR_NOT_FOUND_TASK, ERR_NO_TASKS_PROJECT
-from todolist.exceptions import LimitError
+from todolist.models.task_filter import TaskFilter
+from todolist.models.task_search import TaskSearch
+from todolist.repositories.base import ProjectRepository, TaskRepository
 
-class ProjectRepository:
-    """Handles CRUD."""
+_DEFAULT_FILTER = TaskFilter()
+_STATS_STATUSES = tuple(VALID_STATUSES_STR.split(","))
 
-    def __init__(self):
-        self._projects = []
-
-    def get_all(self):
-        return list(self._projects)
-
-    def get_by_id(self, project_id: str):
-        for project in self._projects:
-            if project.id == project_id:
-                return project
-        raise NotFoundError(ERR_NOT_FOUND_PROJECT.format(project_id=project_id))
-
-    def add(self, project: Project):
-        if len(self._projects) >= PROJECT_OF_NUMBER_MAX:
-            raise LimitError(ERR_MAX_PROJECTS)
-        if any(p.name.lower() == project.name.lower() for p in self._projects):
-            raise DuplicateError(ERR_DUPLICATE_PROJECT.format(name=project.name))
-        self._projects.append(project)
-
-    def delete(self, project_id: str):
-        for i, project in enumerate(self._projects):
-            if project.id == project_id:
-                del self._projects[i]
-                return
-        raise NotFoundError(ERR_NOT_FOUND_PROJECT.format(project_id=project_id))
-
-class TaskRepository:
-    """Handles CRUD."""
+
+class ProjectRecord(NamedTuple):
+    id: int
+    name: str
+    description: str | None
+    created_at: datetime
+    updated_at: datetime
+
+
+class TaskRecord(NamedTuple):
+    id: int
+    project_id: int
+    title: str
+    description: str | None
+    status: str
+    deadline: date | None
+    created_at: datetime
+    updated_at: datetime
+    closed_at: datetime | None
+
+
+def _normalized_name(name: str) -> str:
+    return name.strip().lower()
+
+
+def _deadline(deadline) -> date | None:
+    if isinstance(deadline, datetime):
+        return deadline.date()
+    if isinstance(deadline, date):
+        return deadline
+    return None
+
+
+def _fold(text: str) -> str:
+    # Case and accents, as the unicode61 tokenizer of the SQLite index does
+    lowered = text.lower()
+    if lowered.isascii():
+        return lowered
+    decomposed = unicodedata.normalize("NFKD", lowered)
+    return "".join(char for char in decomposed if not unicodedata.combining(char))
+
+
+def _word_prefix(term: str) -> Callable[[str], bool]:
+    """Whether a folded text has a word starting with term (a folded search term)."""
+    pattern = re.compile(r"(?<![^\W_])" + re.escape(term))
+
+    def matches(text: str) -> bool:
+        # The substring test rejects most texts before the regex runs
+        return term in text and pattern.search(text) is not None
+
+    return matches
+
+
+class MemoryStore:
+    """
+    All projects, tasks and change feed entries of one process.
+
+    Repositories read the attributes directly while holding lock and change
+    them only through apply(op, *args), which dispatches to _apply_<op>.
+    lsn counts the operations applied so far.
+    """
+
+    # Whether units of work wait for wait_durable() after writing
+    sync_commit = False
 
     def __init__(self):
-        self._tasks = {}
-
-    def add_task(self, project_id: str, task: Task):
-        if project_id not in self._tasks:
-            self._tasks[project_id] = []
-
-        if len(self._tasks[project_id]) >= TASK_OF_NUMBER_MAX:
-            raise LimitError(ERR_MAX_TASKS.format(max_tasks=TASK_OF_NUMBER_MAX))
-        
-        self._tasks[project_id].append(task)
-
-    def get_tasks_by_project(self, project_id: str):
-        return self._tasks.get(project_id, [])
-
-    def delete_all_by_project(self, project_id: str):
-        if project_id in self._tasks:
-            del self._tasks[project_id]
-    
-    def get_task(self, project_id: str, task_id: str):
-        tasks = self._tasks.get(project_id, [])
+        self.lock = threading.RLock()
+        self.projects: Dict[int, ProjectRecord] = {}
+        self.tasks: Dict[int, TaskRecord] = {}
+        # Change feed per project: (seq, op, task_id, changed_at), seq ascending
+        self.changes: Dict[int, List[tuple]] = {}
+        self.last_project_id = 0
+        self.last_task_id = 0
+        self.last_seq = 0
+        self.lsn = 0
+        self._build_indexes()
+
+    def _build_indexes(self) -> None:
+        """The indexes derived from projects and tasks."""
+        self.project_ids: List[int] = sorted(self.projects)
+        self.names: Dict[str, int] = {
+            _normalized_name(record.name): project_id
+            for project_id, record in self.projects.items()
+        }
+        self.project_tasks: Dict[int, List[int]] = {project_id: [] for project_id in self.projects}
+        # tasks is filled in id order, so the per-project lists come out sorted
+        for task_id, record in self.tasks.items():
+            self.project_tasks[record.project_id].append(task_id)
+
+    def apply(self, op: str, *args) -> None:
+        with self.lock:
+            getattr(self, f"_apply_{op}")(*args)
+            self.lsn += 1
+
+    def wait_durable(self, lsn: int) -> None:
+        """Block until the operations up to lsn are persisted (nothing to wait for here)."""
+
+    def _record_changes(self, op: str, changes: Sequence[Tuple[int, int]], at: datetime) -> None:
+        for project_id, task_id in changes:
+            self.last_seq += 1
+            self.changes.setdefault(project_id, []).append((self.last_seq, op, task_id, at))
+        for project_id in {project_id for project_id, _ in changes}:
+            self.projects[project_id] = self.projects[project_id]._replace(updated_at=at)
+
+    def _apply_create_project(self, project_id: int, name: str, description: str | None, at: datetime) -> None:
+        self.projects[project_id] = ProjectRecord(project_id, name, description, at, at)
+        insort(self.project_ids, project_id)
+        self.names[_normalized_name(name)] = project_id
+        self.project_tasks[project_id] = []
+        self.last_project_id = max(self.last_project_id, project_id)
+
+    def _apply_update_project(self, project_id: int, name: str, description: str | None, at: datetime) -> None:
+        record = self.projects[project_id]
+        del self.names[_normalized_name(record.name)]
+        self.projects[project_id] = record._replace(name=name, description=description, updated_at=at)
+        self.names[_normalized_name(name)] = project_id
+
+    def _apply_delete_project(self, project_id: int, at: datetime) -> None:
+        for task_id in self.project_tasks.pop(project_id):
+            del self.tasks[task_id]
+        self.changes.pop(project_id, None)
+        record = self.projects.pop(project_id)
+        del self.names[_normalized_name(record.name)]
+        del self.project_ids[bisect_left(self.project_ids, project_id)]
+
+    def _apply_create_tasks(self, at: datetime, rows: Sequence[tuple]) -> None:
+        """rows: (id, project_id, title, description, status, deadline), ids ascending."""
+        for task_id, project_id, title, description, status, deadline in rows:
+            self.tasks[task_id] = TaskRecord(
+                task_id, project_id, title, description, status, deadline, at, at, None
+            )
+            # Ids only grow: appending keeps the index sorted
+            self.project_tasks[project_id].append(task_id)
+        self.last_task_id = max(self.last_task_id, rows[-1][0])
+        self._record_changes("created", [(row[1], row[0]) for row in rows], at)
+
+    def _apply_update_tasks(self, at: datetime, rows: Sequence[tuple]) -> None:
+        """rows: (id, title, description, status, deadline, closed_at)."""
+        changes = []
+        for task_id, title, description, status, deadline, closed_at in rows:
+            record = self.tasks[task_id]
+            self.tasks[task_id] = record._replace(
+                title=title,
+                description=description,
+                status=status,
+                deadline=deadline,
+                closed_at=closed_at,
+                updated_at=at,
+            )
+            changes.append((record.project_id, task_id))
+        self._record_changes("updated", changes, at)
+
+    def _apply_delete_tasks(self, at: datetime, task_ids: Sequence[int]) -> None:
+        changes = []
+        for task_id in task_ids:
+            record = self.tasks.pop(task_id)
+            ids = self.project_tasks[record.project_id]
+            del ids[bisect_left(ids, task_id)]
+            changes.append((record.project_id, task_id))
+        self._record_changes("deleted", changes, at)
+
+
+memory_store = MemoryStore()
+
+
+def _project_to_domain(record: ProjectRecord) -> Project:
+    return Project.from_row(
+        id=str(record.id),
+        name=record.name,
+        description=record.description or "",
+        created_at=record.created_at,
+        updated_at=record.updated_at,
+    )
+
+
+def _project_row(record: ProjectRecord) -> dict:
+    return {
+        "id": str(record.id),
+        "name": record.name,
+        "description": record.description or "",
+        "created_at": record.created_at,
+    }
+
+
+def _task_to_domain(record: TaskRecord) -> Task:
+    return Task.from_row(
+        id=str(record.id),
+        title=record.title,
+        description=record.description or "",
+        status=record.status,
+        deadline=record.deadline,
+        created_at=record.created_at,
+        closed_at=record.closed_at,
+        project_id=str(record.project_id),
+        updated_at=record.updated_at,
+    )
+
+
+def _task_row(record: TaskRecord) -> dict:
+    """Shaped like TaskDBRepository's PAGE_ROW_COLUMNS."""
+    return {
+        "id": str(record.id),
+        "project_id": str(record.project_id),
+        "title": record.title,
+        "description": record.description or "",
+        "status": record.status,
+        "deadline": record.deadline,
+        "created_at": record.created_at,
+    }
+
+
+def _export_row(record: TaskRecord) -> dict:
+    """Shaped like TaskDBRepository's EXPORT_COLUMNS."""
+    return {
+        "id": str(record.id),
+        "project_id": str(record.project_id),
+        "title": record.title,
+        "description": record.description,
+        "status": record.status,
+        "deadline": record.deadline,
+        "created_at": record.created_at,
+        "closed_at": record.closed_at,
+    }
+
+
+def _update_row(record: TaskRecord, **changes) -> tuple:
+    """update_tasks row of record with changes applied."""
+    record = record._replace(**changes)
+    return (record.id, record.title, record.description, record.status, record.deadline, record.closed_at)
+
+
+def _filter_predicate(task_filter: TaskFilter) -> Callable[[TaskRecord], bool]:
+    statuses = set(task_filter.statuses)
+    before, after = task_filter.deadline_before, task_filter.deadline_after
+    q = task_filter.q.lower() if task_filter.q else None
+
+    def matches(record: TaskRecord) -> bool:
+        if statuses and record.status not in statuses:
+            return False
+        if before is not None and (record.deadline is None or record.deadline >= before):
+            return False
+        if after is not None and (record.deadline is None or record.deadline <= after):
+            return False
+        return q is None or q in record.title.lower()
+
+    return matches
+
+
+def _is_overdue(record: TaskRecord, today: date) -> bool:
+    return (
+        record.deadline is not None
+        and record.deadline < today
+        and record.status != "done"
+    )
+
+
+def _sort_key(value, task_id: int) -> tuple:
+    # Ascending order with NULLs last and id as tie-breaker; descending is its reverse
+    return (value is None, 0 if value is None else value, task_id)
+
+
+class InMemoryProjectRepository(ProjectRepository):
+    def __init__(self, store: MemoryStore = memory_store):
+        self._store = store
+
+    def _record(self, project_id: str) -> ProjectRecord:
+        record = self._store.projects.get(int(project_id))
+        if record is None:
+            raise NotFoundError(ERR_NOT_FOUND_PROJECT.format(project_id=project_id))
+        return record
+
+    def list_all(self) -> List[Project]:
+        with self._store.lock:
+            return [_project_to_domain(self._store.projects[pid]) for pid in self._store.project_ids]
+
+    def _page(self, limit: int, after: str | None) -> List[ProjectRecord]:
+        ids = self._store.project_ids
+        start = 0 if after is None else bisect_right(ids, int(after))
+        return [self._store.projects[pid] for pid in ids[start:start + limit]]
+
+    def list_page_rows(self, limit: int, after: str | None = None) -> List[dict]:
+        with self._store.lock:
+            return [_project_row(record) for record in self._page(limit, after)]
+
+    def get_by_id(self, project_id: str) -> Project:
+        return _project_to_domain(self._record(project_id))
+
+    def exists(self, project_id: str) -> bool:
+        return int(project_id) in self._store.projects
+
+    def get_version(self, project_id: str) -> datetime | None:
+        record = self._store.projects.get(int(project_id))
+        return None if record is None else record.updated_at
+
+    def exists_by_normalized_name(
+        self, name: str, exclude_id: str | None = None
+    ) -> bool:
+        owner = self._store.names.get(_normalized_name(name))
+        return owner is not None and (exclude_id is None or owner != int(exclude_id))
+
+    def count(self) -> int:
+        return len(self._store.projects)
+
+    def create(self, project: Project) -> Project:
+        with self._store.lock:
+            if _normalized_name(project.name) in self._store.names:
+                raise DuplicateError(ERR_DUPLICATE_PROJECT.format(name=project.name))
+            project_id = self._store.last_project_id + 1
+            at = datetime.utcnow()
+            self._store.apply("create_project", project_id, project.name, project.description, at)
+        project.id = str(project_id)
+        project.created_at = at
+        project.updated_at = at
+        return project
+
+    def delete(self, project_id: str) -> None:
+        """Delete the project, its tasks and its change feed."""
+        with self._store.lock:
+            record = self._record(project_id)
+            self._store.apply("delete_project", record.id, datetime.utcnow())
+
+    def update(self, project_id: str, new_project: Project) -> Project:
+        with self._store.lock:
+            record = self._record(project_id)
+            owner = self._store.names.get(_normalized_name(new_project.name))
+            if owner is not None and owner != record.id:
+                raise DuplicateError(ERR_DUPLICATE_PROJECT.format(name=new_project.name))
+            self._store.apply(
+                "update_project", record.id, new_project.name, new_project.description, datetime.utcnow()
+            )
+            return _project_to_domain(self._store.projects[record.id])
+
+
+class InMemoryTaskRepository(TaskRepository):
+    def __init__(self, store: MemoryStore = memory_store):
+        self._store = store
+
+    def _not_found(self, task_id, project_id="N/A") -> NotFoundError:
+        return NotFoundError(ERR_NOT_FOUND_TASK.format(task_id=task_id, project_id=project_id))
+
+    def _select(
+        self,
+        project_id: str,
+        task_filter: TaskFilter,
+        limit: int | None = None,
+        after: str | None = None,
+    ) -> List[TaskRecord]:
+        """Records of the project matching task_filter, in its order, after the cursor."""
+        ids = self._store.project_tasks.get(int(project_id), [])
+        tasks = self._store.tasks
+        matches = _filter_predicate(task_filter)
+        descending = task_filter.descending
+
+        if task_filter.field == "id":
+            # The index is the order: bisect to the cursor, walk until the page is full
+            after_id = None if after is None else task_filter.parse_cursor(after)[1]
+            if descending:
+                end = len(ids) if after_id is None else bisect_left(ids, after_id)
+                positions = range(end - 1, -1, -1)
+            else:
+                start = 0 if after_id is None else bisect_right(ids, after_id)
+                positions = range(start, len(ids))
+            candidates = filter(matches, (tasks[ids[i]] for i in positions))
+            return list(candidates if limit is None else islice(candidates, limit))
+
+        value_of = attrgetter(task_filter.field)
+
+        def key(record: TaskRecord) -> tuple:
+            return _sort_key(value_of(record), record.id)
+
+        rows = sorted(
+            (record for record in (tasks[i] for i in ids) if matches(record)),
+            key=key,
+            reverse=descending,
+        )
+        if after is not None:
+            cursor = _sort_key(*task_filter.parse_cursor(after))
+            rows = [
+                record
+                for record in rows
+                if (key(record) < cursor if descending else key(record) > cursor)
+            ]
+        return rows if limit is None else rows[:limit]
+
+    def get_by_id(self, task_id: str) -> Task:
+        record = self._store.tasks.get(int(task_id))
+        if record is None:
+            raise self._not_found(task_id)
+        return _task_to_domain(record)
+
+    def get_in_project(self, project_id: str, task_id: str) -> Task:
+        record = self._store.tasks.get(int(task_id))
+        if record is None or record.project_id != int(project_id):
+            raise self._not_found(task_id, project_id)
+        return _task_to_domain(record)
+
+    def list_by_project(
+        self, project_id: str, task_filter: TaskFilter | None = None
+    ) -> List[Task]:
+        with self._store.lock:
+            records = self._select(project_id, task_filter or _DEFAULT_FILTER)
+        return [_task_to_domain(record) for record in records]
+
+    def list_by_project_page_rows(
+        self,
+        project_id: str,
+        limit: int,
+        after: str | None = None,
+        task_filter: TaskFilter | None = None,
+    ) -> List[dict]:
+        with self._store.lock:
+            records = self._select(project_id, task_filter or _DEFAULT_FILTER, limit, after)
+        return [_task_row(record) for record in records]
+
+    def search_page_rows(
+        self, search: TaskSearch, limit: int, after: str | None = None
+    ) -> List[dict]:
+        """
+        Scans every task. Each term must start a word of the title (worth 2)
+        or of the description (worth 1); the rank is the sum over the terms.
+        """
+        terms = [_word_prefix(_fold(term)) for term in search.terms]
+        cursor = None
+        if after is not None:
+            rank, task_id = search.parse_cursor(after)
+            cursor = (-rank, task_id)
+        hits = []
+        with self._store.lock:
+            records = list(self._store.tasks.values())
+        for record in records:
+            title, description = _fold(record.title), _fold(record.description or "")
+            rank = 0.0
+            for in_text in terms:
+                in_title, in_description = in_text(title), in_text(description)
+                if not (in_title or in_description):
+                    break
+                rank += 2.0 * in_title + 1.0 * in_description
+            else:
+                if cursor is None or (-rank, record.id) > cursor:
+                    hits.append((-rank, record.id, record))
+        hits.sort(key=lambda hit: hit[:2])
+        return [dict(_task_row(record), rank=-negative_rank) for negative_rank, _, record in hits[:limit]]
+
+    def stream_by_project(
+        self,
+        project_id: str,
+        batch_size: int = EXPORT_BATCH_SIZE,
+    ) -> Iterator[Sequence[dict]]:
+        """The lock is held per batch: tasks deleted meanwhile are left out."""
+        with self._store.lock:
+            ids = list(self._store.project_tasks.get(int(project_id), []))
+        for start in range(0, len(ids), batch_size):
+            with self._store.lock:
+                records = [self._store.tasks.get(task_id) for task_id in ids[start:start + batch_size]]
+            batch = [_export_row(record) for record in records if record is not None]
+            if batch:
+                yield batch
+
+    def _new_rows(self, tasks: List[Task]) -> List[tuple]:
+        rows = []
         for task in tasks:
-            if task.id == task_id:
-                return task
-        raise NotFoundError(ERR_NOT_FOUND_TASK.format(task_id=task_id, project_id=project_id))
-
-    def delete_task(self, project_id: str, task_id: str):
-        if project_id not in self._tasks:
-            raise NotFoundError(ERR_NO_TASKS_PROJECT.format(project_id=project_id))
-        for i, task in enumerate(self._tasks[project_id]):
-            if task.id == task_id:
-                del self._tasks[project_id][i]
-                return
-        raise NotFoundError(ERR_NOT_FOUND_TASK.format(task_id=task_id, project_id=project_id))
-
-    def update_task(self, project_id: str, updated_task):
-        if project_id not in self._tasks:
-            raise NotFoundError(ERR_NO_TASKS_PROJECT.format(project_id=project_id))
-        for i, task in enumerate(self._tasks[project_id]):
-            if task.id == updated_task.id:
-                self._tasks[project_id][i] = updated_task
-                return
-        raise NotFoundError(ERR_NOT_FOUND_TASK.format(task_id=updated_task.id, project_id=project_id))
+            project_id = int(task.project_id)
+            if project_id not in self._store.projects:
+                # What the tasks.project_id foreign key does in the database
+                raise NotFoundError(ERR_NOT_FOUND_PROJECT.format(project_id=task.project_id))
+            task_id = self._store.last_task_id + len(rows) + 1
+            rows.append(
+                (task_id, project_id, task.title, task.description, task.status, _deadline(task.deadline))
+            )
+        return rows
+
+    def create(self, task: Task) -> Task:
+        return self.create_many([task])[0]
+
+    def create_many(self, tasks: List[Task]) -> List[Task]:
+        if not tasks:
+            return tasks
+        with self._store.lock:
+            rows = self._new_rows(tasks)
+            at = datetime.utcnow()
+            self._store.apply("create_tasks", at, rows)
+        for task, row in zip(tasks, rows):
+            task.id = str(row[0])
+            task.project_id = str(row[1])
+            task.created_at = at
+            task.updated_at = at
+            task.closed_at = None
+        return tasks
+
+    def list_changes(self, project_id: str, since: int, limit: int) -> List[dict]:
+        with self._store.lock:
+            changes = self._store.changes.get(int(project_id), [])
+            start = bisect_right(changes, since, key=lambda change: change[0])
+            entries = []
+            for seq, op, task_id, changed_at in changes[start:start + limit]:
+                record = self._store.tasks.get(task_id) if op != "deleted" else None
+                entries.append(
+                    {
+                        "seq": seq,
+                        "op": op,
+                        "task_id": str(task_id),
+                        "changed_at": changed_at,
+                        "task": _task_row(record) if record is not None else None,
+                    }
+                )
+            return entries
+
+    def get_change_head(self, project_id: str) -> int:
+        with self._store.lock:
+            changes = self._store.changes.get(int(project_id))
+            return changes[-1][0] if changes else 0
+
+    def count_stats(self, today: date, project_id: str | None = None) -> List[dict]:
+        with self._store.lock:
+            if project_id is None:
+                project_ids = self._store.project_ids
+            else:
+                project_ids = [int(project_id)] if int(project_id) in self._store.projects else []
+            stats = []
+            for pid in project_ids:
+                by_status = dict.fromkeys(_STATS_STATUSES, 0)
+                overdue = 0
+                ids = self._store.project_tasks[pid]
+                for task_id in ids:
+                    record = self._store.tasks[task_id]
+                    if record.status in by_status:
+                        by_status[record.status] += 1
+                    overdue += _is_overdue(record, today)
+                stats.append(
+                    {"project_id": str(pid), "total": len(ids), "by_status": by_status, "overdue": overdue}
+                )
+            return stats
+
+    def update_task(self, task: Task) -> Task:
+        if task.id is None:
+            raise ValueError("Task id is required to update")
+        with self._store.lock:
+            record = self._store.tasks.get(int(task.id))
+            if record is None:
+                raise self._not_found(task.id, task.project_id or "N/A")
+            row = _update_row(
+                record,
+                title=task.title,
+                description=task.description,
+                status=task.status,
+                deadline=_deadline(task.deadline),
+                closed_at=task.closed_at,
+            )
+            self._store.apply("update_tasks", datetime.utcnow(), [row])
+            return _task_to_domain(self._store.tasks[record.id])
+
+    def _delete(self, task_ids: List[int]) -> None:
+        if task_ids:
+            self._store.apply("delete_tasks", datetime.utcnow(), task_ids)
+
+    def delete_all_by_project(self, project_id: str) -> None:
+        with self._store.lock:
+            self._delete(list(self._store.project_tasks.get(int(project_id), [])))
+
+    def delete(self, task_id: str) -> None:
+        with self._store.lock:
+            if int(task_id) not in self._store.tasks:
+                raise self._not_found(task_id)
+            self._delete([int(task_id)])
+
+    def delete_in_project(self, project_id: str, task_id: str) -> None:
+        with self._store.lock:
+            record = self._store.tasks.get(int(task_id))
+            if record is None or record.project_id != int(project_id):
+                raise self._not_found(task_id, project_id)
+            self._delete([record.id])
+
+    def list_overdue_open_tasks(self, today: date) -> List[Task]:
+        with self._store.lock:
+            records = [record for record in self._store.tasks.values() if _is_overdue(record, today)]
+        return [_task_to_domain(record) for record in records]
+
+    def close_overdue(
+        self,
+        today: date,
+        closed_at: datetime,
+        batch_size: int = AUTOCLOSE_BATCH_SIZE,
+    ) -> int:
+        """
+        Close batch_size tasks per store operation, releasing the lock in
+        between. Tasks created after the run started are left for the next run.
+        """
+        if batch_size < 1:
+            raise ValueError(f"batch_size must be at least 1, got {batch_size}")
+
+        with self._store.lock:
+            # Ids in ascending order (dicts keep insertion order)
+            task_ids = list(self._store.tasks)
+        position = 0
+        closed_count = 0
+        while True:
+            with self._store.lock:
+                batch = []
+                while position < len(task_ids) and len(batch) < batch_size:
+                    record = self._store.tasks.get(task_ids[position])
+                    position += 1
+                    if record is not None and _is_overdue(record, today):
+                        batch.append(_update_row(record, status="done", closed_at=closed_at))
+                if batch:
+                    self._store.apply("update_tasks", datetime.utcnow(), batch)
+            closed_count += len(batch)
+            if position >= len(task_ids):
+                return closed_count
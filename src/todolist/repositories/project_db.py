@@ -1,40 +1,68 @@
+from datetime import datetime
 from typing import List, Optional
-from sqlalchemy import select
-from todolist.db.models import ProjectDB
-from todolist.db.session import get_session
+from sqlalchemy import String, and_, cast, delete, exists, func, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from todolist.db.models import PROJECT_NAME_INDEX, ProjectDB, TaskChangeDB, TaskDB
+from todolist.db.session import session_scope
 from todolist.models.project import Project
-from todolist.exceptions import NotFoundError
-from todolist.core.constants import ERR_NOT_FOUND_PROJECT
+from todolist.exceptions import DuplicateError, NotFoundError
+from todolist.core.constants import ERR_DUPLICATE_PROJECT, ERR_NOT_FOUND_PROJECT
 from todolist.repositories.base import ProjectRepository
 
+# Response-shaped columns for the list endpoint: id as a string, no NULL description
+PAGE_ROW_COLUMNS = (
+    cast(ProjectDB.id, String).label("id"),
+    ProjectDB.name,
+    func.coalesce(ProjectDB.description, "").label("description"),
+    ProjectDB.created_at,
+)
+
 
 class ProjectDBRepository(ProjectRepository):
+    def __init__(self, session: Session | None = None):
+        self._session = session
+
     @staticmethod
     def _to_domain(model: ProjectDB) -> Project:
-        return Project(
+        return Project.from_row(
             id=str(model.id),
             name=model.name,
             description=model.description or "",
             created_at=model.created_at,
+            updated_at=model.updated_at,
         )
 
+    @staticmethod
+    def _flush_unique_name(session: Session, name: str) -> None:
+        # uq_projects_lower_name makes the database the source of truth;
+        # any other violation is not a duplicate name and propagates as is.
+        # Both PostgreSQL and SQLite name the index in the message.
+        try:
+            session.flush()
+        except IntegrityError as e:
+            if PROJECT_NAME_INDEX not in str(e.orig):
+                raise
+            raise DuplicateError(ERR_DUPLICATE_PROJECT.format(name=name))
+
     def create(self, project: Project) -> Project:
-        with get_session() as session:
+        with session_scope(self._session) as session:
             db_project = ProjectDB(
                 name=project.name,
                 description=project.description,
             )
             session.add(db_project)
-            session.flush()
+            self._flush_unique_name(session, project.name)
             session.refresh(db_project)
 
             project.id = str(db_project.id)
             project.created_at = db_project.created_at
+            project.updated_at = db_project.updated_at
             return project
 
     def get_by_id(self, project_id: str) -> Project:
         pid = int(project_id)
-        with get_session() as session:
+        with session_scope(self._session) as session:
             stmt = select(ProjectDB).where(ProjectDB.id == pid)
             result = session.execute(stmt).scalar_one_or_none()
             if result is None:
@@ -43,8 +71,34 @@ class ProjectDBRepository(ProjectRepository):
                 )
             return self._to_domain(result)
 
+    def exists(self, project_id: str) -> bool:
+        stmt = select(exists().where(ProjectDB.id == int(project_id)))
+        with session_scope(self._session) as session:
+            return session.execute(stmt).scalar()
+
+    def get_version(self, project_id: str) -> datetime | None:
+        stmt = select(ProjectDB.updated_at).where(ProjectDB.id == int(project_id))
+        with session_scope(self._session) as session:
+            return session.execute(stmt).scalar_one_or_none()
+
+    def exists_by_normalized_name(
+        self, name: str, exclude_id: str | None = None
+    ) -> bool:
+        """Case-insensitive name check answered by uq_projects_lower_name."""
+        condition = func.lower(ProjectDB.name) == func.lower(name.strip())
+        if exclude_id is not None:
+            condition = and_(condition, ProjectDB.id != int(exclude_id))
+        stmt = select(exists().where(condition))
+        with session_scope(self._session) as session:
+            return session.execute(stmt).scalar()
+
+    def count(self) -> int:
+        stmt = select(func.count()).select_from(ProjectDB)
+        with session_scope(self._session) as session:
+            return session.execute(stmt).scalar_one()
+
     def get_by_name(self, name: str) -> Optional[Project]:
-        with get_session() as session:
+        with session_scope(self._session) as session:
             stmt = select(ProjectDB).where(ProjectDB.name == name)
             result = session.execute(stmt).scalar_one_or_none()
             if result is None:
@@ -52,25 +106,55 @@ class ProjectDBRepository(ProjectRepository):
             return self._to_domain(result)
 
     def list_all(self) -> List[Project]:
-        with get_session() as session:
+        with session_scope(self._session) as session:
             stmt = select(ProjectDB).order_by(ProjectDB.id)
             results = session.execute(stmt).scalars().all()
             return [self._to_domain(p) for p in results]
 
+    def list_page_rows(self, limit: int, after: str | None = None) -> List[dict]:
+        """
+        Keyset page as plain dicts (no ORM objects, no Project): projects with
+        id > after, at most limit of them.
+        """
+        stmt = select(*PAGE_ROW_COLUMNS).order_by(ProjectDB.id).limit(limit)
+        if after is not None:
+            stmt = stmt.where(ProjectDB.id > int(after))
+        with session_scope(self._session) as session:
+            return [row._asdict() for row in session.execute(stmt)]
+
     def delete(self, project_id: str) -> None:
+        """
+        Delete the project, its tasks and its change feed in one transaction.
+
+        Set-based DELETEs, no rows are loaded. Children are removed explicitly
+        rather than through ON DELETE CASCADE, which SQLite only honours with
+        PRAGMA foreign_keys on. Raising NotFoundError rolls both back.
+        """
         pid = int(project_id)
-        with get_session() as session:
-            stmt = select(ProjectDB).where(ProjectDB.id == pid)
-            project = session.execute(stmt).scalar_one_or_none()
-            if project is None:
+        with session_scope(self._session) as session:
+            session.execute(
+                delete(TaskChangeDB)
+                .where(TaskChangeDB.project_id == pid)
+                .execution_options(synchronize_session=False)
+            )
+            session.execute(
+                delete(TaskDB)
+                .where(TaskDB.project_id == pid)
+                .execution_options(synchronize_session=False)
+            )
+            result = session.execute(
+                delete(ProjectDB)
+                .where(ProjectDB.id == pid)
+                .execution_options(synchronize_session=False)
+            )
+            if result.rowcount == 0:
                 raise NotFoundError(
                     ERR_NOT_FOUND_PROJECT.format(project_id=project_id)
                 )
-            session.delete(project)
 
     def update(self, project_id: str, new_project: Project) -> Project:
         pid = int(project_id)
-        with get_session() as session:
+        with session_scope(self._session) as session:
             stmt = select(ProjectDB).where(ProjectDB.id == pid)
             db_project = session.execute(stmt).scalar_one_or_none()
             if db_project is None:
@@ -81,6 +165,6 @@ class ProjectDBRepository(ProjectRepository):
             db_project.name = new_project.name
             db_project.description = new_project.description
             session.add(db_project)
-            session.flush()
+            self._flush_unique_name(session, new_project.name)
             session.refresh(db_project)
             return self._to_domain(db_project)
@@ -0,0 +1,182 @@
+"""
+Storage backends: where the app keeps its projects and tasks.
+
+STORAGE_BACKEND picks one per process:
+
+- sql (default): the SQLAlchemy repositories on DB_URL or the DB_* PostgreSQL
+  settings. Alembic manages the schema.
+- sqlite: the same repositories on the file STORAGE_SQLITE_PATH, in WAL mode.
+  The schema is created on start.
+- memory: the dict-indexed MemoryStore of repositories.inmemory. Nothing
+  survives a restart.
+- wal: the same store with every write logged to STORAGE_WAL_DIR and
+  periodic snapshots (repositories.wal). Recovered on start.
+- package.module:ClassName: a StorageBackend subclass, called without arguments.
+
+Every backend implements the repository ABCs in full. The API, the CLI and the
+commands reach storage only through get_storage_backend(), and
+storage:conformance checks that a backend behaves like the others.
+"""
+from __future__ import annotations
+
+import importlib
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from typing import Callable, Dict, Type
+
+from sqlalchemy import event
+
+from todolist.core.settings import db_settings, storage_settings
+from todolist.repositories.base import ProjectRepository, TaskRepository
+from todolist.repositories.inmemory import (
+    InMemoryProjectRepository,
+    InMemoryTaskRepository,
+    MemoryStore,
+    memory_store,
+)
+from todolist.repositories.project_db import ProjectDBRepository
+from todolist.repositories.task_db import TaskDBRepository
+from todolist.repositories.unit_of_work import (
+    AsyncUnitOfWork,
+    MemoryUnitOfWork,
+    ThreadedUnitOfWork,
+)
+from todolist.repositories.wal import WalMemoryStore
+
+
+class StorageBackend(ABC):
+    name: str
+
+    def init(self) -> None:
+        """Prepare the storage, once per process before it is used. Idempotent."""
+
+    async def aclose(self) -> None:
+        """Release what units of work opened on the running event loop."""
+
+    @abstractmethod
+    def new_uow(self):
+        """An async unit of work (.projects, .tasks), not yet entered."""
+
+    @abstractmethod
+    def project_repository(self) -> ProjectRepository:
+        """Unbound sync repository: every call is its own transaction."""
+
+    @abstractmethod
+    def task_repository(self) -> TaskRepository:
+        """Unbound sync repository: every call is its own transaction."""
+
+
+class SqlBackend(StorageBackend):
+    name = "sql"
+
+    def new_uow(self) -> AsyncUnitOfWork | ThreadedUnitOfWork:
+        # DB_ASYNC picks the driver: AsyncSession, or psycopg2 in worker threads
+        return AsyncUnitOfWork() if db_settings.async_enabled else ThreadedUnitOfWork()
+
+    async def aclose(self) -> None:
+        if db_settings.async_enabled:
+            from todolist.db.async_session import get_async_engine
+
+            # Pooled async connections belong to this loop (aiosqlite also
+            # keeps a worker thread per connection until disposed)
+            await get_async_engine().dispose()
+
+    def project_repository(self) -> ProjectRepository:
+        return ProjectDBRepository()
+
+    def task_repository(self) -> TaskRepository:
+        return TaskDBRepository()
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    cursor = dbapi_connection.cursor()
+    # Readers do not block the writer; NORMAL only syncs at checkpoints in WAL
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.close()
+
+
+class SqliteBackend(SqlBackend):
+    """SqlBackend on a local file: db_settings.url points at STORAGE_SQLITE_PATH."""
+
+    name = "sqlite"
+
+    def init(self) -> None:
+        from todolist.db.base import Base
+        from todolist.db.session import engine
+
+        engines = [engine]
+        if db_settings.async_enabled:
+            from todolist.db.async_session import get_async_engine
+
+            engines.append(get_async_engine().sync_engine)
+        for sync_engine in engines:
+            if not event.contains(sync_engine, "connect", _set_sqlite_pragmas):
+                event.listen(sync_engine, "connect", _set_sqlite_pragmas)
+
+        # No migrations to run: the Alembic chain targets PostgreSQL
+        Base.metadata.create_all(engine)
+
+
+class MemoryBackend(StorageBackend):
+    name = "memory"
+
+    def __init__(self, store: MemoryStore = memory_store):
+        self.store = store
+
+    def new_uow(self) -> MemoryUnitOfWork:
+        return MemoryUnitOfWork(self.store)
+
+    def project_repository(self) -> ProjectRepository:
+        return InMemoryProjectRepository(self.store)
+
+    def task_repository(self) -> TaskRepository:
+        return InMemoryTaskRepository(self.store)
+
+
+class WalMemoryBackend(MemoryBackend):
+    name = "wal"
+
+    def __init__(self):
+        super().__init__(
+            WalMemoryStore(
+                storage_settings.wal_dir,
+                sync_commit=storage_settings.wal_sync_commit,
+                fsync_interval=storage_settings.wal_fsync_interval_ms / 1000,
+                snapshot_bytes=storage_settings.wal_snapshot_mb * 1024 * 1024,
+            )
+        )
+
+    def init(self) -> None:
+        # Recovery: the newest snapshot plus the log after it
+        self.store.open()
+
+
+STORAGE_BACKENDS: Dict[str, Callable[[], StorageBackend]] = {
+    SqlBackend.name: SqlBackend,
+    SqliteBackend.name: SqliteBackend,
+    MemoryBackend.name: MemoryBackend,
+    WalMemoryBackend.name: WalMemoryBackend,
+}
+
+
+def build_storage_backend(backend: str) -> StorageBackend:
+    """Backend from its setting: one of STORAGE_BACKENDS, or package.module:ClassName."""
+    if backend in STORAGE_BACKENDS:
+        return STORAGE_BACKENDS[backend]()
+
+    module_name, sep, class_name = backend.partition(":")
+    if not sep:
+        raise ValueError(
+            f"Invalid storage backend '{backend}'. "
+            f"Must be {', '.join(STORAGE_BACKENDS)} or package.module:ClassName."
+        )
+    backend_class: Type[StorageBackend] = getattr(importlib.import_module(module_name), class_name)
+    return backend_class()
+
+
+@lru_cache(maxsize=None)
+def get_storage_backend() -> StorageBackend:
+    """The process-wide backend selected by STORAGE_BACKEND."""
+    return build_storage_backend(storage_settings.backend)
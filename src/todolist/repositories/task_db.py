@@ -1,15 +1,183 @@
 from __future__ import annotations
 from datetime import date, datetime
-from typing import List
-from sqlalchemy import and_, select
-from todolist.db.models import TaskDB
-from todolist.db.session import get_session
+from typing import Iterator, List, Sequence, Tuple
+from sqlalchemy import (
+    ColumnElement,
+    Select,
+    String,
+    and_,
+    cast,
+    delete,
+    func,
+    insert,
+    literal_column,
+    or_,
+    select,
+    tuple_,
+    update,
+)
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from todolist.db.models import ProjectDB, TaskChangeDB, TaskDB
+from todolist.db.search import TEXT_SEARCH_CONFIG, search_vector, tasks_fts
+from todolist.db.session import get_session, session_scope
 from todolist.models.task import Task
+from todolist.models.task_filter import TaskFilter
+from todolist.models.task_search import TaskSearch
 from todolist.exceptions import NotFoundError
-from todolist.core.constants import ERR_NOT_FOUND_TASK
+from todolist.core.constants import (
+    AUTOCLOSE_BATCH_SIZE,
+    ERR_NOT_FOUND_PROJECT,
+    ERR_NOT_FOUND_TASK,
+    EXPORT_BATCH_SIZE,
+    VALID_STATUSES_STR,
+)
 from todolist.repositories.base import TaskRepository
 
+
+def _project_gone(e: IntegrityError, project_id) -> Exception:
+    """
+    NotFoundError when the insert broke tasks.project_id's foreign key: the
+    project was deleted after the caller checked it. Any other violation is
+    returned as is. The session needs a rollback either way.
+    """
+    if "foreign key" not in str(e.orig).lower():
+        return e
+    return NotFoundError(ERR_NOT_FOUND_PROJECT.format(project_id=project_id))
+
+EXPORT_COLUMNS = (
+    cast(TaskDB.id, String).label("id"),
+    cast(TaskDB.project_id, String).label("project_id"),
+    TaskDB.title,
+    TaskDB.description,
+    TaskDB.status,
+    TaskDB.deadline,
+    TaskDB.created_at,
+    TaskDB.closed_at,
+)
+
+# Response-shaped columns for the list endpoints: ids as strings, no NULL description
+PAGE_ROW_COLUMNS = (
+    cast(TaskDB.id, String).label("id"),
+    cast(TaskDB.project_id, String).label("project_id"),
+    TaskDB.title,
+    func.coalesce(TaskDB.description, "").label("description"),
+    TaskDB.status,
+    TaskDB.deadline,
+    TaskDB.created_at,
+)
+
+# Change feed columns, followed by PAGE_ROW_COLUMNS of the task (NULL once deleted)
+CHANGE_ROW_COLUMNS = (
+    TaskChangeDB.seq,
+    TaskChangeDB.op,
+    cast(TaskChangeDB.task_id, String).label("task_id"),
+    TaskChangeDB.changed_at,
+)
+_TASK_KEYS = tuple(column.key for column in PAGE_ROW_COLUMNS)
+
+
+def _change_entry(row) -> dict:
+    seq, op, task_id, changed_at, *task = row
+    return {
+        "seq": seq,
+        "op": op,
+        "task_id": task_id,
+        "changed_at": changed_at,
+        "task": dict(zip(_TASK_KEYS, task)) if task[0] is not None else None,
+    }
+
+
+_DEFAULT_FILTER = TaskFilter()
+_SORT_COLUMNS = {"id": TaskDB.id, "deadline": TaskDB.deadline, "title": TaskDB.title}
+
+
+def _like_pattern(q: str) -> str:
+    escaped = q.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def _filter_conditions(project_id: int, task_filter: TaskFilter) -> List[ColumnElement]:
+    conditions = [TaskDB.project_id == project_id]
+    if task_filter.statuses:
+        conditions.append(TaskDB.status.in_(task_filter.statuses))
+    if task_filter.deadline_before is not None:
+        conditions.append(TaskDB.deadline < task_filter.deadline_before)
+    if task_filter.deadline_after is not None:
+        conditions.append(TaskDB.deadline > task_filter.deadline_after)
+    if task_filter.q:
+        # ILIKE on PostgreSQL (served by the ix_tasks_title_trgm GIN index),
+        # lower() LIKE lower() elsewhere
+        conditions.append(TaskDB.title.ilike(_like_pattern(task_filter.q), escape="\\"))
+    return conditions
+
+
+def _order_by(task_filter: TaskFilter) -> List[ColumnElement]:
+    column = _SORT_COLUMNS[task_filter.field]
+    descending = task_filter.descending
+    key = column.desc() if descending else column.asc()
+    if task_filter.field == "deadline":
+        # Tasks without a deadline come last ascending and first descending on
+        # every database: a PostgreSQL B-tree read forwards or backwards
+        key = key.nulls_first() if descending else key.nulls_last()
+    if column is TaskDB.id:
+        return [key]
+    return [key, TaskDB.id.desc() if descending else TaskDB.id.asc()]
+
+
+def _after_cursor(task_filter: TaskFilter, after: str) -> ColumnElement:
+    """Keyset predicate: rows strictly after the cursor in the filter's order."""
+    value, task_id = task_filter.parse_cursor(after)
+    column = _SORT_COLUMNS[task_filter.field]
+    if column is TaskDB.id:
+        return TaskDB.id < task_id if task_filter.descending else TaskDB.id > task_id
+
+    if task_filter.descending:
+        if value is None:
+            return or_(and_(column.is_(None), TaskDB.id < task_id), column.is_not(None))
+        return tuple_(column, TaskDB.id) < tuple_(value, task_id)
+    if value is None:
+        return and_(column.is_(None), TaskDB.id > task_id)
+    after_value = tuple_(column, TaskDB.id) > tuple_(value, task_id)
+    return or_(after_value, column.is_(None)) if task_filter.field == "deadline" else after_value
+
+
+def _search_match(dialect_name: str, search: TaskSearch) -> Tuple[ColumnElement, ColumnElement]:
+    """(match condition, rank) of search; a higher rank is a better match."""
+    if dialect_name == "postgresql":
+        # Every term as a prefix: 'rep:* & wee:*'. The configuration is inlined
+        # so db:check-indexes can render the statement with literal binds
+        query = func.to_tsquery(
+            literal_column(f"'{TEXT_SEARCH_CONFIG}'::regconfig"),
+            " & ".join(f"{term}:*" for term in search.terms),
+        )
+        return search_vector.op("@@")(query), func.ts_rank(search_vector, query)
+    if dialect_name == "sqlite":
+        fts = literal_column(tasks_fts.name)
+        match = fts.op("MATCH")(" ".join(f'"{term}"*' for term in search.terms))
+        # bm25() is lower for better matches; titles weigh twice as much
+        return match, -func.bm25(fts, 2.0, 1.0)
+    raise NotImplementedError(f"Task search is not supported on {dialect_name}")
+
+
+# Status columns of the stats rows, in the configured order
+_STATS_STATUSES = tuple(VALID_STATUSES_STR.split(","))
+
+
+def _stats_entry(row) -> dict:
+    project_id, total, *by_status, overdue = row
+    return {
+        "project_id": str(project_id),
+        "total": total,
+        "by_status": dict(zip(_STATS_STATUSES, by_status)),
+        "overdue": overdue,
+    }
+
+
 class TaskDBRepository(TaskRepository):
+    def __init__(self, session: Session | None = None):
+        self._session = session
+
     @staticmethod
     def _deadline_to_db(deadline) -> date | None:
         if deadline is None:
@@ -20,9 +188,40 @@ class TaskDBRepository(TaskRepository):
             return deadline
         return None
 
+    @staticmethod
+    def _record_changes(
+        session: Session, op: str, changes: Sequence[Tuple[int, int]]
+    ) -> None:
+        """
+        Bump the version (updated_at) of the projects of the changed tasks and
+        append one change feed entry per (project_id, task_id).
+
+        The UPDATE comes first: it row-locks the projects until commit, so
+        concurrent writers of one project take their seq and commit one after
+        the other and the feed never shows a later seq before an earlier one.
+        Keep that window short: commit right after the write (the API's task
+        write handlers do, before building their response).
+        """
+        if not changes:
+            return
+        now = datetime.utcnow()
+        session.execute(
+            update(ProjectDB)
+            .where(ProjectDB.id.in_({project_id for project_id, _ in changes}))
+            .values(updated_at=now)
+            .execution_options(synchronize_session=False)
+        )
+        session.execute(
+            insert(TaskChangeDB.__table__),
+            [
+                {"project_id": project_id, "task_id": task_id, "op": op, "changed_at": now}
+                for project_id, task_id in changes
+            ],
+        )
+
     @staticmethod
     def _to_domain(model: TaskDB) -> Task:
-        return Task(
+        return Task.from_row(
             id=str(model.id),
             title=model.title,
             description=model.description or "",
@@ -31,11 +230,96 @@ class TaskDBRepository(TaskRepository):
             created_at=model.created_at,
             closed_at=model.closed_at,
             project_id=str(model.project_id),
+            updated_at=model.updated_at,
+        )
+
+    @staticmethod
+    def list_by_project_stmt(
+        project_id: int, task_filter: TaskFilter | None = None
+    ) -> Select:
+        """
+        Tasks of one project matching task_filter, in its order.
+
+        Served by ix_tasks_project_id_id (no filter), ix_tasks_project_id_status_id,
+        ix_tasks_project_id_deadline_id or ix_tasks_project_id_title_id.
+        """
+        task_filter = task_filter or _DEFAULT_FILTER
+        return (
+            select(TaskDB)
+            .where(*_filter_conditions(project_id, task_filter))
+            .order_by(*_order_by(task_filter))
+        )
+
+    @staticmethod
+    def search_stmt(
+        dialect_name: str, search: TaskSearch, limit: int | None, after: str | None = None
+    ) -> Select:
+        """
+        Matching tasks of all projects as list rows plus rank, best first.
+
+        Served by ix_tasks_search_vector on PostgreSQL and tasks_fts on SQLite.
+        The page is ranked and cut from the index alone; only its rows are
+        joined to tasks. Pages are keyset-based on (rank, id), so a task does
+        not show up twice or get skipped when tasks are written between pages.
+        """
+        match, rank = _search_match(dialect_name, search)
+        if dialect_name == "sqlite":
+            task_id = tasks_fts.c.rowid
+            hits = select(task_id.label("id"), rank.label("rank")).where(match)
+        else:
+            task_id = TaskDB.id
+            hits = select(task_id, rank.label("rank")).where(match)
+        if after is not None:
+            after_rank, after_id = search.parse_cursor(after)
+            hits = hits.where(
+                or_(rank < after_rank, and_(rank == after_rank, task_id > after_id))
+            )
+        hits = hits.order_by(rank.desc(), task_id).limit(limit).subquery("hits")
+        return (
+            select(*PAGE_ROW_COLUMNS, hits.c.rank)
+            .join_from(hits, TaskDB, TaskDB.id == hits.c.id)
+            .order_by(hits.c.rank.desc(), TaskDB.id)
+        )
+
+    @staticmethod
+    def stats_stmt(today: date, project_id: int | None = None) -> Select:
+        """
+        Task counts per project: total, one per status and overdue.
+
+        One grouped scan with COUNT(*) FILTER (...) per column; projects
+        without tasks get zeros. Overdue is open and past its deadline on
+        today, the same tasks close_overdue would close.
+        """
+        count = func.count(TaskDB.id)
+        stmt = (
+            select(
+                ProjectDB.id,
+                count,
+                *(count.filter(TaskDB.status == status) for status in _STATS_STATUSES),
+                count.filter(and_(TaskDB.deadline < today, TaskDB.status != "done")),
+            )
+            .outerjoin(TaskDB, TaskDB.project_id == ProjectDB.id)
+            .group_by(ProjectDB.id)
+            .order_by(ProjectDB.id)
+        )
+        if project_id is not None:
+            stmt = stmt.where(ProjectDB.id == project_id)
+        return stmt
+
+    @staticmethod
+    def overdue_open_stmt(today: date) -> Select:
+        """Open tasks past their deadline (served by ix_tasks_open_deadline)."""
+        return select(TaskDB).where(
+            and_(
+                TaskDB.deadline != None,  # noqa: E711
+                TaskDB.deadline < today,
+                TaskDB.status != "done",
+            )
         )
 
     def create(self, task: Task) -> Task:
         pid = int(task.project_id)
-        with get_session() as session:
+        with session_scope(self._session) as session:
             db_task = TaskDB(
                 title=task.title,
                 description=task.description,
@@ -44,18 +328,70 @@ class TaskDBRepository(TaskRepository):
                 project_id=pid,
             )
             session.add(db_task)
-            session.flush()
+            try:
+                session.flush()
+            except IntegrityError as e:
+                raise _project_gone(e, pid)
             session.refresh(db_task)
+            self._record_changes(session, "created", [(pid, db_task.id)])
 
             task.id = str(db_task.id)
             task.project_id = str(db_task.project_id)
             task.created_at = db_task.created_at
+            task.updated_at = db_task.updated_at
             task.closed_at = db_task.closed_at
             return task
 
+    def create_many(self, tasks: List[Task]) -> List[Task]:
+        """
+        Insert all tasks with one executemany INSERT ... RETURNING.
+
+        Fills id, created_at, updated_at and closed_at on the given objects, in order.
+        """
+        if not tasks:
+            return tasks
+
+        rows = [
+            {
+                "title": task.title,
+                "description": task.description,
+                "status": task.status,
+                "deadline": self._deadline_to_db(task.deadline),
+                "project_id": int(task.project_id),
+            }
+            for task in tasks
+        ]
+        # Core insert on the table: the ORM bulk path would split the rows
+        # into one statement per distinct set of None columns
+        table = TaskDB.__table__
+        stmt = insert(table).returning(
+            table.c.id,
+            table.c.created_at,
+            table.c.updated_at,
+            table.c.closed_at,
+            sort_by_parameter_order=True,
+        )
+        with session_scope(self._session) as session:
+            try:
+                returned = session.execute(stmt, rows).all()
+            except IntegrityError as e:
+                raise _project_gone(e, tasks[0].project_id)
+            self._record_changes(
+                session,
+                "created",
+                [(row["project_id"], task_id) for row, (task_id, *_) in zip(rows, returned)],
+            )
+
+        for task, (task_id, created_at, updated_at, closed_at) in zip(tasks, returned):
+            task.id = str(task_id)
+            task.created_at = created_at
+            task.updated_at = updated_at
+            task.closed_at = closed_at
+        return tasks
+
     def get_by_id(self, task_id: str) -> Task:
         tid = int(task_id)
-        with get_session() as session:
+        with session_scope(self._session) as session:
             stmt = select(TaskDB).where(TaskDB.id == tid)
             result = session.execute(stmt).scalar_one_or_none()
             if result is None:
@@ -64,24 +400,153 @@ class TaskDBRepository(TaskRepository):
                 )
             return self._to_domain(result)
 
-    def list_by_project(self, project_id: str) -> List[Task]:
-        pid = int(project_id)
-        with get_session() as session:
-            stmt = (
-                select(TaskDB)
-                .where(TaskDB.project_id == pid)
-                .order_by(TaskDB.id)
+    def get_in_project(self, project_id: str, task_id: str) -> Task:
+        """One indexed lookup by both keys instead of get_by_id + a project check."""
+        stmt = select(TaskDB).where(
+            and_(
+                TaskDB.id == int(task_id),
+                TaskDB.project_id == int(project_id),
             )
+        )
+        with session_scope(self._session) as session:
+            result = session.execute(stmt).scalar_one_or_none()
+            if result is None:
+                raise NotFoundError(
+                    ERR_NOT_FOUND_TASK.format(task_id=task_id, project_id=project_id)
+                )
+            return self._to_domain(result)
+
+    def list_by_project(
+        self, project_id: str, task_filter: TaskFilter | None = None
+    ) -> List[Task]:
+        pid = int(project_id)
+        with session_scope(self._session) as session:
+            stmt = self.list_by_project_stmt(pid, task_filter)
             results = session.execute(stmt).scalars().all()
             return [self._to_domain(t) for t in results]
 
+    def list_by_project_page_rows(
+        self,
+        project_id: str,
+        limit: int,
+        after: str | None = None,
+        task_filter: TaskFilter | None = None,
+    ) -> List[dict]:
+        """
+        Keyset page in the filter's order, as plain dicts (no ORM objects, no
+        Task): cost does not grow with the page depth.
+
+        after is a cursor made by task_filter.cursor_of() (the plain id when
+        sorted by id).
+        """
+        task_filter = task_filter or _DEFAULT_FILTER
+        stmt = (
+            select(*PAGE_ROW_COLUMNS)
+            .where(*_filter_conditions(int(project_id), task_filter))
+            .order_by(*_order_by(task_filter))
+            .limit(limit)
+        )
+        if after is not None:
+            stmt = stmt.where(_after_cursor(task_filter, after))
+        with session_scope(self._session) as session:
+            return [row._asdict() for row in session.execute(stmt)]
+
+    def search_page_rows(
+        self, search: TaskSearch, limit: int, after: str | None = None
+    ) -> List[dict]:
+        with session_scope(self._session) as session:
+            stmt = self.search_stmt(session.get_bind().dialect.name, search, limit, after)
+            return [row._asdict() for row in session.execute(stmt)]
+
+    def stream_by_project(
+        self,
+        project_id: str,
+        batch_size: int = EXPORT_BATCH_SIZE,
+    ) -> Iterator[Sequence[dict]]:
+        """
+        Yield the project's tasks as plain dicts, batch_size rows at a time.
+
+        Reads through a server-side cursor, so memory stays flat for any
+        project size. The generator owns its session, which it opens on the
+        first batch and closes after the last: it is consumed while the
+        response streams, outside any unit of work.
+        """
+        stmt = (
+            select(*EXPORT_COLUMNS)
+            .where(TaskDB.project_id == int(project_id))
+            .order_by(TaskDB.id)
+            .execution_options(yield_per=batch_size)
+        )
+        with get_session() as session:
+            for rows in session.execute(stmt).mappings().partitions():
+                yield [dict(row) for row in rows]
+
+    def list_changes(self, project_id: str, since: int, limit: int) -> List[dict]:
+        """
+        Change feed entries of the project with seq > since, oldest first.
+
+        Each entry carries the task as it is now (TaskItem-shaped), or None for
+        a deletion and once the task has been deleted.
+        """
+        stmt = (
+            select(*CHANGE_ROW_COLUMNS, *PAGE_ROW_COLUMNS)
+            .outerjoin(
+                TaskDB,
+                # SQLite reuses the id of a deleted last row: a deletion never
+                # joins, and a later task with the same id only within the project
+                and_(
+                    TaskDB.id == TaskChangeDB.task_id,
+                    TaskDB.project_id == TaskChangeDB.project_id,
+                    TaskChangeDB.op != "deleted",
+                ),
+            )
+            .where(
+                and_(
+                    TaskChangeDB.project_id == int(project_id),
+                    TaskChangeDB.seq > since,
+                )
+            )
+            .order_by(TaskChangeDB.seq)
+            .limit(limit)
+        )
+        with session_scope(self._session) as session:
+            return [_change_entry(row) for row in session.execute(stmt)]
+
+    def get_change_head(self, project_id: str) -> int:
+        stmt = select(func.coalesce(func.max(TaskChangeDB.seq), 0)).where(
+            TaskChangeDB.project_id == int(project_id)
+        )
+        with session_scope(self._session) as session:
+            return session.execute(stmt).scalar_one()
+
+    def count_stats(self, today: date, project_id: str | None = None) -> List[dict]:
+        """
+        stats_stmt rows as {"project_id", "total", "by_status", "overdue"}:
+        every project, or only project_id ([] when it does not exist).
+        """
+        stmt = self.stats_stmt(today, None if project_id is None else int(project_id))
+        with session_scope(self._session) as session:
+            return [_stats_entry(row) for row in session.execute(stmt)]
+
     def update_task(self, new_task: Task) -> Task:
         if new_task.id is None:
             raise ValueError("Task id is required to update")
 
         tid = int(new_task.id)
-        with get_session() as session:
-            stmt = select(TaskDB).where(TaskDB.id == tid)
+        stmt = (
+            update(TaskDB)
+            .where(TaskDB.id == tid)
+            .values(
+                title=new_task.title,
+                description=new_task.description,
+                status=new_task.status,
+                deadline=self._deadline_to_db(new_task.deadline),
+                closed_at=new_task.closed_at,
+            )
+            .returning(TaskDB)
+            .execution_options(synchronize_session=False)
+        )
+        with session_scope(self._session) as session:
             db_task = session.execute(stmt).scalar_one_or_none()
             if db_task is None:
                 raise NotFoundError(
@@ -90,21 +555,12 @@ class TaskDBRepository(TaskRepository):
                         project_id=new_task.project_id or "N/A",
                     )
                 )
-
-            db_task.title = new_task.title
-            db_task.description = new_task.description
-            db_task.status = new_task.status
-            db_task.deadline = self._deadline_to_db(new_task.deadline)
-            db_task.closed_at = new_task.closed_at
-
-            session.add(db_task)
-            session.flush()
-            session.refresh(db_task)
+            self._record_changes(session, "updated", [(db_task.project_id, tid)])
             return self._to_domain(db_task)
 
     def delete(self, task_id: str) -> None:
         tid = int(task_id)
-        with get_session() as session:
+        with session_scope(self._session) as session:
             stmt = select(TaskDB).where(TaskDB.id == tid)
             db_task = session.execute(stmt).scalar_one_or_none()
             if db_task is None:
@@ -112,23 +568,86 @@ class TaskDBRepository(TaskRepository):
                     ERR_NOT_FOUND_TASK.format(task_id=task_id, project_id="N/A")
                 )
             session.delete(db_task)
+            self._record_changes(session, "deleted", [(db_task.project_id, tid)])
+
+    def delete_in_project(self, project_id: str, task_id: str) -> None:
+        stmt = delete(TaskDB).where(
+            and_(
+                TaskDB.id == int(task_id),
+                TaskDB.project_id == int(project_id),
+            )
+        )
+        with session_scope(self._session) as session:
+            result = session.execute(stmt)
+            if result.rowcount == 0:
+                raise NotFoundError(
+                    ERR_NOT_FOUND_TASK.format(task_id=task_id, project_id=project_id)
+                )
+            self._record_changes(session, "deleted", [(int(project_id), int(task_id))])
 
     def delete_all_by_project(self, project_id: str) -> None:
         pid = int(project_id)
-        with get_session() as session:
-            stmt = select(TaskDB).where(TaskDB.project_id == pid)
-            results = session.execute(stmt).scalars().all()
-            for t in results:
-                session.delete(t)
+        stmt = (
+            delete(TaskDB)
+            .where(TaskDB.project_id == pid)
+            .returning(TaskDB.id)
+            .execution_options(synchronize_session=False)
+        )
+        with session_scope(self._session) as session:
+            task_ids = session.execute(stmt).scalars().all()
+            self._record_changes(session, "deleted", [(pid, tid) for tid in task_ids])
 
     def list_overdue_open_tasks(self, today: date) -> List[Task]:
-        with get_session() as session:
-            stmt = select(TaskDB).where(
+        with session_scope(self._session) as session:
+            stmt = self.overdue_open_stmt(today)
+            results = session.execute(stmt).scalars().all()
+            return [self._to_domain(t) for t in results]
+
+    def close_overdue(
+        self,
+        today: date,
+        closed_at: datetime,
+        batch_size: int = AUTOCLOSE_BATCH_SIZE,
+    ) -> int:
+        """
+        Mark every overdue, non-done task as done with set-based UPDATEs.
+
+        Each batch runs in its own short transaction (never the injected
+        session) so the connection is not held for the whole run. Rows locked
+        by another transaction are skipped, so the run goes on until a batch
+        closes nothing rather than stopping at the first short one; rows still
+        locked then are left for the next run. Returns the exact number of
+        closed tasks.
+        """
+        if batch_size < 1:
+            raise ValueError(f"batch_size must be at least 1, got {batch_size}")
+
+        overdue_ids = (
+            select(TaskDB.id)
+            .where(
                 and_(
-                    TaskDB.deadline != None,  # noqa: E711
                     TaskDB.deadline < today,
                     TaskDB.status != "done",
                 )
             )
-            results = session.execute(stmt).scalars().all()
-            return [self._to_domain(t) for t in results]
+            .order_by(TaskDB.id)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+        stmt = (
+            update(TaskDB)
+            .where(TaskDB.id.in_(overdue_ids))
+            .values(status="done", closed_at=closed_at)
+            .returning(TaskDB.project_id, TaskDB.id)
+            .execution_options(synchronize_session=False)
+        )
+
+        closed_count = 0
+        while True:
+            with get_session() as session:
+                closed = [tuple(row) for row in session.execute(stmt)]
+                self._record_changes(session, "updated", closed)
+            if not closed:
+                return closed_count
+            closed_count += len(closed)
@@ -0,0 +1,196 @@
+from __future__ import annotations
+
+from typing import Callable, TypeVar
+
+import anyio
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, sessionmaker
+
+from todolist.core.settings import db_settings
+from todolist.core.timing import committing
+from todolist.db.async_session import get_async_sessionmaker
+from todolist.db.session import SessionLocal
+from todolist.repositories.async_db import (
+    AsyncProjectDBRepository,
+    AsyncTaskDBRepository,
+)
+from todolist.repositories.cached_project import (
+    CachedAsyncProjectRepository,
+    CachedProjectRepository,
+)
+from todolist.repositories.inmemory import (
+    InMemoryProjectRepository,
+    InMemoryTaskRepository,
+    MemoryStore,
+    memory_store,
+)
+from todolist.repositories.project_db import ProjectDBRepository
+from todolist.repositories.task_db import TaskDBRepository
+
+T = TypeVar("T")
+
+
+class UnitOfWork:
+    """
+    One session and one transaction shared by the project and task repositories.
+
+    Commits once when the block exits cleanly and rolls back on any exception.
+    """
+
+    def __init__(self, session_factory: sessionmaker = SessionLocal):
+        self._session_factory = session_factory
+
+    def __enter__(self) -> UnitOfWork:
+        self.session: Session = self._session_factory()
+        self.projects = CachedProjectRepository(ProjectDBRepository(self.session))
+        self.tasks = TaskDBRepository(self.session)
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        try:
+            if exc_type is None:
+                self.commit()
+            else:
+                self.rollback()
+        finally:
+            self.session.close()
+            self.projects.invalidate_written()
+
+    def commit(self) -> None:
+        with committing():
+            self.session.commit()
+
+    def rollback(self) -> None:
+        self.session.rollback()
+
+
+class AsyncUnitOfWork:
+    """
+    Unit of work over an AsyncSession (asyncpg, aiosqlite, ...).
+
+    Repository calls go through AsyncSession.run_sync(), so the DB repositories
+    are reused as-is while all I/O stays on the event loop.
+    """
+
+    async def __aenter__(self) -> AsyncUnitOfWork:
+        self.session: AsyncSession = get_async_sessionmaker()()
+        self.projects = CachedAsyncProjectRepository(AsyncProjectDBRepository(self._run))
+        self.tasks = AsyncTaskDBRepository(self._run)
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        try:
+            if exc_type is None:
+                await self.commit()
+            else:
+                await self.rollback()
+        finally:
+            await self.session.close()
+            self.projects.invalidate_written()
+
+    async def _run(self, fn: Callable[[Session], T]) -> T:
+        return await self.session.run_sync(fn)
+
+    async def commit(self) -> None:
+        with committing():
+            await self.session.commit()
+
+    async def rollback(self) -> None:
+        await self.session.rollback()
+
+
+class ThreadedUnitOfWork:
+    """
+    The sync UnitOfWork behind the async repository interface.
+
+    Used when DB_ASYNC is off: every repository call runs in a worker thread,
+    so async handlers never block the event loop on psycopg2.
+
+    A unit of work keeps its connection between thread hops, so the number of
+    open ones is capped at the pool capacity. Otherwise worker threads could
+    all block waiting for a pooled connection while the requests holding the
+    connections wait for a free thread.
+    """
+
+    _gate: anyio.CapacityLimiter | None = None
+
+    def __init__(self, session_factory: sessionmaker = SessionLocal):
+        self._uow = UnitOfWork(session_factory)
+
+    @classmethod
+    def _get_gate(cls) -> anyio.CapacityLimiter:
+        if cls._gate is None:
+            cls._gate = anyio.CapacityLimiter(db_settings.max_connections)
+        return cls._gate
+
+    async def __aenter__(self) -> ThreadedUnitOfWork:
+        await self._get_gate().acquire_on_behalf_of(self)
+        self._uow.__enter__()
+        self.projects = CachedAsyncProjectRepository(AsyncProjectDBRepository(self._run))
+        self.tasks = AsyncTaskDBRepository(self._run)
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        try:
+            await anyio.to_thread.run_sync(self._uow.__exit__, exc_type, exc, tb)
+        finally:
+            self._get_gate().release_on_behalf_of(self)
+            self.projects.invalidate_written()
+
+    async def _run(self, fn: Callable[[Session], T]) -> T:
+        return await anyio.to_thread.run_sync(fn, self._uow.session)
+
+    async def commit(self) -> None:
+        await anyio.to_thread.run_sync(self._uow.commit)
+
+    async def rollback(self) -> None:
+        await anyio.to_thread.run_sync(self._uow.rollback)
+
+
+class MemoryUnitOfWork:
+    """
+    The async unit of work interface over a MemoryStore (STORAGE_BACKEND=memory).
+
+    Repository calls run inline on the event loop, without a thread hop: most
+    are a few dict operations, and the scans (search, stats, pages not sorted
+    by id) hold the loop for as long as they take. Every call is applied
+    when made, so rollback has nothing to do. With a store that logs its
+    writes (sync_commit), commit waits in a worker thread until the last
+    write of this unit of work is on disk. The API commits before it sends
+    the response, so a failed log write reaches the client as an error.
+    """
+
+    def __init__(self, store: MemoryStore = memory_store):
+        self._store = store
+        self._written_lsn = 0
+
+    async def __aenter__(self) -> MemoryUnitOfWork:
+        self.projects = AsyncProjectDBRepository(
+            self._run, lambda _: InMemoryProjectRepository(self._store)
+        )
+        self.tasks = AsyncTaskDBRepository(
+            self._run, lambda _: InMemoryTaskRepository(self._store)
+        )
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        # Writes made before an exception are applied all the same
+        await self.commit()
+
+    async def _run(self, fn: Callable[[None], T]) -> T:
+        lsn = self._store.lsn
+        result = fn(None)
+        # Nothing else runs on the loop meanwhile; the lsn is this call's
+        # last write, or a later one of another thread (a longer wait at most)
+        if self._store.lsn != lsn:
+            self._written_lsn = self._store.lsn
+        return result
+
+    async def commit(self) -> None:
+        if self._written_lsn and self._store.sync_commit:
+            with committing():
+                await anyio.to_thread.run_sync(self._store.wait_durable, self._written_lsn)
+            self._written_lsn = 0
+
+    async def rollback(self) -> None:
+        pass
@@ -0,0 +1,324 @@
+"""
+Durable in-memory storage: a MemoryStore whose operations are written ahead
+to an append-only log and compacted into snapshots (STORAGE_BACKEND=wal).
+
+Files in STORAGE_WAL_DIR:
+
+    snapshot-<lsn>.pickle   the state after operation <lsn>; the newest one counts
+    wal-<lsn>.log           the operations after <lsn>, up to the next segment
+    LOCK                    flock-ed by the one process that owns the directory
+
+A log record is its length and CRC32 (4 bytes each, little-endian) followed
+by the pickle of (lsn, op, args). Writes are applied in memory and queued;
+a flusher thread writes everything queued so far and fsyncs once for the
+whole batch (group commit). Units of work wait for the fsync of their last
+operation when they commit, before the response is sent, unless
+STORAGE_WAL_SYNC_COMMIT is off: then a crash loses the writes of the last
+flush (STORAGE_WAL_FSYNC_INTERVAL_MS).
+
+If a log write or fsync fails (disk full, EIO), the flusher stops and every
+later write is refused with RuntimeError, reads keep working. The writes
+applied in memory but not logged are lost: restart the process to go back
+to what the log holds.
+
+Once the log since the last snapshot passes STORAGE_WAL_SNAPSHOT_MB, a new
+segment is started and the state as of that point is written to a snapshot
+in the background; the older segments and snapshot are then removed.
+Startup loads the newest snapshot and replays the records after it. A torn
+record at the end of the last segment (a crash mid-write) is cut off;
+damage anywhere else stops the recovery.
+"""
+from __future__ import annotations
+
+import atexit
+import fcntl
+import logging
+import os
+import pickle
+import struct
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Iterator, List, Tuple
+
+from todolist.repositories.inmemory import MemoryStore
+
+logger = logging.getLogger(__name__)
+
+_HEADER = struct.Struct("<II")
+_SNAPSHOT_VERSION = 1
+# Marker queued with the lsn a new segment starts after
+_ROTATE = "rotate"
+
+
+def _segment_lsn(path: Path) -> int:
+    return int(path.stem.split("-", 1)[1])
+
+
+def _fsync_dir(path: Path) -> None:
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def read_log(path: Path) -> Iterator[Tuple[tuple, int]]:
+    """
+    The (lsn, op, args) records of a segment, each with the offset where it
+    ends. Stops at the first torn or damaged record.
+    """
+    with open(path, "rb") as f:
+        offset = 0
+        while True:
+            header = f.read(_HEADER.size)
+            if len(header) < _HEADER.size:
+                return
+            length, crc = _HEADER.unpack(header)
+            body = f.read(length)
+            if len(body) < length or zlib.crc32(body) != crc:
+                return
+            offset += _HEADER.size + length
+            yield pickle.loads(body), offset
+
+
+class WalMemoryStore(MemoryStore):
+    def __init__(
+        self,
+        directory: str | os.PathLike,
+        sync_commit: bool = True,
+        fsync_interval: float = 0.0,
+        snapshot_bytes: int = 256 * 1024 * 1024,
+    ):
+        super().__init__()
+        self.directory = Path(directory)
+        self.sync_commit = sync_commit
+        self._fsync_interval = fsync_interval
+        self._snapshot_bytes = snapshot_bytes
+        self._opened = False
+        # Guards the queue and the flush progress; taken after lock, never before
+        self._queue_changed = threading.Condition(threading.Lock())
+        self._queue: List[tuple] = []
+        self._durable_lsn = 0
+        self._error: BaseException | None = None
+        self._closing = False
+        self._segment = None
+        self._segment_bytes = 0
+        self._flusher: threading.Thread | None = None
+        self._snapshot_thread: threading.Thread | None = None
+        self.snapshot_lsn = 0
+
+    def apply(self, op: str, *args) -> None:
+        with self.lock:
+            with self._queue_changed:
+                # Nothing writes the log any more: memory would drift from it
+                if self._error is not None:
+                    raise RuntimeError(f"Write-ahead log failed: {self._error}") from self._error
+            super().apply(op, *args)
+            with self._queue_changed:
+                self._queue.append((self.lsn, op, args))
+                self._queue_changed.notify_all()
+
+    def wait_durable(self, lsn: int) -> None:
+        with self._queue_changed:
+            while self._durable_lsn < lsn and self._error is None:
+                self._queue_changed.wait()
+            if self._durable_lsn < lsn:
+                raise RuntimeError(f"Write-ahead log failed: {self._error}") from self._error
+
+    # Startup
+
+    def open(self) -> None:
+        """Take the directory, recover the state and start the flusher. Idempotent."""
+        if self._opened:
+            return
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._lock_file = open(self.directory / "LOCK", "a")
+        try:
+            fcntl.flock(self._lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            raise RuntimeError(f"{self.directory} is in use by another process")
+
+        with self.lock:
+            self._recover()
+        self._opened = True
+        self._flusher = threading.Thread(target=self._flush_loop, name="wal-flusher", daemon=True)
+        self._flusher.start()
+        atexit.register(self.close)
+
+    def _recover(self) -> None:
+        for leftover in self.directory.glob("*.tmp"):
+            leftover.unlink()
+
+        snapshots = sorted(self.directory.glob("snapshot-*.pickle"), key=_segment_lsn)
+        if snapshots:
+            self._load_snapshot(snapshots[-1])
+
+        segments = sorted(self.directory.glob("wal-*.log"), key=_segment_lsn)
+        for i, segment in enumerate(segments):
+            end = 0
+            for (lsn, op, args), end in read_log(segment):
+                if lsn <= self.lsn:
+                    continue
+                if lsn != self.lsn + 1:
+                    raise RuntimeError(f"Write-ahead log jumps from {self.lsn} to {lsn} in {segment}")
+                getattr(self, f"_apply_{op}")(*args)
+                self.lsn = lsn
+            if end < segment.stat().st_size:
+                if i < len(segments) - 1:
+                    raise RuntimeError(f"Write-ahead log segment {segment} is damaged at byte {end}")
+                logger.warning("Cutting a torn record off %s at byte %d", segment, end)
+                os.truncate(segment, end)
+
+        self._durable_lsn = self.lsn
+        if segments:
+            path = segments[-1]
+        else:
+            path = self.directory / f"wal-{self.lsn:020d}.log"
+        self._segment = open(path, "ab")
+        self._segment_bytes = sum(
+            segment.stat().st_size for segment in segments if _segment_lsn(segment) >= self.snapshot_lsn
+        )
+        _fsync_dir(self.directory)
+
+    def _load_snapshot(self, path: Path) -> None:
+        with open(path, "rb") as f:
+            (version, lsn, last_project_id, last_task_id, last_seq,
+             projects, tasks, changes) = pickle.load(f)
+        if version != _SNAPSHOT_VERSION:
+            raise RuntimeError(f"Snapshot {path} has unknown version {version}")
+        self.projects = {record.id: record for record in projects}
+        self.tasks = {record.id: record for record in tasks}
+        self.changes = changes
+        self.last_project_id, self.last_task_id, self.last_seq = last_project_id, last_task_id, last_seq
+        self.lsn = self.snapshot_lsn = lsn
+        self._build_indexes()
+
+    # Log writing
+
+    def _flush_loop(self) -> None:
+        while True:
+            with self._queue_changed:
+                while not self._queue and not self._closing:
+                    self._queue_changed.wait()
+                if not self._queue:
+                    return
+            if self._fsync_interval:
+                # Let more writers join this batch
+                time.sleep(self._fsync_interval)
+            with self._queue_changed:
+                batch, self._queue = self._queue, []
+            try:
+                durable_lsn = self._write(batch)
+            except BaseException as e:
+                logger.exception("Write-ahead log write failed")
+                with self._queue_changed:
+                    self._error = e
+                    self._queue = []
+                    self._queue_changed.notify_all()
+                return
+            with self._queue_changed:
+                self._durable_lsn = durable_lsn
+                self._queue_changed.notify_all()
+            if self._segment_bytes >= self._snapshot_bytes:
+                self._start_snapshot()
+
+    def _write(self, batch: List[tuple]) -> int:
+        """Append and fsync the batch; returns the last lsn it contained."""
+        chunks = []
+        durable_lsn = self._durable_lsn
+        for lsn, op, args in batch:
+            if op == _ROTATE:
+                self._segment.write(b"".join(chunks))
+                chunks = []
+                self._rotate(lsn)
+                continue
+            body = pickle.dumps((lsn, op, args), protocol=pickle.HIGHEST_PROTOCOL)
+            chunks.append(_HEADER.pack(len(body), zlib.crc32(body)))
+            chunks.append(body)
+            self._segment_bytes += _HEADER.size + len(body)
+            durable_lsn = lsn
+        self._segment.write(b"".join(chunks))
+        self._segment.flush()
+        os.fsync(self._segment.fileno())
+        return durable_lsn
+
+    def _rotate(self, lsn: int) -> None:
+        """Close the current segment; the next one holds the operations after lsn."""
+        self._segment.flush()
+        os.fsync(self._segment.fileno())
+        self._segment.close()
+        self._segment = open(self.directory / f"wal-{lsn:020d}.log", "ab")
+        self._segment_bytes = 0
+        _fsync_dir(self.directory)
+
+    # Snapshots
+
+    def _start_snapshot(self) -> None:
+        if self._snapshot_thread is not None and self._snapshot_thread.is_alive():
+            return
+        self._snapshot_thread = threading.Thread(target=self.snapshot, name="wal-snapshot", daemon=True)
+        self._snapshot_thread.start()
+
+    def snapshot(self) -> int:
+        """
+        Write the current state to a snapshot and drop the log before it.
+
+        The store is locked only while the record dicts are copied (the records
+        themselves are immutable); serializing happens alongside new writes.
+        Returns the lsn the snapshot covers.
+        """
+        with self.lock:
+            lsn = self.lsn
+            state = (
+                _SNAPSHOT_VERSION,
+                lsn,
+                self.last_project_id,
+                self.last_task_id,
+                self.last_seq,
+                list(self.projects.values()),
+                list(self.tasks.values()),
+                # Feeds only grow at the end: the length marks this point in time
+                {project_id: (feed, len(feed)) for project_id, feed in self.changes.items()},
+            )
+            with self._queue_changed:
+                self._queue.append((lsn, _ROTATE, ()))
+                self._queue_changed.notify_all()
+
+        *head, changes = state
+        state = (*head, {project_id: feed[:length] for project_id, (feed, length) in changes.items()})
+        path = self.directory / f"snapshot-{lsn:020d}.pickle"
+        tmp = path.with_suffix(".tmp")
+        with open(tmp, "wb") as f:
+            pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+        _fsync_dir(self.directory)
+        self.snapshot_lsn = lsn
+
+        # Everything before lsn is in the snapshot now
+        for old in self.directory.glob("snapshot-*.pickle"):
+            if _segment_lsn(old) < lsn:
+                old.unlink()
+        for segment in self.directory.glob("wal-*.log"):
+            if _segment_lsn(segment) < lsn:
+                segment.unlink()
+        return lsn
+
+    def close(self) -> None:
+        """Flush what is queued, stop the flusher and release the directory."""
+        if not self._opened:
+            return
+        if self._snapshot_thread is not None:
+            self._snapshot_thread.join()
+        with self._queue_changed:
+            self._closing = True
+            self._queue_changed.notify_all()
+        # The flusher writes what is queued before it stops
+        self._flusher.join()
+        self._segment.close()
+        fcntl.flock(self._lock_file, fcntl.LOCK_UN)
+        self._lock_file.close()
+        self._opened = False
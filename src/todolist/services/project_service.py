@@ -38,12 +38,10 @@ class ProjectService:
             PROJECT_DESCRIPTION_MAX_LENGTH,
         )
 
-        projects = self.repo.list_all()
-
-        if len(projects) >= PROJECT_OF_NUMBER_MAX:
+        if self.repo.count() >= PROJECT_OF_NUMBER_MAX:
             raise LimitError(ERR_MAX_PROJECTS)
 
-        if any(p.name.strip().lower() == name.strip().lower() for p in projects):
+        if self.repo.exists_by_normalized_name(name):
             raise DuplicateError(ERR_DUPLICATE_PROJECT.format(name=name))
 
         project = Project(name, description)
@@ -95,10 +93,8 @@ class ProjectService:
         )
 
         # Check duplication
-        all_projects = self.repo.list_all()
-        for p in all_projects:
-            if p.id != project.id and p.name.lower() == new_name.lower():
-                raise DuplicateError(ERR_DUPLICATE_PROJECT.format(name=new_name))
+        if self.repo.exists_by_normalized_name(new_name, exclude_id=project.id):
+            raise DuplicateError(ERR_DUPLICATE_PROJECT.format(name=new_name))
 
         project.name = new_name.strip()
         project.description = new_description.strip()
@@ -107,9 +103,9 @@ class ProjectService:
         print(f"Project '{project_id}' updated successfully.")
         return project
 
-    def delete_project(self, project_id: str, task_service: TaskService):
+    def delete_project(self, project_id: str):
+        # The repository removes the project's tasks in the same transaction
         self.repo.delete(project_id)
-        task_service.repo.delete_all_by_project(project_id)
         print(f"Project '{project_id}' and all its tasks deleted successfully.")
 
     def validate_project_exists(self, project_id: str):
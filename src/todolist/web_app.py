@@ -1,6 +1,11 @@
 from fastapi import FastAPI
 
+from todolist.api.metrics import MetricsMiddleware
+from todolist.api.responses import default_response_class
 from todolist.api.routers import init_routers
+from todolist.api.timing import ServerTimingMiddleware
+from todolist.core.settings import api_settings
+from todolist.repositories.registry import get_storage_backend
 
 
 def create_app() -> FastAPI:
@@ -8,9 +13,16 @@ def create_app() -> FastAPI:
         title="ToDoList API",
         version="0.1.0",
         description="Web API for ToDoList project.",
+        default_response_class=default_response_class(),
     )
 
     init_routers(app)
+    if api_settings.server_timing:
+        app.add_middleware(ServerTimingMiddleware)
+    if api_settings.metrics:
+        # Added last, so outermost: its durations include the timing middleware
+        app.add_middleware(MetricsMiddleware)
+    get_storage_backend().init()
 
     return app
 